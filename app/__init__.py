@@ -6,6 +6,7 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import os
 import logging
+import threading
 from logging.handlers import RotatingFileHandler
 from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -15,6 +16,89 @@ socketio = SocketIO()
 limiter = Limiter(key_func=get_remote_address)
 
 
+LEADER_JOB_ID = 'scheduler-leader'
+
+
+def _start_native_thread(target, *args):
+    """
+    Run ``target(*args)`` in a real OS thread. Under gunicorn's eventlet
+    worker ``threading`` is monkey-patched, so a plain thread (or
+    ``socketio.start_background_task``) would be a green thread whose
+    parsing and OCR block the hub serving requests; eventlet's thread pool
+    runs it natively instead.
+    """
+    try:
+        from eventlet import patcher, tpool
+    except ImportError:
+        patcher = None
+    if patcher is not None and patcher.is_monkey_patched('thread'):
+        # tpool.execute only blocks the green thread waiting for the result
+        socketio.start_background_task(tpool.execute, target, *args)
+    else:
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+
+def _start_scheduler(app, scraping_service):
+    """
+    Start this process's scheduler. Only one process per deployment schedules
+    scrapes (gunicorn workers, manual scripts and the systemd job all create
+    the app): the holder of the scheduler lock. The other processes retry the
+    lock every ``SCHEDULER_LEADER_RETRY`` seconds and take over when the
+    leader exits, e.g. when gunicorn recycles its worker.
+    """
+    from .services.process_lock import acquire_scheduler_lock
+
+    scheduler = BackgroundScheduler(daemon=True)
+
+    def claim_leadership():
+        if not acquire_scheduler_lock(app.config['SCHEDULER_LOCK_FILE']):
+            return False
+        if scheduler.get_job(LEADER_JOB_ID):
+            scheduler.remove_job(LEADER_JOB_ID)
+            app.logger.info("Took over the scheduler from a previous process")
+
+        # Skip initial scrape if in debug mode to speed up development.
+        # It runs in a background OS thread (and only if today's menus are
+        # stale) so the worker serves the stored menus immediately.
+        if not app.debug:
+            _start_native_thread(scraping_service.run_startup_scrape, app)
+        else:
+            app.logger.info("Debug mode: Skipping initial scrape")
+        
+        # Schedule daily updates
+        scheduler.add_job(
+            scraping_service.run_scheduled_scrape, 
+            "cron", 
+            args=[app],
+            hour=app.config['SCRAPE_SCHEDULE_HOUR'], 
+            minute=app.config['SCRAPE_SCHEDULE_MINUTE'],
+            misfire_grace_time=3600,
+            max_instances=1,
+            coalesce=True
+        )
+        app.logger.info(
+            f"Scheduler started. Daily scrape scheduled for "
+            f"{app.config['SCRAPE_SCHEDULE_HOUR']:02d}:{app.config['SCRAPE_SCHEDULE_MINUTE']:02d}."
+        )
+        return True
+
+    if not claim_leadership():
+        retry = app.config.get('SCHEDULER_LEADER_RETRY', 60)
+        app.logger.info(
+            f"Another process runs the scheduler; retrying every {retry}s"
+        )
+        scheduler.add_job(
+            claim_leadership,
+            "interval",
+            id=LEADER_JOB_ID,
+            seconds=retry,
+            max_instances=1,
+            coalesce=True
+        )
+    scheduler.start()
+    return scheduler
+
+
 def create_app(config_name='development'):
     """
     Creates and configures the Flask application.
@@ -71,6 +155,10 @@ def create_app(config_name='development'):
         
         # Create database tables
         db.create_all()
+
+        # Bring databases created by older versions up to date
+        from .migrations import upgrade_schema
+        upgrade_schema()
         app.logger.info("Database tables created/verified")
 
         # Initialize scraping service
@@ -78,27 +166,10 @@ def create_app(config_name='development'):
             from .services.scraping_service import ScrapingService
             scraping_service = ScrapingService()
             
-            # Skip initial scrape if in debug mode to speed up development
-            if not app.debug:
-                app.logger.info("Performing initial scrape on application startup...")
-                try:
-                    scraping_service.run_all_scrapers()
-                except Exception as e:
-                    app.logger.error(f"Initial scrape failed: {e}", exc_info=True)
-            else:
-                app.logger.info("Debug mode: Skipping initial scrape")
-            
-            # Schedule daily updates
-            scheduler = BackgroundScheduler(daemon=True)
-            scheduler.add_job(
-                scraping_service.run_all_scrapers, 
-                "cron", 
-                hour=5, 
-                minute=0,
-                misfire_grace_time=3600
-            )
-            scheduler.start()
-            app.logger.info("Scheduler started. Daily scrape scheduled for 05:00.")
+            if not app.config.get('SCHEDULER_ENABLED', True):
+                app.logger.info("Scheduler disabled for this process")
+                return app
+            _start_scheduler(app, scraping_service)
             
         except ImportError as e:
             app.logger.error(f"Failed to import scraping service: {e}")
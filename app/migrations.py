@@ -0,0 +1,77 @@
+# app/migrations.py
+"""
+Schema upgrades for existing databases.
+
+``db.create_all()`` creates missing tables but never changes existing ones,
+so databases created by older versions (e.g. ``instance/app.db`` on the
+Raspberry Pi) are brought up to date here. Every step is idempotent and the
+function is run on application startup.
+"""
+
+import logging
+
+from sqlalchemy import inspect, text
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema() -> list:
+    """
+    Apply any missing schema changes to the current database.
+
+    Returns:
+        list: Descriptions of the steps that were applied
+    """
+    applied = []
+    inspector = inspect(db.engine)
+    if not inspector.has_table('menu_item'):
+        return applied
+
+    columns = {column['name'] for column in inspector.get_columns('menu_item')}
+    if 'position' not in columns:
+        _add_menu_item_position()
+        applied.append("added menu_item.position and numbered existing rows")
+
+    indexes = {index['name'] for index in inspector.get_indexes('menu_item')}
+    if 'uq_menu_item_restaurant_date_position' not in indexes:
+        db.session.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_menu_item_restaurant_date_position "
+            "ON menu_item (restaurant_id, menu_date, position)"
+        ))
+        applied.append("created unique index on menu_item (restaurant_id, menu_date, position)")
+    if 'ix_menu_item_menu_date' not in indexes:
+        db.session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_menu_item_menu_date ON menu_item (menu_date)"
+        ))
+        applied.append("created index on menu_item (menu_date)")
+
+    db.session.commit()
+    for step in applied:
+        logger.info(f"Schema upgrade: {step}")
+    return applied
+
+
+def _add_menu_item_position():
+    """Add the position column and number each day's rows in their stored order."""
+    db.session.execute(text(
+        "ALTER TABLE menu_item ADD COLUMN position INTEGER NOT NULL DEFAULT 0"
+    ))
+
+    rows = db.session.execute(text(
+        "SELECT id, restaurant_id, menu_date FROM menu_item "
+        "ORDER BY restaurant_id, menu_date, id"
+    ))
+    updates = []
+    current_day, position = None, 0
+    for row_id, restaurant_id, menu_date in rows:
+        if (restaurant_id, menu_date) != current_day:
+            current_day, position = (restaurant_id, menu_date), 0
+        updates.append({'id': row_id, 'position': position})
+        position += 1
+
+    if updates:
+        db.session.execute(
+            text("UPDATE menu_item SET position = :position WHERE id = :id"), updates
+        )
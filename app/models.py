@@ -8,17 +8,29 @@ class Restaurant(db.Model):
     url = db.Column(db.String(255), nullable=False)
     last_scraped = db.Column(db.DateTime, default=datetime.utcnow)
     menu_items = db.relationship('MenuItem', backref='restaurant', lazy=True, cascade="all, delete-orphan")
+    fingerprints = db.relationship('MenuFingerprint', backref='restaurant', lazy=True, cascade="all, delete-orphan")
 
     def __repr__(self):
         return f'<Restaurant {self.name}>'
 
 class MenuItem(db.Model):
+    # Natural key of a menu row: its place on a restaurant's menu for a day.
+    # The unique index also serves every (restaurant_id, menu_date) lookup.
+    __table_args__ = (
+        db.Index('uq_menu_item_restaurant_date_position',
+                 'restaurant_id', 'menu_date', 'position', unique=True),
+        db.Index('ix_menu_item_menu_date', 'menu_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
     
     # The date the menu is for
     menu_date = db.Column(db.Date, nullable=False)
     
+    # Order of the item on the day's menu, as scraped
+    position = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     # e.g., 'Soup', 'Main Dish 1', 'Vegetarian', 'Dessert'
     category = db.Column(db.String(100), nullable=False) 
     
@@ -30,3 +42,23 @@ class MenuItem(db.Model):
 
     def __repr__(self):
         return f'<MenuItem {self.menu_date} - {self.category}: {self.description[:30]}>'
+
+
+class MenuFingerprint(db.Model):
+    """Content hashes of a restaurant's last scraped source and menu for one day."""
+    __table_args__ = (db.UniqueConstraint('restaurant_id', 'menu_date'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurant.id'), nullable=False)
+    menu_date = db.Column(db.Date, nullable=False)
+
+    # SHA-256 of the raw source (PDF, image, page) the menu was parsed from
+    source_hash = db.Column(db.String(64), nullable=True)
+
+    # SHA-256 of the normalized item list that was saved
+    items_hash = db.Column(db.String(64), nullable=False)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<MenuFingerprint {self.restaurant_id} {self.menu_date}>'
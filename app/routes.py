@@ -1,10 +1,13 @@
 # app/routes.py
-from flask import Blueprint, render_template, jsonify, request
-from sqlalchemy import func
+from flask import Blueprint, Response, current_app, render_template, jsonify, request
 from datetime import date, datetime
 
-from app import db, socketio
-from .models import Restaurant, MenuItem
+from app import socketio
+from .services.menu_service import (
+    get_menu_snapshot,
+    seconds_until_next_scrape,
+    supported_encodings,
+)
 
 main = Blueprint("main", __name__)
 
@@ -33,34 +36,38 @@ def get_menus():
     else:
         menu_date = date.today()
     
-    restaurants = Restaurant.query.all()
-    menu_data = []
+    # Served from the pre-serialized snapshot; no database work unless data changed
+    snapshot = get_menu_snapshot(menu_date)
     
-    for restaurant in restaurants:
-        items = MenuItem.query.filter_by(
-            restaurant_id=restaurant.id, 
-            menu_date=menu_date
-        ).all()
-        
-        menu_data.append({
-            "id": restaurant.id,
-            "name": restaurant.name,
-            "url": restaurant.url,
-            "last_scraped": restaurant.last_scraped.isoformat() if restaurant.last_scraped else None,
-            "items": [
-                {
-                    "category": item.category,
-                    "description": item.description,
-                    "price": item.price if item.price else ""
-                }
-                for item in items
-            ]
-        })
-    
-    return jsonify({
-        "date": menu_date.isoformat(),
-        "restaurants": menu_data
-    })
+    return _snapshot_response(snapshot)
+
+
+def _snapshot_response(snapshot):
+    """
+    Send a menu snapshot, compressed if the client accepts it, or a
+    304 Not Modified if the client already has this version.
+    """
+    encoding = None
+    if len(snapshot.body) >= current_app.config.get('MENU_COMPRESS_MIN_BYTES', 1024):
+        for candidate in supported_encodings():
+            if request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+    etag = snapshot.etag(encoding)
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        body = snapshot.encoded(encoding) if encoding else snapshot.body
+        response = Response(body, mimetype="application/json")
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag, weak=True)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = seconds_until_next_scrape()
+    return response
 
 
 @socketio.on("connect")
@@ -70,27 +77,7 @@ def handle_connect(auth=None):
     """
     print(f"Client connected from {request.remote_addr}")
     
-    today = date.today()
-    restaurants = Restaurant.query.all()
-    menu_data = []
-    
-    for restaurant in restaurants:
-        items = MenuItem.query.filter_by(
-            restaurant_id=restaurant.id, 
-            menu_date=today
-        ).all()
-        
-        menu_data.append({
-            "name": restaurant.name,
-            "items": [
-                {
-                    "category": item.category,
-                    "description": item.description,
-                    "price": item.price
-                }
-                for item in items
-            ]
-        })
+    menu_data = get_menu_snapshot(date.today()).restaurants
     
     # Emit data to the newly connected client
     socketio.emit("initial_menu_load", {"data": menu_data}, room=request.sid)
@@ -116,6 +103,8 @@ def handle_refresh_request():
     scraping_service = ScrapingService()
     
     # Run in background to avoid blocking
-    socketio.start_background_task(scraping_service.run_all_scrapers)
+    socketio.start_background_task(
+        scraping_service.run_scheduled_scrape, current_app._get_current_object()
+    )
     
     return {"status": "accepted"}
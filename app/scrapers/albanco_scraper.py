@@ -4,15 +4,14 @@ Extracts weekly lunch menu from PDF at albanco.at
 """
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
-import requests
 import re
-import pdfplumber
-from io import BytesIO
 from bs4 import BeautifulSoup
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled, SourceUnchanged
+from .http_cache import Download
+from .pdf_text import PDF_CONTENT_TYPES, PDF_MAGIC, extract_pdf_text, max_pdf_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +25,17 @@ class AlbancoScraper(BaseScraper):
             url="https://albanco.at/"
         )
     
-    def find_current_weekly_pdf_url(self) -> Optional[str]:
+    def weekly_pdf_candidates(self) -> List[str]:
         """
-        Dynamically find the current week's lunch PDF URL from the website.
-        The website now uses a simple pattern: la4.pdf that gets updated weekly.
+        Candidate URLs of the current week's lunch PDF, best first: the link
+        on the homepage (the site uses a simple la4.pdf that gets updated
+        weekly) and the standard upload location for the current month.
         """
+        candidates = []
         try:
             # Fetch the main page to find the link to the PDF
             logger.info("Fetching Albanco homepage to find PDF link")
-            response = requests.get(self.url, timeout=10)
+            response = self.http_get(self.url, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -72,29 +73,55 @@ class AlbancoScraper(BaseScraper):
                         pdf_link = 'https://albanco.at/' + pdf_link
                 
                 logger.info(f"Found PDF link: {pdf_link}")
-                
-                # Verify the PDF is accessible
-                response = requests.head(pdf_link, timeout=10)
-                if response.status_code == 200:
-                    return pdf_link
-                else:
-                    logger.warning(f"PDF link returned status {response.status_code}")
-            
-            # Fallback: Try the standard location based on current date
-            current_year = datetime.now().year
-            current_month = datetime.now().strftime('%m')
-            fallback_url = f"https://albanco.at/wp-content/uploads/sites/3/{current_year}/{current_month}/la4.pdf"
-            
-            logger.info(f"Trying fallback URL: {fallback_url}")
-            response = requests.head(fallback_url, timeout=10)
-            if response.status_code == 200:
-                return fallback_url
+                candidates.append(pdf_link)
             
+        except (ScrapeCancelled, SourceUnchanged):
+            raise
         except Exception as e:
             logger.error(f"Error finding PDF URL: {e}")
         
+        # Fallback: Try the standard location based on current date
+        current_year = datetime.now().year
+        current_month = datetime.now().strftime('%m')
+        fallback_url = f"https://albanco.at/wp-content/uploads/sites/3/{current_year}/{current_month}/la4.pdf"
+        if fallback_url not in candidates:
+            candidates.append(fallback_url)
+        return candidates
+    
+    def download_weekly_pdf(self) -> Tuple[Optional[str], Optional[Download]]:
+        """
+        Download the current week's PDF: one conditional GET per candidate URL
+        (instead of a HEAD to check it, then a GET), stopping at the first that works.
+        The PDF is streamed to a temporary file; the caller closes the download.
+        """
+        for pdf_url in self.weekly_pdf_candidates():
+            logger.info(f"Downloading PDF from: {pdf_url}")
+            try:
+                download = self.http_download(pdf_url, max_bytes=max_pdf_bytes(),
+                                              content_types=PDF_CONTENT_TYPES,
+                                              magic=PDF_MAGIC, timeout=30)
+            except (ScrapeCancelled, SourceUnchanged):
+                raise
+            except Exception as e:
+                logger.warning(f"PDF download from {pdf_url} failed: {e}")
+                continue
+            if download.status_code == 200:
+                return pdf_url, download
+            download.close()
+            logger.warning(f"PDF link returned status {download.status_code}")
+        
         logger.error("Could not find weekly PDF")
-        return None
+        return None, None
+    
+    def find_current_weekly_pdf_url(self) -> Optional[str]:
+        """
+        Dynamically find the current week's lunch PDF URL from the website.
+        The website now uses a simple pattern: la4.pdf that gets updated weekly.
+        """
+        pdf_url, download = self.download_weekly_pdf()
+        if download is not None:
+            download.close()
+        return pdf_url
     
     def extract_menu_items(self) -> List[Dict[str, Any]]:
         """
@@ -102,44 +129,45 @@ class AlbancoScraper(BaseScraper):
         The PDF contains Italian lunch dishes with German/English descriptions.
         """
         menu_items = []
+        download = None
         
         try:
-            # Find the current week's PDF URL
-            pdf_url = self.find_current_weekly_pdf_url()
+            # Find and download the current week's PDF
+            pdf_url, download = self.download_weekly_pdf()
             if not pdf_url:
                 logger.error("No weekly PDF found")
                 return menu_items
             
-            logger.info(f"Downloading PDF from: {pdf_url}")
+            # Same PDF as last time: nothing to parse
+            self.ensure_source_changed(download)
+            self.check_source_hash(download.sha256)
             
-            # Download the PDF
-            response = requests.get(pdf_url, timeout=30)
-            response.raise_for_status()
+            # Parse the first page with pdfplumber (better for structured text),
+            # cached per PDF
+            pdf = extract_pdf_text(download.path, max_pages=1, backend='pdfplumber',
+                                   digest=download.sha256, cancelled=self.cancelled)
+            if pdf.page_count == 0:
+                logger.warning("PDF has no pages")
+                return menu_items
             
-            # Parse PDF with pdfplumber (better for structured text)
-            pdf_content = BytesIO(response.content)
+            text = pdf.pages[0]
+            if not text:
+                logger.warning("No text extracted from PDF")
+                return menu_items
             
-            with pdfplumber.open(pdf_content) as pdf:
-                if len(pdf.pages) == 0:
-                    logger.warning("PDF has no pages")
-                    return menu_items
-                
-                # Extract text from first page
-                page = pdf.pages[0]
-                text = page.extract_text()
-                
-                if not text:
-                    logger.warning("No text extracted from PDF")
-                    return menu_items
-                
-                logger.debug(f"Extracted PDF text:\n{text}")
-                
-                # Parse the menu items from text
-                menu_items = self._parse_menu_text(text)
+            logger.debug(f"Extracted PDF text:\n{text}")
+            
+            # Parse the menu items from text
+            menu_items = self._parse_menu_text(text)
                 
+        except SourceUnchanged:
+            raise
         except Exception as e:
             logger.error(f"Error extracting menu from PDF: {str(e)}", exc_info=True)
             raise
+        finally:
+            if download is not None:
+                download.close()
         
         return menu_items
     
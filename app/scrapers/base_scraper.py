@@ -1,16 +1,101 @@
 # app/scrapers/base_scraper.py
+import hashlib
+import json
 import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import date, datetime
+from typing import List, Optional, Sequence, Union
+
+from sqlalchemy import func, insert
 
 from app import db
-from app.models import MenuItem, Restaurant
+from app.models import MenuFingerprint, MenuItem, Restaurant
+from app.services.menu_service import invalidate_menu_snapshots
+
+from .fetch_strategies import FetchError, FetchResult, FetchStrategy
+from .http_cache import CachedResponse, Download, cached_download, cached_get
 
 # Configure a dedicated logger for scrapers
 logging.basicConfig(level=logging.INFO)
 scraper_logger = logging.getLogger("scraper")
 
 
+def content_hash(*parts: bytes) -> str:
+    """SHA-256 hex digest of raw source content."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def items_hash(menu_items) -> str:
+    """SHA-256 hex digest of a normalized menu item list (order preserved)."""
+    normalized = [
+        [
+            " ".join(str(item.get(field) or "").split())
+            for field in ("category", "description", "price")
+        ]
+        for item in menu_items
+    ]
+    return content_hash(json.dumps(normalized, ensure_ascii=False).encode("utf-8"))
+
+
+def _row_key(*fields):
+    """
+    Content of a menu row (a MenuItem, or its category, description and
+    price), used to compare stored rows with scraped items.
+    """
+    if len(fields) == 1:
+        row = fields[0]
+        fields = (row.category, row.description, row.price)
+    return tuple(field or "" for field in fields)
+
+
+def _upsert_menu_items(rows):
+    """Insert menu rows, updating the existing row with the same natural key."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        # No portable upsert: replace the rows that share a natural key
+        for row in rows:
+            MenuItem.query.filter_by(
+                restaurant_id=row["restaurant_id"],
+                menu_date=row["menu_date"],
+                position=row["position"],
+            ).delete(synchronize_session=False)
+        db.session.execute(insert(MenuItem), rows)
+        return
+
+    stmt = dialect_insert(MenuItem.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["restaurant_id", "menu_date", "position"],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("category", "description", "price", "scraped_at")
+        },
+    )
+    db.session.execute(stmt, rows)
+
+
+class SourceUnchanged(Exception):
+    """
+    Raised by a scraper when its menu source has not changed since the last
+    run and today's menu is already stored, so there is nothing to parse or save.
+    """
+
+
+class ScrapeCancelled(Exception):
+    """Raised inside a scraper that was cancelled, e.g. after exceeding its time budget."""
+
+
+class ScrapeTimeout(Exception):
+    """Recorded by the ScrapingService for a scraper that exceeded its time budget."""
+
+
 class BaseScraper(ABC):
     """
     Abstract base class for all restaurant menu scrapers.
@@ -23,6 +108,15 @@ class BaseScraper(ABC):
         self.name = name
         self.url = url
         self.logger = scraper_logger
+        # Set by the ScrapingService before a run: today's menu is already stored
+        # and the fingerprint of the source it was parsed from
+        self.has_current_menu = False
+        self.known_source_hash = None
+        # Fingerprint of the source seen by the current run (see check_source)
+        self.source_hash = None
+        # Set by cancel(); checked between network requests (see check_cancelled)
+        self.cancelled = threading.Event()
+        self._cancel_callbacks = []
 
     @abstractmethod
     def scrape(self):
@@ -45,64 +139,247 @@ class BaseScraper(ABC):
         """
         pass
 
-    def save_to_db(self, menu_items):
+    def on_cancel(self, callback) -> None:
+        """
+        Register ``callback`` to be called from :meth:`cancel`, e.g. to kill a
+        subprocess the scraper is waiting on. Callbacks run on the cancelling thread.
+        """
+        self._cancel_callbacks.append(callback)
+
+    def cancel(self) -> None:
+        """Ask the running scrape to stop and release what it is blocked on."""
+        self.cancelled.set()
+        callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.warning(f"{self.name}: cancel callback failed: {e}")
+
+    def reset_cancel(self) -> None:
+        """Clear the cancelled state before a new run."""
+        self.cancelled.clear()
+        self._cancel_callbacks = []
+
+    def check_cancelled(self) -> None:
+        """Raise :class:`ScrapeCancelled` if the scrape has been cancelled."""
+        if self.cancelled.is_set():
+            raise ScrapeCancelled(f"{self.name}: scrape was cancelled")
+
+    def fetch_page(self, url: str, strategies: List[FetchStrategy]) -> FetchResult:
         """
-        Saves the scraped menu items to the database.
+        Fetch a page using the first strategy that yields usable content.
 
-        This method handles the database session, checks for existing data
-        to prevent duplicates, and commits the changes.
+        Strategies are tried in order (cheapest first, e.g. plain HTTP before
+        a browser); failures are logged and the next strategy is tried.
         """
-        if not menu_items:
-            self.logger.info(f"No menu items found for {self.name}. Nothing to save.")
-            return
+        for strategy in strategies:
+            self.check_cancelled()
+            try:
+                result = strategy.fetch(url)
+            except Exception as e:
+                self.logger.warning(
+                    f"{self.name}: {strategy.name} fetch of {url} failed: {e}"
+                )
+                continue
+
+            if result is not None:
+                self.logger.info(f"{self.name}: fetched {url} via {strategy.name}")
+                return result
 
-        # Get or create the restaurant record
+            self.logger.info(
+                f"{self.name}: {strategy.name} fetch of {url} returned no usable content"
+            )
+
+        raise FetchError(f"All fetch strategies failed for {url}")
+
+    def http_get(self, url: str, headers: Optional[dict] = None,
+                 timeout: Optional[float] = None) -> CachedResponse:
+        """GET ``url`` through the on-disk conditional-GET cache, with retries."""
+        self.check_cancelled()
+        response = cached_get(url, headers=headers, timeout=timeout, cancelled=self.cancelled)
+        self.check_cancelled()
+        return response
+
+    def http_download(self, url: str, max_bytes: Optional[int] = None,
+                      content_types: Optional[Sequence[str]] = None,
+                      magic: Optional[bytes] = None, headers: Optional[dict] = None,
+                      timeout: Optional[float] = None) -> Download:
+        """
+        Stream ``url`` to a temporary file through the conditional-GET cache
+        (see :meth:`HttpCache.download`). The caller closes the download.
+        """
+        self.check_cancelled()
+        download = cached_download(url, headers=headers, timeout=timeout,
+                                   cancelled=self.cancelled, max_bytes=max_bytes,
+                                   content_types=content_types, magic=magic)
+        try:
+            self.check_cancelled()
+        except BaseException:
+            download.close()
+            raise
+        return download
+
+    def ensure_source_changed(self, response: Union[CachedResponse, Download]) -> None:
+        """
+        Stop the scrape with :class:`SourceUnchanged` if the menu source
+        (PDF, image, ...) answered 304 Not Modified and today's menu is
+        already in the database.
+        """
+        if response.not_modified and self.has_current_menu:
+            raise SourceUnchanged(f"{self.name}: {response.url} has not changed")
+
+    def check_source(self, *parts: bytes) -> None:
+        """
+        Fingerprint the raw source (PDF, image, page) before parsing it.
+        Raises :class:`SourceUnchanged` if it is byte-identical to the source
+        today's stored menu was parsed from.
+        """
+        self.check_source_hash(content_hash(*parts))
+
+    def check_source_hash(self, digest: str) -> None:
+        """:meth:`check_source` for a source whose SHA-256 is already known."""
+        self.source_hash = digest
+        if self.has_current_menu and self.source_hash == self.known_source_hash:
+            raise SourceUnchanged(f"{self.name}: source content is unchanged")
+
+    def mark_scraped(self):
+        """
+        Record a successful check of an unchanged source. The menu snapshots
+        are kept: their menus did not change.
+        """
         restaurant = Restaurant.query.filter_by(name=self.name).first()
-        if not restaurant:
-            self.logger.info(f"Creating new restaurant entry for {self.name}")
-            restaurant = Restaurant(name=self.name, url=self.url)
-            db.session.add(restaurant)
-            # Commit here to get the restaurant ID for the menu items
+        if restaurant:
+            restaurant.last_scraped = datetime.utcnow()
             db.session.commit()
 
-        # Group items by date to perform checks more efficiently
-        items_by_date = {}
-        for item in menu_items:
-            menu_date = item["menu_date"]
-            if menu_date not in items_by_date:
-                items_by_date[menu_date] = []
-            items_by_date[menu_date].append(item)
-
-        for menu_date, items in items_by_date.items():
-            # Check if we already have menu items for this restaurant and date
-            existing_item = MenuItem.query.filter_by(
-                restaurant_id=restaurant.id, menu_date=menu_date
-            ).first()
-
-            if existing_item:
-                self.logger.warning(
-                    f"Menu for {self.name} on {menu_date} already exists. Deleting old entries to update."
-                )
-                # Delete all existing items for this day to ensure a fresh import
-                MenuItem.query.filter_by(
-                    restaurant_id=restaurant.id, menu_date=menu_date
-                ).delete()
-                db.session.commit()
-
-            # Add the new items
-            for item_data in items:
-                new_item = MenuItem(
-                    restaurant_id=restaurant.id,
-                    menu_date=item_data["menu_date"],
-                    category=item_data.get("category", "N/A"),
-                    description=item_data.get("description", ""),
-                    price=item_data.get("price", ""),
+    def save_to_db(self, menu_items) -> dict:
+        """
+        Saves the scraped menu items to the database in a single transaction.
+
+        Days whose item fingerprint matches the last saved menu are skipped.
+        For the other days rows are matched on their natural key
+        (restaurant, date, position): identical rows are kept, new or changed
+        ones are written with one bulk upsert and rows past the end of the
+        new menu are removed with one set-based DELETE.
+
+        Returns:
+            dict: Row counts ``inserted``, ``updated``, ``deleted`` and ``unchanged``
+        """
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        if not menu_items:
+            self.logger.info(f"No menu items found for {self.name}. Nothing to save.")
+            return counts
+
+        try:
+            # Get or create the restaurant record (flush assigns the id without committing)
+            restaurant = Restaurant.query.filter_by(name=self.name).first()
+            created = restaurant is None
+            if created:
+                self.logger.info(f"Creating new restaurant entry for {self.name}")
+                restaurant = Restaurant(name=self.name, url=self.url)
+                db.session.add(restaurant)
+                db.session.flush()
+
+            # Group items by date
+            items_by_date = {}
+            for item in menu_items:
+                items_by_date.setdefault(item["menu_date"], []).append(item)
+            dates = list(items_by_date)
+
+            fingerprints = {
+                fp.menu_date: fp
+                for fp in MenuFingerprint.query.filter(
+                    MenuFingerprint.restaurant_id == restaurant.id,
+                    MenuFingerprint.menu_date.in_(dates),
                 )
-                db.session.add(new_item)
-            self.logger.info(
-                f"Successfully added {len(items)} new menu items for {self.name} for {menu_date}."
+            }
+            stored_counts = dict(
+                db.session.query(MenuItem.menu_date, func.count(MenuItem.id))
+                .filter(MenuItem.restaurant_id == restaurant.id, MenuItem.menu_date.in_(dates))
+                .group_by(MenuItem.menu_date)
             )
 
-        restaurant.last_scraped = datetime.utcnow()
-        db.session.commit()
-        self.logger.info(f"Database update complete for {self.name}.")
+            changed_dates = []
+            new_hashes = {}
+            for menu_date, items in items_by_date.items():
+                new_hashes[menu_date] = items_hash(items)
+                fingerprint = fingerprints.get(menu_date)
+                if (stored_counts.get(menu_date) and fingerprint
+                        and fingerprint.items_hash == new_hashes[menu_date]):
+                    self.logger.info(
+                        f"Menu for {self.name} on {menu_date} is unchanged. Skipping update."
+                    )
+                    counts["unchanged"] += len(items)
+                    if self.source_hash:
+                        fingerprint.source_hash = self.source_hash
+                else:
+                    changed_dates.append(menu_date)
+
+            if changed_dates:
+                # Existing rows of the changed days, by natural key (date, position)
+                existing = {
+                    (row.menu_date, row.position): row
+                    for row in MenuItem.query.filter(
+                        MenuItem.restaurant_id == restaurant.id,
+                        MenuItem.menu_date.in_(changed_dates),
+                    )
+                }
+
+                now = datetime.utcnow()
+                upserts = []
+                for menu_date in changed_dates:
+                    for position, item_data in enumerate(items_by_date[menu_date]):
+                        category = item_data.get("category", "N/A")
+                        description = item_data.get("description", "")
+                        price = item_data.get("price", "")
+                        row = existing.pop((menu_date, position), None)
+                        if row is not None and _row_key(row) == _row_key(
+                                category, description, price):
+                            counts["unchanged"] += 1
+                            continue
+                        counts["updated" if row is not None else "inserted"] += 1
+                        upserts.append({
+                            "restaurant_id": restaurant.id,
+                            "menu_date": menu_date,
+                            "position": position,
+                            "category": category,
+                            "description": description,
+                            "price": price,
+                            "scraped_at": now,
+                        })
+
+                # Rows beyond the end of the new menus
+                stale_ids = [row.id for row in existing.values()]
+                if stale_ids:
+                    counts["deleted"] = MenuItem.query.filter(
+                        MenuItem.id.in_(stale_ids)
+                    ).delete(synchronize_session=False)
+                if upserts:
+                    _upsert_menu_items(upserts)
+
+                for menu_date in changed_dates:
+                    fingerprint = fingerprints.get(menu_date)
+                    if not fingerprint:
+                        fingerprint = MenuFingerprint(restaurant_id=restaurant.id, menu_date=menu_date)
+                        db.session.add(fingerprint)
+                    fingerprint.items_hash = new_hashes[menu_date]
+                    fingerprint.source_hash = self.source_hash
+
+            restaurant.last_scraped = datetime.utcnow()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Cached /api/menus and Socket.IO payloads are rebuilt on next read,
+        # unless only last_scraped changed
+        if created or counts["inserted"] or counts["updated"] or counts["deleted"]:
+            invalidate_menu_snapshots()
+
+        self.logger.info(
+            f"Database update complete for {self.name}: {counts['inserted']} inserted, "
+            f"{counts['updated']} updated, {counts['deleted']} deleted, "
+            f"{counts['unchanged']} unchanged."
+        )
+        return counts
@@ -9,10 +9,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
-import time
 
 from .base_scraper import BaseScraper
-from .chrome_driver_setup import get_chrome_driver
+from .chrome_driver_setup import acquire_driver, release_driver
+from .page_readiness import element_count_stable, wait_until_ready
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +35,8 @@ class CampusBrauScraper(BaseScraper):
         driver = None
         
         try:
-            # Initialize the driver using ARM64-compatible setup
-            driver = get_chrome_driver()
+            # Borrow a browser tab from the shared Chrome pool
+            driver = acquire_driver()
             
             logger.info(f"Loading Campus Bräu website: {self.url}")
             driver.get(self.url)
@@ -54,8 +54,9 @@ class CampusBrauScraper(BaseScraper):
                 speisekarte_link.click()
                 logger.info("Clicked on SPEISEKARTE link")
                 
-                # Wait for menu content to load
-                time.sleep(3)
+                # Wait until the weekday menu entries have rendered
+                wait_until_ready(driver, element_count_stable("div.detail"),
+                                 timeout=10, description="Campus Bräu menu")
                 
             except Exception as e:
                 logger.warning(f"Could not click SPEISEKARTE link: {e}")
@@ -214,7 +215,7 @@ class CampusBrauScraper(BaseScraper):
         
         finally:
             if driver:
-                driver.quit()
+                release_driver(driver)
         
         return menu_items
     
@@ -1,12 +1,23 @@
 """
 Chrome WebDriver setup for ARM64/aarch64 compatibility.
-This module provides a common setup for Chrome WebDriver that works on ARM64 systems.
+This module provides a common setup for Chrome WebDriver that works on ARM64 systems,
+plus a small pool that lets the Selenium scrapers share one long-lived browser.
 """
 
+import atexit
 import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 
+from .settings import get_setting
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,15 +37,315 @@ def get_chrome_driver():
     chrome_options.add_argument('--disable-blink-features=AutomationControlled')
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
-    
+
     # Use system ChromeDriver (installed via apt)
     # On Debian/Ubuntu ARM64 systems, ChromeDriver is typically at /usr/bin/chromedriver
     service = Service('/usr/bin/chromedriver')
-    
+
     try:
         driver = webdriver.Chrome(service=service, options=chrome_options)
         logger.info("Successfully created Chrome WebDriver using system ChromeDriver")
         return driver
     except Exception as e:
         logger.error(f"Failed to create Chrome WebDriver: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """
+    Return a process and all of its descendants, parents first.
+    Reads /proc directly, so it only works on Linux; returns [] elsewhere.
+    """
+    if not root_pid or not os.path.isdir('/proc'):
+        return []
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after the closing paren
+                fields = f.read().rsplit(')', 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    tree = []
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, []))
+    return tree
+
+
+def _process_tree_rss_mb(root_pid: int) -> float:
+    """
+    Return the resident memory (MB) of a process and all of its descendants.
+    Reads /proc directly, so it only works on Linux; returns 0 elsewhere.
+    """
+    page_size = os.sysconf('SC_PAGE_SIZE') if os.path.isdir('/proc') else 0
+    total_bytes = 0
+    for pid in _process_tree(root_pid):
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total_bytes += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+
+    return total_bytes / (1024 * 1024)
+
+
+class _PooledDriver:
+    """A browser owned by the pool together with its bookkeeping."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.base_handle = driver.current_window_handle
+        self.uses = 0
+        self.created_at = time.monotonic()
+        # Thread that currently leases the browser (see ChromeDriverPool.kill_leases)
+        self.owner: Optional[int] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = getattr(getattr(self.driver, 'service', None), 'process', None)
+        return process.pid if process else None
+
+
+class ChromeDriverPool:
+    """
+    Pool of long-lived headless Chrome browsers shared by the Selenium scrapers.
+
+    Every lease gets exclusive use of one browser and a fresh tab. When the
+    lease is returned the tab is closed and cookies are cleared, so scrapers
+    do not see each other's state. Browsers are health-checked (including
+    their memory) before they are handed out and recycled after ``max_uses``
+    leases or once the browser's process tree grows beyond ``max_memory_mb``.
+    ``acquire_timeout`` should stay well below the scrapers' time budget, so
+    a scraper waiting for a browser fails on its own instead of being
+    cancelled.
+    """
+
+    def __init__(self, size: int = 1, max_uses: int = 20, max_memory_mb: int = 600,
+                 acquire_timeout: float = 60, driver_factory=get_chrome_driver):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.acquire_timeout = acquire_timeout
+        self._driver_factory = driver_factory
+        self._condition = threading.Condition()
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._in_use = 0
+        self._closed = False
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Borrow a browser from the pool and open a fresh tab in it.
+        Blocks until a browser is available or ``timeout`` seconds have passed.
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Chrome driver pool has been shut down")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+                if self._in_use < self.size:
+                    pooled = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No Chrome driver became available within {timeout:.0f}s"
+                    )
+                self._condition.wait(remaining)
+            # Reserve the slot; a new browser is started outside the lock
+            self._in_use += 1
+
+        try:
+            if pooled is not None:
+                problem = self._health_problem(pooled)
+                if problem:
+                    self._quit(pooled, reason=problem)
+                    pooled = None
+            if pooled is None:
+                pooled = _PooledDriver(self._driver_factory())
+
+            pooled.driver.switch_to.new_window('tab')
+            pooled.uses += 1
+        except Exception:
+            if pooled is not None:
+                self._quit(pooled, reason="could not open a tab")
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            pooled.owner = threading.get_ident()
+            self._leased[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def release(self, driver) -> None:
+        """Return a borrowed browser: close its tab, reset state and recycle if needed."""
+        with self._condition:
+            pooled = self._leased.pop(id(driver), None)
+        if pooled is None:
+            logger.warning("Released a Chrome driver that does not belong to the pool")
+            return
+
+        reusable = False
+        try:
+            reusable = self._reset(pooled)
+            if reusable and pooled.uses >= self.max_uses:
+                self._quit(pooled, reason=f"reached {self.max_uses} uses")
+                reusable = False
+            if reusable:
+                problem = self._memory_problem(pooled)
+                if problem:
+                    self._quit(pooled, reason=problem)
+                    reusable = False
+        finally:
+            with self._condition:
+                self._in_use -= 1
+                keep = reusable and not self._closed
+                if keep:
+                    self._idle.append(pooled)
+                self._condition.notify()
+            if reusable and not keep:
+                self._quit(pooled, reason="pool shut down")
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager around :meth:`acquire` / :meth:`release`."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def kill_leases(self, owner: int) -> int:
+        """
+        Kill the browsers leased by thread ``owner``, e.g. a scraper that ran
+        out of time. Its blocked WebDriver call then fails and the scraper's
+        ``release_driver`` discards the dead browser. Returns the number killed.
+        """
+        with self._condition:
+            leased = [pooled for pooled in self._leased.values() if pooled.owner == owner]
+        for pooled in leased:
+            # SIGKILL rather than driver.quit(): the WebDriver connection may be hung
+            pids = _process_tree(pooled.pid) or [pid for pid in [pooled.pid] if pid]
+            logger.warning(f"Killing Chrome driver of a cancelled scraper (pids {pids})")
+            for pid in reversed(pids):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+        return len(leased)
+
+    def close(self) -> None:
+        """Quit all idle browsers. Leased browsers are quit when they are released."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._quit(pooled, reason="pool closed")
+
+    def shutdown(self) -> None:
+        """Close the pool for good; further acquire() calls fail."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self.close()
+
+    def _health_problem(self, pooled: _PooledDriver) -> Optional[str]:
+        """Why an idle browser must not be handed out, or None if it is fine."""
+        try:
+            if pooled.base_handle not in pooled.driver.window_handles:
+                return "failed health check"
+        except Exception:
+            return "failed health check"
+        return self._memory_problem(pooled)
+
+    def _memory_problem(self, pooled: _PooledDriver) -> Optional[str]:
+        if not self.max_memory_mb:
+            return None
+        rss_mb = _process_tree_rss_mb(pooled.pid)
+        if rss_mb > self.max_memory_mb:
+            return f"uses {rss_mb:.0f} MB (cap {self.max_memory_mb} MB)"
+        return None
+
+    def _reset(self, pooled: _PooledDriver) -> bool:
+        """Close the scraper's tab and clear cookies. Returns False if the browser is unusable."""
+        driver = pooled.driver
+        try:
+            for handle in driver.window_handles:
+                if handle != pooled.base_handle:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(pooled.base_handle)
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except Exception:
+                driver.delete_all_cookies()
+            return True
+        except Exception as e:
+            self._quit(pooled, reason=f"reset failed: {e}")
+            return False
+
+    def _quit(self, pooled: _PooledDriver, reason: str) -> None:
+        logger.info(f"Recycling pooled Chrome driver after {pooled.uses} uses ({reason})")
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting Chrome driver: {e}")
+
+
+_pool: Optional[ChromeDriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> ChromeDriverPool:
+    """Return the process-wide Chrome driver pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ChromeDriverPool(
+                size=get_setting('CHROME_POOL_SIZE', 1),
+                max_uses=get_setting('CHROME_POOL_MAX_USES', 20),
+                max_memory_mb=get_setting('CHROME_POOL_MAX_MEMORY_MB', 600),
+                acquire_timeout=get_setting('CHROME_POOL_ACQUIRE_TIMEOUT', 60),
+            )
+            # The browsers stay warm between scraping runs; quit them on exit
+            atexit.register(close_driver_pool)
+        return _pool
+
+
+def acquire_driver(timeout: Optional[float] = None):
+    """Borrow a browser tab from the shared pool. Pair with :func:`release_driver`."""
+    return get_driver_pool().acquire(timeout)
+
+
+def release_driver(driver) -> None:
+    """Return a browser obtained from :func:`acquire_driver` to the shared pool."""
+    get_driver_pool().release(driver)
+
+
+def kill_thread_drivers(owner: int) -> int:
+    """Kill the browsers that thread ``owner`` leased from the shared pool."""
+    with _pool_lock:
+        pool = _pool
+    return pool.kill_leases(owner) if pool is not None else 0
+
+
+def close_driver_pool() -> None:
+    """Quit the idle browsers of the shared pool (registered to run at exit)."""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.close()
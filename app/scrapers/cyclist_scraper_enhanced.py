@@ -1,23 +1,20 @@
 # app/scrapers/cyclist_scraper_enhanced.py
 import re
 import os
-import requests
-import time
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from bs4 import BeautifulSoup
-from PIL import Image
-import pytesseract
-import io
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from .page_readiness import (all_of, any_of, document_ready, network_idle,
+                             selector_present, wait_until_ready)
+from . import ocr_preprocess
+from .ocr_engine import get_ocr_engine
 
 
 class CyclistScraperEnhanced(BaseScraper):
@@ -64,7 +61,7 @@ class CyclistScraperEnhanced(BaseScraper):
         """Find the latest menu URL using multiple strategies."""
         # Strategy 1: Check the main website for Flipsnack links
         try:
-            response = requests.get(self.base_url, headers=self.headers, timeout=10)
+            response = self.http_get(self.base_url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -80,6 +77,8 @@ class CyclistScraperEnhanced(BaseScraper):
                         self.logger.info(f"Found Flipsnack link: {href}")
                         return href
                         
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error checking main website: {e}")
         
@@ -89,7 +88,13 @@ class CyclistScraperEnhanced(BaseScraper):
             driver = self.setup_selenium_driver()
             if driver:  # Only proceed if driver was successfully created
                 driver.get(self.base_url)
-                time.sleep(3)  # Wait for dynamic content
+                # Wait for dynamic content: a Flipsnack embed or a quiet network
+                wait_until_ready(
+                    driver,
+                    any_of(selector_present("iframe[src*='flipsnack.com'], a[href*='flipsnack.com']"),
+                           network_idle()),
+                    description=f"{self.name} website",
+                )
                 
                 # Check for iframes
                 iframes = driver.find_elements(By.TAG_NAME, "iframe")
@@ -118,7 +123,7 @@ class CyclistScraperEnhanced(BaseScraper):
         # Strategy 3: Check known Flipsnack collection
         try:
             collection_url = "https://www.flipsnack.com/EE9BE6CC5A8/"
-            response = requests.get(collection_url, headers=self.headers, timeout=10)
+            response = self.http_get(collection_url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -149,6 +154,8 @@ class CyclistScraperEnhanced(BaseScraper):
                     self.logger.info(f"Found latest menu in collection: {latest_url}")
                     return latest_url
                     
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error checking Flipsnack collection: {e}")
         
@@ -168,10 +175,7 @@ class CyclistScraperEnhanced(BaseScraper):
                 
             driver.get(url)
             
-            # Wait for the flipbook to load
-            wait = WebDriverWait(driver, 15)
-            
-            # Try different selectors for the flipbook content
+            # Different selectors for the flipbook content
             selectors = [
                 "div.flipsnack-book",
                 "div.flipbook-container",
@@ -180,14 +184,20 @@ class CyclistScraperEnhanced(BaseScraper):
                 "img[src*='page_1']"
             ]
             
+            # Wait for the flipbook to load: one of the selectors present and
+            # the document complete (so images are in the screenshot)
+            wait_until_ready(
+                driver,
+                all_of(document_ready(), any_of(*(selector_present(s) for s in selectors))),
+                description=f"{self.name} flipbook",
+            )
+            
             element = None
             for selector in selectors:
-                try:
-                    element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    if element:
-                        break
-                except:
-                    continue
+                found = driver.find_elements(By.CSS_SELECTOR, selector)
+                if found:
+                    element = found[0]
+                    break
             
             if element:
                 # Take screenshot of the element
@@ -211,7 +221,7 @@ class CyclistScraperEnhanced(BaseScraper):
         """Get menu image using multiple methods."""
         # Method 1: Try to get direct image URL from page
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http_get(url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -222,11 +232,13 @@ class CyclistScraperEnhanced(BaseScraper):
                     # Try to get higher resolution
                     image_url = image_url.replace('/medium', '/large').replace('/small', '/large')
                     
-                    img_response = requests.get(image_url, headers=self.headers, timeout=15)
+                    img_response = self.http_get(image_url, headers=self.headers, timeout=15)
                     if img_response.status_code == 200:
                         self.logger.info(f"Downloaded image from: {image_url}")
                         return img_response.content
                         
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error downloading direct image: {e}")
         
@@ -240,21 +252,13 @@ class CyclistScraperEnhanced(BaseScraper):
     def perform_ocr(self, image_data: bytes) -> Optional[str]:
         """Perform OCR on image data."""
         try:
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Preprocess image for better OCR
-            # Convert to grayscale if needed
-            if image.mode != 'L':
-                image = image.convert('L')
-            
-            # Enhance contrast
-            from PIL import ImageEnhance
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(2.0)
+            # Preprocess image for better OCR: grayscale, enhanced contrast
+            image = ocr_preprocess.ENHANCED(image_data)
             
             # Perform OCR with German language
             custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(image, lang='deu+eng', config=custom_config)
+            text = get_ocr_engine().image_to_data(image, config=custom_config,
+                                                  cancelled=self.cancelled).text
             
             self.logger.info(f"OCR extracted {len(text)} characters")
             return text
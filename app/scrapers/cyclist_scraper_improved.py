@@ -2,21 +2,35 @@
 """
 Improved Cyclist scraper with better OCR handling for Raspberry Pi.
 """
+import hashlib
 import re
-import requests
 from datetime import date
 from typing import List, Dict, Optional, Tuple
 from bs4 import BeautifulSoup
-from PIL import Image, ImageEnhance, ImageFilter
-import pytesseract
-import io
+from PIL import Image
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled, SourceUnchanged
+from .http_cache import CachedResponse
+from .ocr_engine import OcrEngine, OcrResult, get_ocr_engine
+from .ocr_layout import find_sections, get_layout_cache
+from . import ocr_preprocess
+from .settings import get_setting
 
 
 class CyclistScraperImproved(BaseScraper):
     """Improved Cyclist scraper with better image processing."""
     
+    # Section headers of the weekly menu page, by weekday
+    WEEKDAY_HEADERS = {
+        'MONDAY': ('MONTAG',),
+        'TUESDAY': ('DIENSTAG',),
+        'WEDNESDAY': ('MITTWOCH',),
+        'THURSDAY': ('DONNERSTAG',),
+        'FRIDAY': ('FREITAG',),
+        'SATURDAY': ('SAMSTAG',),
+        'SUNDAY': ('SONNTAG',),
+    }
+    
     def __init__(self):
         super().__init__(
             "Cyclist",
@@ -24,8 +38,10 @@ class CyclistScraperImproved(BaseScraper):
         )
         self.base_url = self.url
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (X11; Linux armv7l) AppleWebKit/537.36'
+            'User-Agent': get_setting('SCRAPING_USER_AGENT')
         }
+        # Image responses fetched while probing candidate URLs, reused for the download
+        self._probed: Dict[str, CachedResponse] = {}
         
     def get_direct_image_url(self) -> Optional[str]:
         """Try to get the direct image URL from Flipsnack with multiple strategies."""
@@ -45,7 +61,7 @@ class CyclistScraperImproved(BaseScraper):
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            response = requests.get(known_url, headers=browser_headers, timeout=15)
+            response = self.http_get(known_url, headers=browser_headers, timeout=15)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -94,81 +110,117 @@ class CyclistScraperImproved(BaseScraper):
     
     def test_image_url(self, url: str, headers: dict) -> bool:
         """Test if an image URL is accessible."""
+        return self._probe_image(url, headers) is not None
+
+    def _probe_image(self, url: str, headers: dict,
+                     require_image: bool = False) -> Optional[CachedResponse]:
+        """
+        GET a candidate image URL and keep the response for the download that
+        follows, instead of a HEAD request followed by a second GET.
+        """
+        if url in self._probed:
+            return self._probed[url]
         try:
-            response = requests.head(url, headers=headers, timeout=10)
-            return response.status_code == 200
-        except:
-            return False
+            response = self.http_get(url, headers=headers, timeout=20)
+        except Exception:
+            return None
+        if response.status_code != 200:
+            return None
+        if require_image and "image" not in response.headers.get("Content-Type", ""):
+            return None
+        self._probed[url] = response
+        return response
+
+    def _get_image(self, url: str, headers: dict, timeout: float = 20):
+        """The response for ``url``: the probed one if there is one, else a fresh GET."""
+        response = self._probed.pop(url, None)
+        if response is None:
+            response = self.http_get(url, headers=headers, timeout=timeout)
+        return response
     
     def preprocess_image_for_ocr(self, image_data: bytes) -> Image.Image:
         """Preprocess image for better OCR results."""
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Resize if too small
-        width, height = image.size
-        if width < 1000:
-            scale_factor = 1500 / width
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Convert to grayscale
-        image = image.convert('L')
-        
-        # Apply sharpening filter
-        image = image.filter(ImageFilter.SHARPEN)
-        
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
-        
-        # Apply threshold to get black and white image
-        threshold = 128
-        image = image.point(lambda p: p > threshold and 255)
-        
-        return image
+        return ocr_preprocess.MENU(image_data)
     
     def perform_advanced_ocr(self, image_data: bytes) -> Optional[str]:
         """Perform OCR with advanced preprocessing."""
         try:
-            # Preprocess the image
-            image = self.preprocess_image_for_ocr(image_data)
+            page = None
             
-            # Save preprocessed image for debugging
-            debug_path = "/home/stecher/lunch_app/Screenshots/preprocessed_menu.png"
-            image.save(debug_path)
-            self.logger.info(f"Saved preprocessed image to {debug_path}")
+            def preprocess():
+                # Only called when the OCR results are not cached yet
+                nonlocal page
+                if page is None:
+                    page = self.preprocess_image_for_ocr(image_data)
+                return page
             
-            # Perform OCR with different configurations
+            # Perform OCR with different configurations, in parallel
             configs = [
                 r'--oem 3 --psm 6',  # Default
                 r'--oem 3 --psm 11',  # Sparse text
                 r'--oem 3 --psm 3',   # Fully automatic page segmentation
             ]
-            
-            best_text = ""
-            best_length = 0
-            
-            for config in configs:
-                try:
-                    text = pytesseract.image_to_string(image, lang='deu+eng', config=config)
-                    if len(text) > best_length:
-                        best_text = text
-                        best_length = len(text)
-                except:
-                    continue
+            weekday = date.today().strftime("%A").upper()
+
+            def has_todays_menu(result: OcrResult) -> bool:
+                # Good enough as soon as today's two dishes can be parsed
+                return len(self.parse_menu_intelligently(result.text).get(weekday, [])) == 2
+
+            engine = get_ocr_engine()
+            self.on_cancel(engine.terminate)
+            # The downloaded bytes plus the preprocessing identify the OCR input
+            image_key = f"{hashlib.sha256(image_data).hexdigest()}:{ocr_preprocess.MENU.signature}"
+            result = self._ocr_todays_section(engine, preprocess, image_key, weekday,
+                                              configs, has_todays_menu)
+            if result is None:
+                # Unknown layout, or today's section alone did not parse
+                self.check_cancelled()
+                result = engine.recognize(preprocess, configs, validate=has_todays_menu,
+                                          image_key=image_key, cancelled=self.cancelled)
+            self.check_cancelled()
+            best_text = result.text if result else ""
             
             self.logger.info(f"OCR extracted {len(best_text)} characters")
             return best_text if best_text else None
             
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Advanced OCR error: {e}")
             return None
     
+    def _ocr_todays_section(self, engine: OcrEngine, preprocess, image_key: str, weekday: str,
+                            configs: List[str], validate) -> Optional[OcrResult]:
+        """
+        OCR only the block of the page that holds today's menu. The blocks are
+        located once per image, from the word boxes of a single full-page pass,
+        and cached; None if today's block cannot be found or does not parse.
+        """
+        layouts = get_layout_cache()
+        boxes = layouts.get(image_key) if layouts else None
+        if boxes is None:
+            page_result = engine.recognize(preprocess, configs[:1], image_key=image_key,
+                                           cancelled=self.cancelled)
+            if page_result is None:
+                return None
+            if validate(page_result):
+                return page_result
+            boxes = find_sections(page_result.words, self.WEEKDAY_HEADERS, preprocess().size)
+            self.logger.info(f"Found menu sections: {', '.join(boxes) or 'none'}")
+            if layouts:
+                layouts.put(image_key, boxes)
+        
+        box = boxes.get(weekday)
+        if not box:
+            return None
+        self.check_cancelled()
+        result = engine.recognize(preprocess().crop(box), configs, validate=validate,
+                                  cancelled=self.cancelled)
+        if result is not None and validate(result):
+            self.logger.info(f"Read today's menu from its section {box}")
+            return result
+        return None
+    
     def clean_ocr_text(self, text: str) -> str:
         """Clean up common OCR errors."""
         # Replace common OCR mistakes
@@ -501,7 +553,7 @@ class CyclistScraperImproved(BaseScraper):
         """Try to extract menu data directly from the Flipsnack URL."""
         try:
             # Get the Flipsnack URL from the main page
-            response = requests.get(self.base_url, headers=self.headers, timeout=15)
+            response = self.http_get(self.base_url, headers=self.headers, timeout=15)
             if response.status_code != 200:
                 return None
                 
@@ -532,7 +584,7 @@ class CyclistScraperImproved(BaseScraper):
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            response = requests.get(flipsnack_url, headers=browser_headers, timeout=20)
+            response = self.http_get(flipsnack_url, headers=browser_headers, timeout=20)
             if response.status_code == 200:
                 return response.text
                 
@@ -595,6 +647,7 @@ class CyclistScraperImproved(BaseScraper):
     def scrape(self) -> Optional[List[Dict]]:
         """Main scraping method with improved approach - includes daily menu and TAGESTELLER info."""
         self.logger.info(f"Starting improved scrape for {self.name}")
+        self._probed.clear()
         
         # First try to get today's menu from current week data
         current_menu = self.parse_todays_menu_from_current_data()
@@ -658,14 +711,20 @@ class CyclistScraperImproved(BaseScraper):
                 'Referer': 'https://www.flipsnack.com/',
             }
             
-            response = requests.get(image_url, headers=browser_headers, timeout=20)
+            response = self._get_image(image_url, browser_headers)
             if response.status_code != 200:
                 self.logger.error(f"Failed to download image: {response.status_code}")
                 return self.get_fallback_menu()
             
+            # Same image as last time: no need to run OCR again
+            self.ensure_source_changed(response)
+            self.check_source(response.content)
+            
             image_data = response.content
             self.logger.info(f"Downloaded image ({len(image_data)} bytes)")
             
+        except SourceUnchanged:
+            raise
         except Exception as e:
             self.logger.error(f"Error downloading image: {e}")
             return self.get_fallback_menu()
@@ -751,12 +810,8 @@ class CyclistScraperImproved(BaseScraper):
                 if a in u:
                     candidates.append(u.replace(a, b))
             for cand in candidates:
-                try:
-                    r = requests.head(cand, headers=self.headers, timeout=12, allow_redirects=True)
-                    if r.status_code == 200 and "image" in r.headers.get("Content-Type", ""):
-                        return cand
-                except Exception:
-                    pass
+                if self._probe_image(cand, self.headers, require_image=True):
+                    return cand
             return None
 
         # 1) og:image
@@ -783,24 +838,15 @@ class CyclistScraperImproved(BaseScraper):
 
     def _download_image_for_ocr(self, url: str) -> Image.Image:
         """Download and prepare image for OCR."""
-        r = requests.get(url, headers=self.headers, timeout=20)
+        r = self._get_image(url, self.headers)
         r.raise_for_status()
-        img = Image.open(io.BytesIO(r.content))
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-        # upscale mildly for better OCR of small fonts
-        if img.width < 1600:
-            scale = 1600 / img.width
-            img = img.resize((int(img.width*scale), int(img.height*scale)), Image.Resampling.LANCZOS)
-        return img
+        # Upscaling for the small fonts happens in _preprocess_for_tagesteller
+        return ocr_preprocess.load_image(r.content)
 
     def _preprocess_for_tagesteller(self, img: Image.Image) -> Image.Image:
         """Preprocess image for TAGESTELLER OCR."""
-        g = img.convert("L")
-        g = g.filter(ImageFilter.SHARPEN)
-        g = ImageEnhance.Contrast(g).enhance(1.8)
-        # Light binarization helps Tesseract with fine fonts
-        return g.point(lambda p: 255 if p > 160 else 0)
+        # Upscale, sharpen and binarize adaptively (fine fonts on a shaded box)
+        return ocr_preprocess.TAGESTELLER(img)
 
     def _find_tagesteller_roi(self, img: Image.Image, keywords=("TAGESTELLER",), bottom_anchors=("FRÜHSTÜCK", "FRUESTUECK", "FRUHSTUCK", "INFUSED")) -> Image.Image:
         """
@@ -808,25 +854,28 @@ class CyclistScraperImproved(BaseScraper):
         and above 'FRÜHSTÜCK/Infused water'.
         """
         try:
-            data = pytesseract.image_to_data(img, lang="deu+eng", config="--oem 3 --psm 6", output_type=pytesseract.Output.DICT)
+            ocr_words = get_ocr_engine().image_to_data(img, config="--oem 3 --psm 6",
+                                                       cancelled=self.cancelled).words
         except Exception as e:
             self.logger.error(f"OCR failed for ROI detection: {e}")
             # Return fallback ROI
             w, h = img.size
             return img.crop((int(0.08*w), int(0.18*h), int(0.48*w), int(0.75*h)))
 
+        def box(word):
+            return (word["left"], word["top"], word["width"], word["height"])
+
         def boxes_for(words):
-            idxs = [i for i, w in enumerate(data["text"]) if (w or "").upper() in words]
-            return [(data["left"][i], data["top"][i], data["width"][i], data["height"][i]) for i in idxs]
+            return [box(w) for w in ocr_words if w["text"].upper() in words]
 
         tagesteller_boxes = boxes_for(set(k.upper() for k in keywords))
         bottom_boxes = boxes_for(set(b.upper() for b in bottom_anchors))
 
         if not tagesteller_boxes:
             # fallback: search partial token match (e.g., "TAGESTEL…")
-            for i, w in enumerate(data["text"]):
-                if re.fullmatch(r"tage?steller", (w or "").lower()):
-                    tagesteller_boxes.append((data["left"][i], data["top"][i], data["width"][i], data["height"][i]))
+            for w in ocr_words:
+                if re.fullmatch(r"tage?steller", w["text"].lower()):
+                    tagesteller_boxes.append(box(w))
                     break
 
         if not tagesteller_boxes:
@@ -855,25 +904,24 @@ class CyclistScraperImproved(BaseScraper):
         then split into (text, price) pairs by looking for the right-most numeric token.
         """
         try:
-            data = pytesseract.image_to_data(roi, lang="deu+eng", config="--oem 3 --psm 6", output_type=pytesseract.Output.DICT)
+            ocr_words = get_ocr_engine().image_to_data(roi, config="--oem 3 --psm 6",
+                                                       cancelled=self.cancelled).words
         except Exception as e:
             self.logger.error(f"OCR failed for lines extraction: {e}")
             return []
             
         words = []
-        for i in range(len(data["text"])):
-            t = (data["text"][i] or "").strip()
-            if not t:
-                continue
+        for word in ocr_words:
+            t = word["text"]
             # filter obvious noise
             if len(t) == 1 and not t.isalnum():
                 continue
             words.append({
                 "t": t,
-                "x": data["left"][i],
-                "y": data["top"][i],
-                "w": data["width"][i],
-                "h": data["height"][i],
+                "x": word["left"],
+                "y": word["top"],
+                "w": word["width"],
+                "h": word["height"],
             })
 
         # group into rows by y (tolerate small misalignment)
@@ -930,7 +978,7 @@ class CyclistScraperImproved(BaseScraper):
             self.logger.info(f"Extracting TAGESTELLER info from: {alacarte_url}")
             
             # 1) resolve an image URL from full-view
-            html = requests.get(alacarte_url, headers=self.headers, timeout=20).content
+            html = self.http_get(alacarte_url, headers=self.headers, timeout=20).content
             img_url = self._first_image_from_html(html)
             if not img_url:
                 self.logger.warning("Could not resolve a page image URL from Flipsnack À la Carte viewer")
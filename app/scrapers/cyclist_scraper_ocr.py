@@ -1,16 +1,14 @@
 # app/scrapers/cyclist_scraper_ocr.py
 import re
 import os
-import requests
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from bs4 import BeautifulSoup
-from PIL import Image
-import pytesseract
-import io
 from urllib.parse import urlparse, parse_qs
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from . import ocr_preprocess
+from .ocr_engine import get_ocr_engine
 
 
 class CyclistScraperOCR(BaseScraper):
@@ -30,7 +28,7 @@ class CyclistScraperOCR(BaseScraper):
         """Find the latest Flipsnack menu URL from the Cyclist website or list."""
         try:
             # First try to get from the main website
-            response = requests.get(self.base_url, headers=self.headers, timeout=10)
+            response = self.http_get(self.base_url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 # Look for Flipsnack links
@@ -41,7 +39,7 @@ class CyclistScraperOCR(BaseScraper):
             
             # If not found on website, try to get the latest from Flipsnack collection
             collection_url = self.flipsnack_base
-            response = requests.get(collection_url, headers=self.headers, timeout=10)
+            response = self.http_get(collection_url, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 # Look for the most recent menu
@@ -51,6 +49,8 @@ class CyclistScraperOCR(BaseScraper):
                         self.logger.info(f"Found Flipsnack menu in collection: {full_url}")
                         return full_url
                         
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error finding latest Flipsnack URL: {e}")
         
@@ -60,7 +60,7 @@ class CyclistScraperOCR(BaseScraper):
     def get_menu_image_url(self, flipsnack_url: str) -> Optional[str]:
         """Extract the menu image URL from Flipsnack page."""
         try:
-            response = requests.get(flipsnack_url, headers=self.headers, timeout=10)
+            response = self.http_get(flipsnack_url, headers=self.headers, timeout=10)
             if response.status_code != 200:
                 self.logger.error(f"Failed to fetch Flipsnack page: {response.status_code}")
                 return None
@@ -79,6 +79,8 @@ class CyclistScraperOCR(BaseScraper):
             # Alternative: Look for data attributes or JavaScript variables
             # This would need more sophisticated parsing if the above doesn't work
             
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error extracting image URL: {e}")
             
@@ -87,22 +89,25 @@ class CyclistScraperOCR(BaseScraper):
     def download_and_ocr_image(self, image_url: str) -> Optional[str]:
         """Download image and perform OCR to extract text."""
         try:
-            response = requests.get(image_url, headers=self.headers, timeout=15)
+            response = self.http_get(image_url, headers=self.headers, timeout=15)
             if response.status_code != 200:
                 self.logger.error(f"Failed to download image: {response.status_code}")
                 return None
                 
-            # Open image with PIL
-            image = Image.open(io.BytesIO(response.content))
+            # Decode (as grayscale) for OCR
+            image = ocr_preprocess.PLAIN(response.content)
             
             # Perform OCR with German language support
-            # Make sure pytesseract and tesseract-ocr-deu are installed
+            # Make sure tesserocr (or pytesseract) and tesseract-ocr-deu are installed
             custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(image, lang='deu', config=custom_config)
+            text = get_ocr_engine().image_to_data(image, config=custom_config,
+                                                  cancelled=self.cancelled).text
             
             self.logger.info(f"OCR completed, extracted {len(text)} characters")
             return text
             
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error during OCR: {e}")
             return None
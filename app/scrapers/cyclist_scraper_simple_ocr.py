@@ -4,15 +4,13 @@ Simplified OCR-based Cyclist scraper without Selenium dependency.
 Optimized for Raspberry Pi and systems where Selenium is problematic.
 """
 import re
-import requests
 from datetime import date
 from typing import List, Dict, Optional, Tuple
 from bs4 import BeautifulSoup
-from PIL import Image
-import pytesseract
-import io
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from . import ocr_preprocess
+from .ocr_engine import get_ocr_engine
 
 
 class CyclistScraperSimpleOCR(BaseScraper):
@@ -37,7 +35,7 @@ class CyclistScraperSimpleOCR(BaseScraper):
         
         for url in known_urls:
             try:
-                response = requests.get(url, headers=self.headers, timeout=15)
+                response = self.http_get(url, headers=self.headers, timeout=15)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
                     
@@ -50,6 +48,8 @@ class CyclistScraperSimpleOCR(BaseScraper):
                         self.logger.info(f"Found image URL: {image_url}")
                         return image_url
                         
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 self.logger.error(f"Error checking {url}: {e}")
                 continue
@@ -59,20 +59,13 @@ class CyclistScraperSimpleOCR(BaseScraper):
     def perform_ocr(self, image_data: bytes) -> Optional[str]:
         """Perform OCR on image data with preprocessing."""
         try:
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to grayscale for better OCR
-            if image.mode != 'L':
-                image = image.convert('L')
-            
-            # Enhance contrast
-            from PIL import ImageEnhance
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(1.5)
+            # Convert to grayscale and enhance contrast for better OCR
+            image = ocr_preprocess.SIMPLE(image_data)
             
             # Perform OCR
             custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(image, lang='deu+eng', config=custom_config)
+            text = get_ocr_engine().image_to_data(image, config=custom_config,
+                                                  cancelled=self.cancelled).text
             
             self.logger.info(f"OCR extracted {len(text)} characters")
             return text
@@ -144,11 +137,13 @@ class CyclistScraperSimpleOCR(BaseScraper):
         
         # Download image
         try:
-            response = requests.get(image_url, headers=self.headers, timeout=20)
+            response = self.http_get(image_url, headers=self.headers, timeout=20)
             if response.status_code != 200:
                 self.logger.error(f"Failed to download image: {response.status_code}")
                 return self.get_fallback_menu()
             image_data = response.content
+        except ScrapeCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error downloading image: {e}")
             return self.get_fallback_menu()
@@ -0,0 +1,153 @@
+"""
+Small persistent key/value store on the local disk.
+
+Each entry is one file holding a JSON metadata line followed by the raw
+body, written atomically so that the web process and the systemd scrape
+job can share a cache directory. When the directory grows beyond
+``max_bytes`` the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import BinaryIO, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCacheStore:
+    """A size-bounded, least-recently-used cache of byte strings keyed by text."""
+
+    SUFFIX = '.entry'
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[Tuple[bytes, dict]]:
+        """Return ``(body, metadata)`` for ``key``, or None if it is not cached."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('key') != key:
+            return None
+        self._touch(path)
+        return body, meta
+
+    def open(self, key: str) -> Optional[Tuple[BinaryIO, dict]]:
+        """
+        Like :meth:`get`, but return an open file positioned at the start of
+        the body instead of reading it into memory. The caller closes it.
+        """
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return None
+        try:
+            meta = json.loads(f.readline())
+        except (OSError, ValueError):
+            f.close()
+            return None
+
+        if meta.get('key') != key:
+            f.close()
+            return None
+        self._touch(path)
+        return f, meta
+
+    def put(self, key: str, body: bytes, meta: Optional[dict] = None) -> None:
+        """Store ``body`` with its metadata, then evict old entries if over the size cap."""
+        if len(body) > self.max_bytes:
+            logger.debug(f"Not caching {key}: {len(body)} bytes exceeds the cache size")
+            return
+        self._write(key, meta, lambda f: f.write(body))
+
+    def put_file(self, key: str, source: BinaryIO, size: int, meta: Optional[dict] = None) -> None:
+        """Store the ``size`` bytes read from ``source`` (copied in chunks, not loaded at once)."""
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds the cache size")
+            return
+        self._write(key, meta, lambda f: shutil.copyfileobj(source, f))
+
+    def _write(self, key: str, meta: Optional[dict], write_body) -> None:
+        meta = dict(meta or {}, key=key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(meta).encode('utf-8') + b'\n')
+                write_body(f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write cache entry for {key}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self.evict()
+
+    def touch(self, key: str) -> None:
+        """Mark ``key`` as recently used."""
+        self._touch(self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(self.SUFFIX):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    continue
+            logger.info(f"Evicted cache entries in {self.directory} "
+                        f"(now {total / (1024 * 1024):.1f} MB)")
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        # The modification time doubles as the last-used time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
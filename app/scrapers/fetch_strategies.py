@@ -0,0 +1,237 @@
+"""
+Fetch strategies used by scrapers to obtain a page.
+
+A scraper lists the strategies it supports in order of cost, and
+``BaseScraper.fetch_page()`` returns the result of the first one that
+produces usable content. The cheap :class:`HttpFetchStrategy` tries a plain
+HTTP GET (including Next.js ``__NEXT_DATA__`` / ``_next/data`` JSON) and the
+:class:`BrowserFetchStrategy` falls back to the shared headless Chrome.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from .http_session import get_session, request_timeout
+from .retry import send_with_retry
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+def parse_next_data(html: str) -> Optional[dict]:
+    """Return the parsed ``__NEXT_DATA__`` blob of a Next.js page, if any."""
+    script = BeautifulSoup(html, 'html.parser').find('script', id='__NEXT_DATA__')
+    if not script or not script.string:
+        return None
+    try:
+        return json.loads(script.string)
+    except json.JSONDecodeError:
+        return None
+
+
+def next_data_url(url: str, next_data: dict) -> Optional[str]:
+    """Build the ``_next/data`` JSON URL for the page described by ``next_data``."""
+    build_id = next_data.get('buildId')
+    page = next_data.get('page')
+    if not build_id or not page:
+        return None
+    for key, value in next_data.get('query', {}).items():
+        page = page.replace(f'[{key}]', str(value))
+    prefix = next_data.get('assetPrefix', '')
+    return urljoin(url, f"{prefix}/_next/data/{build_id}{page}.json")
+
+
+def default_headers() -> dict:
+    """Request headers shared by the plain HTTP fetches."""
+    return {
+        'User-Agent': get_setting('SCRAPING_USER_AGENT'),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    }
+
+
+class FetchError(Exception):
+    """Raised when none of a scraper's fetch strategies produced usable content."""
+
+
+class FetchResult:
+    """The content of a fetched page and the strategy that produced it."""
+
+    def __init__(self, url: str, strategy: str, html: Optional[str] = None,
+                 data: Optional[dict] = None, text: Optional[str] = None,
+                 data_url: Optional[str] = None):
+        self.url = url
+        self.strategy = strategy
+        self.html = html
+        self.data = data
+        # The _next/data URL ``data`` was loaded from, if any
+        self.data_url = data_url
+        self._text = text
+        self._soup = None
+
+    @property
+    def raw(self) -> bytes:
+        """The fetched content as bytes, for fingerprinting."""
+        if self.data is not None:
+            return json.dumps(self.data, sort_keys=True).encode('utf-8')
+        return (self.html or '').encode('utf-8')
+
+    @property
+    def soup(self) -> Optional[BeautifulSoup]:
+        """Parsed HTML (cached), or None for JSON-only results."""
+        if self._soup is None and self.html is not None:
+            self._soup = BeautifulSoup(self.html, 'html.parser')
+        return self._soup
+
+    @property
+    def text(self) -> str:
+        """Visible page text, one block per line."""
+        if self._text is None:
+            soup = self.soup
+            if soup is None:
+                return ""
+            for tag in soup(['script', 'style', 'noscript']):
+                tag.decompose()
+            self._text = soup.get_text('\n')
+        return self._text
+
+
+class FetchStrategy(ABC):
+    """A way of obtaining page content for a URL."""
+
+    name = "base"
+
+    @abstractmethod
+    def fetch(self, url: str) -> Optional[FetchResult]:
+        """Return the page content, or None if this strategy could not get usable content."""
+        pass
+
+
+class HttpFetchStrategy(FetchStrategy):
+    """
+    Plain HTTP fetch without a browser.
+
+    The server-rendered HTML is accepted when ``is_complete(html)`` holds.
+    Otherwise, for Next.js pages, the page props embedded in ``__NEXT_DATA__``
+    and the ``_next/data/{buildId}/...json`` endpoint are checked with
+    ``data_has_content(page_props)``. Requests go over the shared pooled
+    session unless another ``requests.Session`` is passed.
+
+    A known ``data_url`` (e.g. built from the build id of another page on the
+    same host) is tried before the page itself; ``probe_data_endpoint=False``
+    skips looking for the data endpoint when it is known not to help.
+    """
+
+    name = "http"
+
+    def __init__(self, is_complete: Callable[[str], bool],
+                 data_has_content: Optional[Callable[[dict], bool]] = None,
+                 headers: Optional[dict] = None,
+                 session: Optional[requests.Session] = None,
+                 data_url: Optional[str] = None,
+                 probe_data_endpoint: bool = True):
+        self.is_complete = is_complete
+        self.data_has_content = data_has_content
+        self.headers = headers or default_headers()
+        self.session = session
+        self.data_url = data_url
+        self.probe_data_endpoint = probe_data_endpoint
+
+    def fetch(self, url: str) -> Optional[FetchResult]:
+        session = self.session or get_session()
+        timeout = request_timeout()
+
+        if self.data_url and self.data_has_content is not None:
+            try:
+                result = self._fetch_data(url, self.data_url, None, session, timeout)
+            except (requests.RequestException, ValueError) as e:
+                logger.info(f"Known data endpoint {self.data_url} failed: {e}")
+                result = None
+            if result is not None:
+                return result
+
+        response = send_with_retry(
+            url, lambda: session.get(url, headers=self.headers, timeout=timeout)
+        )
+        response.raise_for_status()
+        html = response.text
+
+        if self.is_complete(html):
+            return FetchResult(url, self.name, html=html)
+
+        if self.data_has_content is None:
+            return None
+
+        next_data = parse_next_data(html)
+        if not next_data:
+            return None
+
+        page_props = next_data.get('props', {}).get('pageProps', {})
+        if self.data_has_content(page_props):
+            return FetchResult(url, self.name, html=html, data=page_props)
+
+        if not self.probe_data_endpoint:
+            return None
+        data_url = next_data_url(url, next_data)
+        if not data_url:
+            return None
+
+        logger.info(f"Trying Next.js data endpoint: {data_url}")
+        return self._fetch_data(url, data_url, html, session, timeout)
+
+    def _fetch_data(self, url: str, data_url: str, html: Optional[str],
+                    session: requests.Session, timeout) -> Optional[FetchResult]:
+        """Load page props from a ``_next/data`` URL; None unless they have content."""
+        response = send_with_retry(
+            data_url, lambda: session.get(data_url, headers=self.headers, timeout=timeout)
+        )
+        if response.status_code != 200:
+            return None
+        page_props = response.json().get('pageProps', {})
+        if self.data_has_content(page_props):
+            return FetchResult(url, self.name, html=html, data=page_props, data_url=data_url)
+        return None
+
+
+class BrowserFetchStrategy(FetchStrategy):
+    """
+    Render the page in a browser borrowed from the shared Chrome pool.
+
+    ``ready_condition`` is a factory returning a fresh page-readiness condition
+    (see ``page_readiness``) for every fetch.
+    """
+
+    name = "browser"
+
+    def __init__(self, ready_condition: Callable[[], Callable], description: str = "page",
+                 timeout: Optional[float] = None):
+        self.ready_condition = ready_condition
+        self.description = description
+        self.timeout = timeout
+
+    def fetch(self, url: str) -> Optional[FetchResult]:
+        # Imported lazily so scrapers served over plain HTTP never load Selenium
+        from selenium.webdriver.common.by import By
+
+        from .chrome_driver_setup import acquire_driver, release_driver
+        from .page_readiness import wait_until_ready
+
+        driver = acquire_driver()
+        try:
+            logger.info(f"Loading {url} in browser")
+            driver.get(url)
+            wait_until_ready(driver, self.ready_condition(), timeout=self.timeout,
+                             description=self.description)
+            return FetchResult(
+                url,
+                self.name,
+                html=driver.page_source,
+                text=driver.find_element(By.TAG_NAME, "body").text,
+            )
+        finally:
+            release_driver(driver)
@@ -5,15 +5,12 @@ Henry (enjoyhenry.com) restaurant scraper implementation.
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import logging
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
-import time
 import re
 
 from .base_scraper import BaseScraper
-from .chrome_driver_setup import get_chrome_driver
+from .chrome_driver_setup import acquire_driver, release_driver
+from .page_readiness import element_count_stable, wait_until_ready
 
 logger = logging.getLogger(__name__)
 
@@ -36,19 +33,15 @@ class HenryScraper(BaseScraper):
         driver = None
         
         try:
-            # Initialize the driver using ARM64-compatible setup
-            driver = get_chrome_driver()
+            # Borrow a browser tab from the shared Chrome pool
+            driver = acquire_driver()
             
             logger.info(f"Loading Henry menu page: {self.url}")
             driver.get(self.url)
             
-            # Wait for content to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Additional wait for dynamic content
-            time.sleep(3)
+            # Wait until today's menu column has rendered all of its cells
+            wait_until_ready(driver, element_count_stable("div.today div.td-menu"),
+                             timeout=10, description="Henry menu")
             
             # Get the page source and parse with BeautifulSoup
             page_source = driver.page_source
@@ -152,7 +145,7 @@ class HenryScraper(BaseScraper):
         
         finally:
             if driver:
-                driver.quit()
+                release_driver(driver)
         
         return menu_items
     
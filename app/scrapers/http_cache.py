@@ -0,0 +1,313 @@
+"""
+Conditional-GET HTTP cache for scraper downloads.
+
+Responses that carry an ``ETag`` or ``Last-Modified`` validator are stored on
+disk (see ``DiskCacheStore``). The next request for the same URL sends
+``If-None-Match`` / ``If-Modified-Since``; when the server answers
+``304 Not Modified`` the stored body is returned with ``not_modified`` set,
+so scrapers can skip parsing a source that has not changed.
+
+Large documents (PDFs) are fetched with :meth:`HttpCache.download`, which
+streams the body into a temporary file in chunks, enforcing a size cap and
+the expected content type, instead of holding it in memory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional, Sequence
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .disk_cache import DiskCacheStore
+from .http_session import get_session, request_timeout
+from .retry import send_with_retry
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """The subset of ``requests.Response`` used by the scrapers, plus cache state."""
+
+    def __init__(self, url: str, status_code: int, headers: dict, content: bytes,
+                 from_cache: bool = False, not_modified: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+
+    @property
+    def text(self) -> str:
+        encoding = get_encoding_from_headers(self.headers)
+        if not encoding or encoding == 'ISO-8859-1':
+            # requests' HTTP default; the pages we scrape are UTF-8
+            encoding = 'utf-8'
+        return self.content.decode(encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+class DownloadRejected(requests.RequestException):
+    """A download exceeded its size cap or is not of the expected type."""
+
+
+class Download:
+    """
+    A response body streamed to a named temporary file. ``path`` can be
+    handed to parsers (also in another process); ``sha256`` is the hex
+    digest of the body. Close it (or use ``with``) to delete the file.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: dict,
+                 file=None, size: int = 0, sha256: Optional[str] = None,
+                 from_cache: bool = False, not_modified: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.file.name if self.file is not None else None
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self) -> 'Download':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _spool(chunks, max_bytes: Optional[int], magic: Optional[bytes], url: str,
+           cancelled: Optional[threading.Event]):
+    """Write ``chunks`` to a temporary file; return ``(file, size, sha256)``."""
+    directory = get_setting('DOWNLOAD_TMP_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(dir=directory or None, suffix='.download')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        for chunk in chunks:
+            if cancelled is not None and cancelled.is_set():
+                raise requests.RequestException(f"Download of {url} was cancelled")
+            if size == 0 and magic and not chunk.startswith(magic):
+                raise DownloadRejected(f"{url} does not look like the expected document")
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise DownloadRejected(f"{url} is larger than {max_bytes} bytes")
+            digest.update(chunk)
+            f.write(chunk)
+        f.flush()
+        f.seek(0)
+    except BaseException:
+        f.close()
+        raise
+    return f, size, digest.hexdigest()
+
+
+def _read_chunks(f, chunk_size: int = 64 * 1024):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class HttpCache:
+    """
+    Performs GET requests over the shared pooled session, revalidating cached
+    bodies with conditional requests.
+    """
+
+    def __init__(self, store: Optional[DiskCacheStore] = None):
+        self.store = store
+
+    def get(self, url: str, headers: Optional[dict] = None,
+            timeout: Optional[float] = None,
+            cancelled: Optional[threading.Event] = None) -> CachedResponse:
+        """
+        GET ``url``; a 304 answer returns the cached body with ``not_modified`` set.
+        Retryable failures are retried under the shared retry policy.
+        """
+        timeout = request_timeout(timeout)
+        request_headers = dict(headers or {})
+
+        cached = self.store.get(url) if self.store else None
+        if cached:
+            meta = cached[1]
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        response = send_with_retry(
+            url,
+            lambda: get_session().get(url, headers=request_headers, timeout=timeout),
+            cancelled,
+        )
+
+        if response.status_code == 304 and cached:
+            body, meta = cached
+            logger.info(f"Not modified, using cached copy: {url}")
+            return CachedResponse(url, 200, meta.get('headers', {}), body,
+                                  from_cache=True, not_modified=True)
+
+        if response.status_code == 200 and self.store:
+            self._store(url, response)
+
+        return CachedResponse(url, response.status_code, dict(response.headers),
+                              response.content)
+
+    def download(self, url: str, headers: Optional[dict] = None,
+                 timeout: Optional[float] = None,
+                 cancelled: Optional[threading.Event] = None,
+                 max_bytes: Optional[int] = None,
+                 content_types: Optional[Sequence[str]] = None,
+                 magic: Optional[bytes] = None) -> Download:
+        """
+        Conditional GET of ``url`` streamed to a temporary file.
+
+        Raises :class:`DownloadRejected` if the body is larger than
+        ``max_bytes``, its Content-Type is not one of ``content_types`` or it
+        does not start with ``magic`` (e.g. ``b'%PDF-'``). Non-200 answers
+        are returned without a file.
+        """
+        timeout = request_timeout(timeout)
+        request_headers = dict(headers or {})
+
+        cached = self.store.open(url) if self.store else None
+        try:
+            if cached:
+                meta = cached[1]
+                if meta.get('etag'):
+                    request_headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    request_headers['If-Modified-Since'] = meta['last_modified']
+
+            response = send_with_retry(
+                url,
+                lambda: get_session().get(url, headers=request_headers, timeout=timeout,
+                                          stream=True),
+                cancelled,
+            )
+            with response:
+                if response.status_code == 304 and cached:
+                    body, meta = cached
+                    logger.info(f"Not modified, using cached copy: {url}")
+                    f, size, sha256 = _spool(_read_chunks(body), None, None, url, cancelled)
+                    return Download(url, 200, meta.get('headers', {}), f, size, sha256,
+                                    from_cache=True, not_modified=True)
+                if response.status_code != 200:
+                    return Download(url, response.status_code, dict(response.headers))
+
+                self._check_download(url, response, max_bytes, content_types)
+                f, size, sha256 = _spool(response.iter_content(64 * 1024), max_bytes,
+                                         magic, url, cancelled)
+        finally:
+            if cached:
+                cached[0].close()
+
+        download = Download(url, 200, dict(response.headers), f, size, sha256)
+        if self.store:
+            self._store(url, response, download)
+            f.seek(0)
+        return download
+
+    @staticmethod
+    def _check_download(url: str, response: requests.Response, max_bytes: Optional[int],
+                        content_types: Optional[Sequence[str]]) -> None:
+        """Reject a download from its headers, before reading the body."""
+        length = response.headers.get('Content-Length', '')
+        if max_bytes is not None and length.isdigit() and int(length) > max_bytes:
+            raise DownloadRejected(f"{url} is {int(length)} bytes, more than {max_bytes}")
+        if content_types:
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type and content_type not in content_types:
+                raise DownloadRejected(f"{url} has unexpected content type {content_type!r}")
+
+    def _store(self, url: str, response: requests.Response,
+               download: Optional[Download] = None) -> None:
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+
+        meta = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {
+                name: response.headers[name]
+                for name in ('Content-Type', 'ETag', 'Last-Modified')
+                if name in response.headers
+            },
+        }
+        if download is not None:
+            self.store.put_file(url, download.file, download.size, meta)
+        else:
+            self.store.put(url, response.content, meta)
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the process-wide HTTP cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            store = None
+            if get_setting('HTTP_CACHE_ENABLED', True):
+                store = DiskCacheStore(
+                    get_setting('HTTP_CACHE_DIR'),
+                    get_setting('HTTP_CACHE_MAX_MB', 200) * 1024 * 1024,
+                )
+            _cache = HttpCache(store)
+        return _cache
+
+
+def cached_get(url: str, headers: Optional[dict] = None,
+               timeout: Optional[float] = None,
+               cancelled: Optional[threading.Event] = None) -> CachedResponse:
+    """GET ``url`` through the shared HTTP cache."""
+    return get_http_cache().get(url, headers=headers, timeout=timeout, cancelled=cancelled)
+
+
+def cached_download(url: str, headers: Optional[dict] = None,
+                    timeout: Optional[float] = None,
+                    cancelled: Optional[threading.Event] = None,
+                    max_bytes: Optional[int] = None,
+                    content_types: Optional[Sequence[str]] = None,
+                    magic: Optional[bytes] = None) -> Download:
+    """Stream ``url`` to a temporary file through the shared HTTP cache."""
+    return get_http_cache().download(url, headers=headers, timeout=timeout,
+                                     cancelled=cancelled, max_bytes=max_bytes,
+                                     content_types=content_types, magic=magic)
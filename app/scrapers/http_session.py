@@ -0,0 +1,46 @@
+"""
+Shared HTTP client for the non-browser scrapers.
+
+One ``requests.Session`` per process keeps a pool of keep-alive connections
+for every host, so the homepage, PDF and image requests of a scraper (and of
+consecutive runs) reuse the same TLS connection. Every request carries the
+``SCRAPING_USER_AGENT`` and is bounded by the connect/read timeouts from the
+config.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .settings import get_setting
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def request_timeout(read: Optional[float] = None) -> Tuple[float, float]:
+    """``(connect, read)`` timeout; ``read`` overrides SCRAPING_TIMEOUT."""
+    if read is None:
+        read = get_setting('SCRAPING_TIMEOUT', 30)
+    return get_setting('SCRAPING_CONNECT_TIMEOUT', 5), read
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = get_setting('SCRAPING_USER_AGENT')
+            # One pool per host; enough connections for the concurrent scrapers
+            adapter = HTTPAdapter(
+                pool_connections=get_setting('HTTP_POOL_HOSTS', 16),
+                pool_maxsize=get_setting('SCRAPING_MAX_WORKERS', 4),
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
@@ -6,13 +6,13 @@ Scrapes PDF-based lunch menus from iki-restaurant.at
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import logging
-import requests
 from bs4 import BeautifulSoup
-import PyPDF2
-import io
 import re
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled, SourceUnchanged
+from .pdf_text import (PDF_CONTENT_TYPES, PDF_MAGIC, ExtractionCancelled, extract_pdf_text,
+                       max_pdf_bytes)
+from .settings import get_setting
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ class IKIScraper(BaseScraper):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(self.url, headers=headers)
+            response = self.http_get(self.url, headers=headers)
             if response.status_code != 200:
                 logger.error(f"Failed to load IKI website: {response.status_code}")
                 return None
@@ -89,24 +89,25 @@ class IKIScraper(BaseScraper):
         """
         Extract text from PDF URL.
         """
+        download = None
         try:
             logger.info(f"Downloading PDF from: {pdf_url}")
-            response = requests.get(pdf_url)
+            download = self.http_download(pdf_url, max_bytes=max_pdf_bytes(),
+                                          content_types=PDF_CONTENT_TYPES, magic=PDF_MAGIC)
             
-            if response.status_code != 200:
-                logger.error(f"Failed to download PDF: {response.status_code}")
+            if download.status_code != 200:
+                logger.error(f"Failed to download PDF: {download.status_code}")
                 return None
             
-            # Try to extract text with PyPDF2
-            pdf_file = io.BytesIO(response.content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            # Same PDF as last time: nothing to parse
+            self.ensure_source_changed(download)
+            self.check_source_hash(download.sha256)
             
-            full_text = ""
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
+            # Extract text with PyPDF2 (pdfplumber if PyPDF2 finds none),
+            # cached per PDF; all pages unless PDF_MAX_PAGES is set
+            pdf = extract_pdf_text(download.path, max_pages=get_setting('PDF_MAX_PAGES'),
+                                   digest=download.sha256, cancelled=self.cancelled)
+            full_text = pdf.text
             
             if full_text.strip():
                 logger.info(f"Successfully extracted {len(full_text)} characters from PDF")
@@ -115,9 +116,14 @@ class IKIScraper(BaseScraper):
                 logger.warning("No text could be extracted from PDF")
                 return None
                 
+        except (SourceUnchanged, ScrapeCancelled, ExtractionCancelled):
+            raise
         except Exception as e:
             logger.error(f"Error extracting PDF text: {e}")
             return None
+        finally:
+            if download is not None:
+                download.close()
     
     def parse_menu_items_from_text(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -220,6 +226,8 @@ class IKIScraper(BaseScraper):
             logger.info(f"Successfully extracted {len(menu_items)} menu items from IKI")
             return menu_items
             
+        except (SourceUnchanged, ScrapeCancelled, ExtractionCancelled):
+            raise
         except Exception as e:
             logger.error(f"Error scraping IKI: {str(e)}", exc_info=True)
             return []
@@ -0,0 +1,519 @@
+"""
+Mealplan engine for the erstecampus.at mealplan platform.
+
+4oh4, Café George and Erste Campus all embed the same Next.js application
+(``/mealplan/2025/external/single/<slug>.html``), which renders each dish as
+a ``meal-card``. The outlets are listed in ``MEALPLAN_OUTLETS`` and fetched
+through :class:`MealplanEngine` using the fetch strategies of
+:mod:`~app.scrapers.fetch_strategies`; one parser turns either the rendered
+cards or the meal records found in the page's JSON data into plain
+dictionaries:
+
+    {'data_category': 'appetizer', 'header': 'Salat / Suppe',
+     'title': 'Leberknödelsuppe', 'text': 'Klare Rinderbouillion|...',
+     'price': '€ 3.20'}
+"""
+
+import logging
+import re
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from .base_scraper import ScrapeCancelled
+from .fetch_strategies import (
+    BrowserFetchStrategy,
+    FetchError,
+    FetchResult,
+    FetchStrategy,
+    HttpFetchStrategy,
+)
+from .registry import disabled_names
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+MEAL_CARD_PATTERN = re.compile(r'class="meal-card["\s]')
+
+# Keys that identify a meal record in the platform's JSON data
+_TITLE_KEYS = ('title', 'name', 'mealName')
+_TEXT_KEYS = ('description', 'text', 'subtitle')
+_PRICE_KEYS = ('price', 'priceFormatted', 'prices')
+_CATEGORY_KEYS = ('category', 'categoryName', 'type')
+
+# Card headers used by the outlets (matched case-insensitively) ...
+CATEGORY_LABELS = {
+    'salat / suppe': 'Salad / Soup',
+    'hauptspeise': 'Main Dish',
+    'main dish': 'Main Dish',
+    'pizza': 'Pizza',
+    'soup': 'Soup',
+    'salad': 'Salad',
+    'dessert': 'Dessert',
+    'desserts': 'Dessert',
+}
+# ... keywords contained in other headers ...
+CATEGORY_KEYWORDS = (
+    ('weekly', 'Weekly Special'),
+    ('suppe', 'Soup'),
+    ('salat', 'Salad'),
+    ('hauptspeise', 'Main Dish'),
+    ('vegetarisch', 'Vegetarian'),
+    ('vegan', 'Vegan'),
+    ('dessert', 'Dessert'),
+)
+# ... and the card's data-category attribute when there is no header
+DATA_CATEGORIES = {
+    'appetizer': 'Salad / Soup',
+    'main-dish': 'Main Dish',
+    'pizza': 'Pizza',
+    'dessert': 'Dessert',
+}
+
+# Category blocks of the plain-text layout
+TEXT_CATEGORY_LABELS = {
+    'SOUP': 'Soup',
+    'MAIN DISH': 'Main Dish',
+    'DESSERTS': 'Dessert',
+    'SALAD': 'Salad',
+}
+ALLERGEN_CODES = set('ABCDEFGHLMNOPR')
+
+# Fetches a URL with the first strategy that works (BaseScraper.fetch_page)
+Fetch = Callable[[str, List[FetchStrategy]], FetchResult]
+
+
+def has_meal_cards(html: str) -> bool:
+    """Return True if the HTML already contains rendered meal cards."""
+    return bool(MEAL_CARD_PATTERN.search(html))
+
+
+def has_meal_data(page_props: dict) -> bool:
+    """Return True if Next.js page props carry meal records."""
+    return bool(cards_from_data(page_props))
+
+
+def cards_from_html(html_or_soup) -> List[Dict[str, Any]]:
+    """Extract the meal cards rendered in a mealplan page."""
+    soup = html_or_soup
+    if isinstance(html_or_soup, str):
+        soup = BeautifulSoup(html_or_soup, 'html.parser')
+
+    cards = []
+    for card in soup.find_all('div', class_='meal-card'):
+        header_elem = card.find('div', class_='meal-card-header')
+        title_elem = card.find('div', class_='meal-card-title')
+        text_elem = card.find('div', class_='meal-card-text')
+        price_elem = card.find('div', class_='meal-card-price')
+
+        text = ""
+        if text_elem:
+            # Keep line breaks visible in the description
+            for br in text_elem.find_all('br'):
+                br.replace_with(' | ')
+            text = text_elem.get_text(strip=True)
+
+        cards.append({
+            'data_category': card.get('data-category'),
+            'header': header_elem.get_text(strip=True) if header_elem else "",
+            'title': title_elem.get_text(strip=True) if title_elem else "",
+            'text': text,
+            'price': price_elem.get_text(strip=True) if price_elem else "",
+        })
+    return cards
+
+
+def cards_from_data(data: Any, depth: int = 0) -> List[Dict[str, Any]]:
+    """Find meal records anywhere in a JSON structure and convert them to cards."""
+    if depth > 10:
+        return []
+
+    if isinstance(data, list):
+        cards = []
+        for entry in data:
+            cards.extend(cards_from_data(entry, depth + 1))
+        return cards
+
+    if not isinstance(data, dict):
+        return []
+
+    title = _first_string(data, _TITLE_KEYS)
+    if title and any(key in data for key in _TEXT_KEYS + _PRICE_KEYS):
+        category = data.get('category')
+        if isinstance(category, dict):
+            category = _first_string(category, ('name', 'title', 'slug'))
+        return [{
+            'data_category': category if isinstance(category, str) else None,
+            'header': _first_string(data, _CATEGORY_KEYS) or "",
+            'title': title,
+            'text': _clean_markup(_first_string(data, _TEXT_KEYS) or ""),
+            'price': _format_price(next((data[k] for k in _PRICE_KEYS if k in data), None)),
+        }]
+
+    cards = []
+    for key, value in data.items():
+        if key not in ('_app', '__N_SSG', 'buildId'):
+            cards.extend(cards_from_data(value, depth + 1))
+    return cards
+
+
+def meal_plan_rendered():
+    """Page readiness for a mealplan page: the cards have rendered, or the network is quiet."""
+    # Imported lazily so that Selenium is only loaded when the browser is needed
+    from .page_readiness import any_of, element_count_stable, network_idle
+
+    return any_of(element_count_stable(".meal-card"), network_idle())
+
+
+def extract_meal_cards(result: FetchResult) -> List[Dict[str, Any]]:
+    """Return the meal cards of a fetched mealplan page, from HTML or JSON data."""
+    if result.data is not None:
+        cards = cards_from_data(result.data)
+        if cards:
+            return cards
+    if result.soup is not None:
+        return cards_from_html(result.soup)
+    return []
+
+
+def card_category(card: Dict[str, Any]) -> str:
+    """Map a card's header (or its data-category) to one of our category names."""
+    header = card['header']
+    if header:
+        label = CATEGORY_LABELS.get(header.lower())
+        if label:
+            return label
+        for keyword, label in CATEGORY_KEYWORDS:
+            if keyword in header.lower():
+                return label
+        return header
+    return DATA_CATEGORIES.get(card['data_category'] or '', 'Main Dish')
+
+
+def items_from_cards(cards: List[Dict[str, Any]], menu_date: date) -> List[Dict[str, Any]]:
+    """Turn meal cards into menu items for ``BaseScraper.save_to_db()``."""
+    menu_items = []
+    for card in cards:
+        description = ' - '.join(part for part in (card['title'], card['text']) if part)
+        # Skip empty items
+        if len(description.strip()) < 3:
+            continue
+        menu_items.append({
+            'menu_date': menu_date,
+            'category': card_category(card),
+            'description': description,
+            'price': card['price'] if '€' in card['price'] else None,
+        })
+    return menu_items
+
+
+def items_from_text(body_text: str) -> List[Dict[str, Any]]:
+    """
+    Extract menu items from the rendered page text.
+
+    Used when a page shows the menu as plain blocks (``SOUP``, ``MAIN DISH``, ...)
+    instead of meal cards.
+    """
+    lines = [line.strip() for line in body_text.split('\n') if line.strip()]
+
+    # Find current date
+    current_date = date.today()
+    for line in lines[:20]:
+        date_match = re.search(r'(\d{1,2})\.(\d{1,2})\.(\d{2})', line)
+        if date_match:
+            day, month, year = date_match.groups()
+            current_date = date(2000 + int(year), int(month), int(day))
+            break
+
+    menu_items = []
+    i = 0
+    while i < len(lines):
+        if lines[i] not in TEXT_CATEGORY_LABELS:
+            i += 1
+            continue
+
+        category = TEXT_CATEGORY_LABELS[lines[i]]
+        i += 1
+
+        # Process items until we hit another category
+        while i < len(lines) and lines[i] not in TEXT_CATEGORY_LABELS:
+            item_lines = []
+            price = ''
+
+            # Collect description until allergen or price
+            while i < len(lines):
+                current_line = lines[i]
+
+                if current_line in TEXT_CATEGORY_LABELS:
+                    break
+                elif _is_allergen_line(current_line):
+                    # Skip all allergen lines
+                    while i < len(lines) and _is_allergen_line(lines[i]):
+                        i += 1
+                    # Check for price after allergens
+                    if i < len(lines) and re.match(r'^€\s*\d+', lines[i]):
+                        price = lines[i]
+                        i += 1
+                    break
+                elif re.match(r'^€\s*\d+', current_line):
+                    price = current_line
+                    i += 1
+                    break
+                else:
+                    item_lines.append(current_line)
+                    i += 1
+
+            if item_lines:
+                cleaned = _clean_description(' '.join(item_lines))
+                if cleaned and len(cleaned) > 10:
+                    menu_items.append({
+                        'menu_date': current_date,
+                        'category': category,
+                        'description': cleaned,
+                        'price': price
+                    })
+
+    return menu_items
+
+
+class MealplanOutlet:
+    """
+    One restaurant on the mealplan platform.
+
+    ``page`` is either a slug under ``MEALPLAN_BASE_URL`` (``kantine-en``) or
+    the full URL of the outlet's mealplan page.
+    """
+
+    def __init__(self, name: str, page: str, website: Optional[str] = None,
+                 weekdays_only: bool = False):
+        self.name = name
+        if page.startswith(('http://', 'https://')):
+            self.page_url = page
+        else:
+            self.page_url = urljoin(get_setting('MEALPLAN_BASE_URL'), f"{page}.html")
+        self.slug = urlparse(self.page_url).path.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+        self.website = website or self.page_url
+        self.weekdays_only = weekdays_only
+
+    def open_today(self) -> bool:
+        """False on weekends for outlets without daily changing weekend menus."""
+        today = date.today()
+        if self.weekdays_only and today.weekday() >= 5:
+            logger.info(f"Today is {today.strftime('%A')} - {self.name} has no "
+                        f"daily changing menu on weekends")
+            return False
+        return True
+
+
+def configured_outlets(include_disabled: bool = False) -> List[MealplanOutlet]:
+    """Return the outlets listed in ``MEALPLAN_OUTLETS``, without those in ``SCRAPERS_DISABLED``."""
+    weekdays_only = set(get_setting('MEALPLAN_WEEKDAYS_ONLY', ()))
+    disabled = set() if include_disabled else disabled_names()
+    return [
+        MealplanOutlet(name, page, website, weekdays_only=name in weekdays_only)
+        for name, page, website in get_setting('MEALPLAN_OUTLETS', ())
+        if name.lower() not in disabled
+    ]
+
+
+def get_outlet(name: str) -> MealplanOutlet:
+    """Return the configured outlet called ``name`` (even if it is disabled)."""
+    for outlet in configured_outlets(include_disabled=True):
+        if outlet.name == name:
+            return outlet
+    raise KeyError(f"No mealplan outlet configured for {name}")
+
+
+class MealplanEngine:
+    """
+    Fetches the mealplan outlets and shares what it learns about their hosts.
+
+    Each outlet is fetched by its own scraper, with that scraper's fetch
+    strategies, cancel event and time budget: plain HTTP over the shared
+    session first, then a browser from the shared Chrome pool for outlets
+    whose cards are only rendered client-side. The ``_next/data`` URL found
+    for the first outlet of a host is reused (with the slug swapped) to
+    request the JSON of the other outlets on that host directly; while one
+    scraper probes a host, the others on that host wait for what it finds.
+    Host knowledge is kept for at most ``max_age`` seconds and dropped by
+    :meth:`reset` at the start of every scraping run.
+    """
+
+    def __init__(self, max_age: float = 300, poll_interval: float = 0.5):
+        self.max_age = max_age
+        self.poll_interval = poll_interval
+        self._lock = threading.Condition()
+        # origin -> (learned at, {'slug': ..., 'data_url': ...})
+        self._hosts: Dict[str, Tuple[float, Dict[str, Optional[str]]]] = {}
+        # Origins a scraper is probing right now
+        self._probing: Set[str] = set()
+
+    def reset(self) -> None:
+        """Forget what was learned about the hosts (e.g. an old Next.js build id)."""
+        with self._lock:
+            self._hosts.clear()
+
+    def parse(self, outlet: MealplanOutlet, result: FetchResult) -> List[Dict[str, Any]]:
+        """Turn an outlet's fetched page into menu items."""
+        today = date.today()
+        cards = extract_meal_cards(result)
+        logger.info(f"Found {len(cards)} meal cards for {outlet.name} ({result.strategy})")
+
+        menu_items = items_from_cards(cards, today)
+        if not menu_items and result.text:
+            menu_items = items_from_text(result.text)
+
+        logger.info(f"Extracted {len(menu_items)} menu items from {outlet.name}")
+        return menu_items
+
+    def collect(self, outlet: MealplanOutlet, fetch: Fetch,
+                cancelled: Optional[threading.Event] = None) -> FetchResult:
+        """
+        Fetch the outlet's page with ``fetch`` (``BaseScraper.fetch_page`` of the
+        calling scraper), using what is known about its host.
+
+        Raises :class:`~app.scrapers.base_scraper.ScrapeCancelled` if ``cancelled``
+        is set while waiting for another scraper to probe the host.
+        """
+        origin = _origin(outlet.page_url)
+        known, probing = self._host_knowledge(origin, outlet, cancelled)
+
+        started = time.monotonic()
+        try:
+            result = fetch(outlet.page_url, self.strategies(outlet, known))
+        except FetchError:
+            if probing:
+                self._learn(origin, outlet, None)
+            raise FetchError(f"No meal plan could be fetched for {outlet.name}")
+        finally:
+            if probing:
+                with self._lock:
+                    self._probing.discard(origin)
+                    self._lock.notify_all()
+
+        # Remember whether the host's data endpoint worked once it has been probed
+        if probing and (result.strategy != HttpFetchStrategy.name or result.data_url):
+            self._learn(origin, outlet, result.data_url)
+        logger.info(f"Fetched {outlet.name} meal plan in {time.monotonic() - started:.2f}s "
+                    f"({result.strategy}{', data endpoint' if result.data_url else ''})")
+        return result
+
+    def _host_knowledge(self, origin: str, outlet: MealplanOutlet,
+                        cancelled: Optional[threading.Event]
+                        ) -> Tuple[Optional[Dict[str, Optional[str]]], bool]:
+        """
+        Return ``(known, probing)`` for the outlet's host: what an earlier
+        outlet found, or ``probing=True`` if this outlet is to probe the host.
+        Waits while another scraper is probing it.
+        """
+        with self._lock:
+            while True:
+                learned_at, known = self._hosts.get(origin, (None, None))
+                if learned_at is not None and time.monotonic() - learned_at <= self.max_age:
+                    return known, False
+                if origin not in self._probing:
+                    self._probing.add(origin)
+                    return None, True
+                if cancelled is not None and cancelled.is_set():
+                    raise ScrapeCancelled(f"{outlet.name}: scrape was cancelled")
+                self._lock.wait(self.poll_interval)
+
+    def _learn(self, origin: str, outlet: MealplanOutlet, data_url: Optional[str]) -> None:
+        with self._lock:
+            self._hosts[origin] = (time.monotonic(), {'slug': outlet.slug, 'data_url': data_url})
+
+    @staticmethod
+    def strategies(outlet: MealplanOutlet,
+                   known: Optional[Dict[str, Optional[str]]] = None) -> List[FetchStrategy]:
+        """
+        The fetch strategies for one outlet. ``known`` is what an earlier
+        outlet on the same host found: ``{'slug': ..., 'data_url': ...}``.
+        """
+        data_url = None
+        suffix = f"/{known['slug']}.json" if known else None
+        if known and known['data_url'] and known['data_url'].endswith(suffix):
+            data_url = known['data_url'][:-len(suffix)] + f"/{outlet.slug}.json"
+        return [
+            HttpFetchStrategy(has_meal_cards, has_meal_data, data_url=data_url,
+                              # The data endpoint is only probed once per host
+                              probe_data_endpoint=known is None),
+            BrowserFetchStrategy(meal_plan_rendered, description=f"{outlet.name} meal plan"),
+        ]
+
+
+_engine: Optional[MealplanEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_mealplan_engine() -> MealplanEngine:
+    """Return the process-wide mealplan engine."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = MealplanEngine()
+        return _engine
+
+
+def reset_mealplan_engine() -> None:
+    """Forget the mealplan hosts' build ids; called at the start of every scraping run."""
+    with _engine_lock:
+        engine = _engine
+    if engine is not None:
+        engine.reset()
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _first_string(data: dict, keys) -> str:
+    for key in keys:
+        value = data.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def _clean_markup(text: str) -> str:
+    """Turn the small amount of HTML used in descriptions into plain text."""
+    text = re.sub(r'<br\s*/?>', '|', text, flags=re.I)
+    text = re.sub(r'<[^>]+>', '', text)
+    return ' '.join(text.split())
+
+
+def _format_price(value) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = next((value[k] for k in ('price', 'value', 'amount') if k in value), None)
+    if isinstance(value, (int, float)):
+        return f"€ {value:.2f}"
+    if isinstance(value, str) and value.strip():
+        value = value.strip()
+        return value if '€' in value else f"€ {value}"
+    return ""
+
+
+def _is_allergen_line(line: str) -> bool:
+    """Check if line contains only allergen codes."""
+    chars = line.replace(' ', '')
+    return len(chars) > 0 and all(c in ALLERGEN_CODES for c in chars)
+
+
+def _clean_description(text: str) -> str:
+    """Clean a menu description taken from the page text."""
+    # Filter out URLs
+    if any(p in text.lower() for p in ['http', '.html', 'external']):
+        return ""
+
+    # Remove category labels and allergens
+    text = re.sub(r'^(SOUP|MAIN DISH|DESSERTS?|SALAD)\s*', '', text, flags=re.I)
+    text = re.sub(r'\s+[A-Z](\s+[A-Z])*\s*$', '', text)
+    text = text.replace('/', ' / ')
+
+    return ' '.join(text.split()).strip()
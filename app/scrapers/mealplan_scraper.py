@@ -0,0 +1,39 @@
+"""
+Scrapers for the outlets of the erstecampus.at mealplan platform.
+
+Every outlet in ``MEALPLAN_OUTLETS`` gets a :class:`MealplanScraper`, which
+fetches and parses its outlet through the shared
+:class:`~app.scrapers.mealplan.MealplanEngine`.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .base_scraper import BaseScraper
+from .mealplan import (
+    MealplanEngine,
+    MealplanOutlet,
+    get_mealplan_engine,
+    get_outlet,
+)
+
+
+class MealplanScraper(BaseScraper):
+    """Scraper for one outlet of the mealplan platform."""
+
+    def __init__(self, outlet: MealplanOutlet, engine: Optional[MealplanEngine] = None):
+        super().__init__(outlet.name, outlet.website)
+        self.outlet = outlet
+        self.engine = engine or get_mealplan_engine()
+
+    def scrape(self) -> List[Dict[str, Any]]:
+        """Return today's menu items of this outlet."""
+        if not self.outlet.open_today():
+            return []
+        result = self.engine.collect(self.outlet, self.fetch_page, self.cancelled)
+        self.check_source(result.raw)
+        return self.engine.parse(self.outlet, result)
+
+
+def scraper_for_outlet(name: str) -> MealplanScraper:
+    """Create the scraper of the configured outlet called ``name``."""
+    return MealplanScraper(get_outlet(name))
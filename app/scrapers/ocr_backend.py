@@ -0,0 +1,166 @@
+"""
+Tesseract backends for the OCR engine.
+
+``pytesseract`` starts a ``tesseract`` process for every call, writes the
+image to a temporary file and loads the ``deu+eng`` models again each time.
+With the tesserocr binding installed, :class:`TesserocrBackend` keeps one
+initialized Tesseract API per thread and language (the models stay loaded
+for the life of the process) and passes the raw pixel buffer directly.
+pytesseract remains the fallback when tesserocr is not available.
+
+Both backends return ``image_to_data`` output in pytesseract's DICT layout.
+"""
+
+import logging
+import shlex
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+TSV_INT_FIELDS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                  'left', 'top', 'width', 'height')
+
+# Bytes per pixel of the image modes Tesseract can read directly
+RAW_MODES = {'L': 1, 'RGB': 3, 'RGBA': 4}
+
+
+def parse_config(config: str) -> Tuple[int, int, Dict[str, str]]:
+    """Split a Tesseract command line config into ``(oem, psm, variables)``."""
+    oem, psm, variables = 3, 3, {}
+    args = shlex.split(config)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = args[i + 1] if i + 1 < len(args) else ''
+        if arg == '--oem':
+            oem, i = int(value), i + 1
+        elif arg == '--psm':
+            psm, i = int(value), i + 1
+        elif arg == '-c' and '=' in value:
+            name, _, setting = value.partition('=')
+            variables[name] = setting
+            i += 1
+        else:
+            logger.debug(f"Ignoring Tesseract option {arg!r}")
+        i += 1
+    return oem, psm, variables
+
+
+def data_from_tsv(tsv: str) -> Dict[str, List]:
+    """Parse Tesseract's TSV output into pytesseract's ``Output.DICT`` layout."""
+    data: Dict[str, List] = {field: [] for field in TSV_INT_FIELDS + ('conf', 'text')}
+    for row in tsv.splitlines():
+        columns = row.split('\t')
+        if len(columns) < 12:
+            continue
+        for field, value in zip(TSV_INT_FIELDS, columns):
+            data[field].append(int(value))
+        data['conf'].append(float(columns[10]))
+        data['text'].append(columns[11])
+    return data
+
+
+class OcrBackend:
+    """Runs one Tesseract pass over a PIL image."""
+
+    name = 'base'
+
+    def image_to_data(self, image, lang: str, config: str) -> Dict[str, List]:
+        raise NotImplementedError
+
+
+class PytesseractBackend(OcrBackend):
+    """The ``tesseract`` command line program, through pytesseract."""
+
+    name = 'pytesseract'
+
+    def image_to_data(self, image, lang: str, config: str) -> Dict[str, List]:
+        import pytesseract
+
+        return pytesseract.image_to_data(image, lang=lang, config=config,
+                                         output_type=pytesseract.Output.DICT)
+
+
+class TesserocrBackend(OcrBackend):
+    """In-process Tesseract through tesserocr, with warm API handles."""
+
+    name = 'tesserocr'
+
+    def __init__(self, tessdata_path: Optional[str] = None):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self.tessdata_path = tessdata_path
+        self._local = threading.local()
+
+    def _api(self, lang: str, oem: int, variables: Dict[str, str]):
+        """
+        The calling thread's API for ``lang``/``oem`` and ``-c`` variables
+        (which cannot be unset again), initialized on first use.
+        """
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+        key = (lang, oem, tuple(sorted(variables.items())))
+        api = apis.get(key)
+        if api is None:
+            kwargs = {'lang': lang, 'oem': oem}
+            if self.tessdata_path:
+                kwargs['path'] = self.tessdata_path
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+            apis[key] = api
+            logger.info(f"Loaded Tesseract models for {lang} (oem {oem})")
+        return api
+
+    def image_to_data(self, image, lang: str, config: str) -> Dict[str, List]:
+        oem, psm, variables = parse_config(config)
+        api = self._api(lang, oem, variables)
+        if image.mode not in RAW_MODES:
+            image = image.convert('L')
+        bytes_per_pixel = RAW_MODES[image.mode]
+        width, height = image.size
+
+        api.SetPageSegMode(psm)
+        try:
+            # Raw pixels straight from memory: no image file is written
+            api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel,
+                              width * bytes_per_pixel)
+            return data_from_tsv(api.GetTSVText(0))
+        finally:
+            # Frees the image and recognition results; the models stay loaded
+            api.Clear()
+
+
+_backends: Dict[str, OcrBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_ocr_backend(name: Optional[str] = None) -> OcrBackend:
+    """
+    Return the process-wide backend ``name`` (default ``OCR_BACKEND``):
+    'tesserocr', 'pytesseract' or 'auto' (tesserocr if it is installed).
+    """
+    name = name or get_setting('OCR_BACKEND', 'auto')
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = _create_backend(name)
+            _backends[name] = backend
+        return backend
+
+
+def _create_backend(name: str) -> OcrBackend:
+    if name in ('auto', 'tesserocr'):
+        try:
+            return TesserocrBackend(get_setting('OCR_TESSDATA_PATH'))
+        except ImportError:
+            if name == 'tesserocr':
+                logger.warning("tesserocr is not installed; using pytesseract")
+    elif name != 'pytesseract':
+        logger.warning(f"Unknown OCR backend {name!r}; using pytesseract")
+    return PytesseractBackend()
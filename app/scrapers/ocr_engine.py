@@ -0,0 +1,403 @@
+"""
+OCR engine for the image-based scrapers.
+
+The Tesseract configurations a scraper wants to try (page segmentation
+modes) run in parallel on a bounded process pool, one configuration per
+task, so a four-core Pi works on all of them at once instead of one after
+another. As soon as a result passes the caller's validation the remaining
+tasks are abandoned; otherwise the result with the most text wins.
+
+Every task does a single ``image_to_data`` pass and returns the recognized
+words with their boxes *and* the text rebuilt from them, so callers that
+need the layout (e.g. to locate a section of the page) do not have to OCR
+the image a second time.
+
+Results are cached on disk (``OCR_CACHE_DIR``, least recently used entries
+evicted beyond ``OCR_CACHE_MAX_MB``) by image content hash, language and
+configuration. The menu images change weekly, so most runs get their text
+without starting Tesseract at all.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .disk_cache import DiskCacheStore
+from .ocr_backend import get_ocr_backend
+from .processes import get_context
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANG = 'deu+eng'
+
+# Per-word fields kept from Tesseract's image_to_data output
+WORD_FIELDS = ('text', 'left', 'top', 'width', 'height', 'conf',
+               'block_num', 'par_num', 'line_num')
+
+
+class PoolShutDown(Exception):
+    """The process pool was shut down while work was being submitted."""
+
+
+class OcrResult:
+    """Words (with boxes) recognized with one Tesseract configuration, and their text."""
+
+    def __init__(self, config: str, words: List[Dict]):
+        self.config = config
+        self.words = words
+        self.text = text_from_words(words)
+
+    def __repr__(self) -> str:
+        return f"OcrResult({self.config!r}, {len(self.words)} words)"
+
+
+def words_from_data(data: Dict[str, list]) -> List[Dict]:
+    """Turn ``image_to_data`` output (DICT) into a list of non-empty words."""
+    words = []
+    for i, text in enumerate(data.get('text', [])):
+        text = (text or '').strip()
+        if not text:
+            continue
+        word = {field: data[field][i] for field in WORD_FIELDS[1:] if field in data}
+        word['text'] = text
+        words.append(word)
+    return words
+
+
+def text_from_words(words: List[Dict]) -> str:
+    """
+    Rebuild the page text from words: one line per Tesseract line, an empty
+    line between blocks and paragraphs (like ``image_to_string``).
+    """
+    lines = []
+    current_line = None
+    current_paragraph = None
+    for word in words:
+        paragraph = (word.get('block_num'), word.get('par_num'))
+        line = paragraph + (word.get('line_num'),)
+        if line != current_line:
+            if current_paragraph is not None and paragraph != current_paragraph:
+                lines.append('')
+            lines.append(word['text'])
+            current_line = line
+            current_paragraph = paragraph
+        else:
+            lines[-1] += ' ' + word['text']
+    return '\n'.join(lines)
+
+
+def _encode(image) -> Tuple[str, Tuple[int, int], bytes]:
+    """Raw pixel buffer of a PIL image, cheap to send to a worker process."""
+    return image.mode, image.size, image.tobytes()
+
+
+def _pixels_key(encoded: Tuple[str, Tuple[int, int], bytes]) -> str:
+    """Content hash of an image's pixels, for images without a key of their own."""
+    mode, (width, height), pixels = encoded
+    digest = hashlib.sha256(pixels)
+    digest.update(f"{mode}:{width}x{height}".encode('ascii'))
+    return digest.hexdigest()
+
+
+def _decode(encoded: Tuple[str, Tuple[int, int], bytes]):
+    from PIL import Image
+
+    mode, size, pixels = encoded
+    return Image.frombytes(mode, size, pixels)
+
+
+def _ocr_task(encoded, lang: str, config: str, backend: str = 'auto') -> OcrResult:
+    """Run one ``image_to_data`` pass (executed in a worker process)."""
+    data = get_ocr_backend(backend).image_to_data(_decode(encoded), lang, config)
+    return OcrResult(config, words_from_data(data))
+
+
+class OcrCache:
+    """
+    OCR results (words with boxes) stored by image key, language,
+    configuration and backend (tesserocr and the tesseract CLI may disagree).
+    """
+
+    def __init__(self, store: DiskCacheStore):
+        self.store = store
+
+    @staticmethod
+    def _key(image_key: str, lang: str, config: str, backend: str) -> str:
+        return f"ocr:{backend}:{image_key}:{lang}:{config}"
+
+    def get(self, image_key: str, lang: str, config: str,
+            backend: str) -> Optional[OcrResult]:
+        entry = self.store.get(self._key(image_key, lang, config, backend))
+        if entry is None:
+            return None
+        try:
+            return OcrResult(config, json.loads(entry[0]))
+        except ValueError:
+            return None
+
+    def put(self, image_key: str, lang: str, backend: str, result: OcrResult) -> None:
+        body = json.dumps(result.words, ensure_ascii=False).encode('utf-8')
+        self.store.put(self._key(image_key, lang, result.config, backend), body)
+
+
+class OcrEngine:
+    """
+    Runs Tesseract passes on a bounded pool of worker processes.
+
+    With ``processes`` <= 1 (or if the pool cannot be used) passes run one
+    after another in the calling thread, with the same early exit.
+    """
+
+    def __init__(self, processes: int = 4, lang: str = DEFAULT_LANG,
+                 task_timeout: float = 120, start_method: Optional[str] = 'forkserver',
+                 cache: Optional[OcrCache] = None, backend: str = 'auto'):
+        self.processes = processes
+        self.lang = lang
+        self.task_timeout = task_timeout
+        self.start_method = start_method
+        self.cache = cache
+        self.backend = backend
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend_name(self) -> str:
+        """The backend that runs the passes, with 'auto' resolved (for cache keys)."""
+        return get_ocr_backend(self.backend).name
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.processes <= 1:
+            return None
+        with self._lock:
+            if self._pool is None:
+                context = get_context(self.start_method)
+                self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                                 mp_context=context)
+            return self._pool
+
+    def image_to_data(self, image, config: str = '--oem 3 --psm 6',
+                      image_key: Optional[str] = None,
+                      cancelled: Optional[threading.Event] = None) -> OcrResult:
+        """One OCR pass returning words with boxes and the text built from them."""
+        result = self.recognize(image, [config], image_key=image_key, cancelled=cancelled)
+        if result is None:
+            raise RuntimeError(f"OCR failed for config {config!r}")
+        return result
+
+    def recognize(self, image, configs: Sequence[str],
+                  validate: Optional[Callable[[OcrResult], bool]] = None,
+                  image_key: Optional[str] = None,
+                  cancelled: Optional[threading.Event] = None) -> Optional[OcrResult]:
+        """
+        OCR ``image`` with each of ``configs`` and return the first result that
+        passes ``validate``, or else the one with the longest text (None if
+        every pass failed).
+
+        ``image_key`` identifies the image in the result cache; it defaults to
+        a hash of the pixels. With a key, ``image`` may be a function that
+        returns the image, so that it is only loaded and preprocessed when some
+        configuration is not cached yet (the key must then also cover the
+        preprocessing).
+
+        Once ``cancelled`` is set no further pass is started or waited for
+        (None is returned); a pass already running in-process completes.
+        """
+        encoded = None
+        if self.cache is not None and image_key is None:
+            encoded = _encode(image() if callable(image) else image)
+            image_key = _pixels_key(encoded)
+
+        best = None
+        missing = []
+        for config in configs:
+            result = (self.cache.get(image_key, self.lang, config, self.backend_name)
+                      if self.cache else None)
+            if result is None:
+                missing.append(config)
+                continue
+            if validate is not None and validate(result):
+                logger.info(f"Using cached OCR result for {config!r}")
+                return result
+            best = self._better(best, result)
+        if not missing:
+            logger.info("Using cached OCR results")
+            return best
+
+        if encoded is None:
+            encoded = _encode(image() if callable(image) else image)
+        result = self._recognize(encoded, missing, validate, image_key, cancelled)
+        if result is None or (validate is not None and validate(result)):
+            return result or best
+        return self._better(best, result)
+
+    def _recognize(self, encoded, configs, validate, image_key,
+                   cancelled=None) -> Optional[OcrResult]:
+        try:
+            pool = self._get_pool()
+        except Exception as e:
+            logger.warning(f"OCR process pool unavailable, running in-process: {e}")
+            pool = None
+
+        if pool is None:
+            return self._recognize_serially(encoded, configs, validate, image_key, cancelled)
+        try:
+            return self._recognize_in_pool(pool, encoded, configs, validate, image_key,
+                                           cancelled)
+        except (BrokenProcessPool, PoolShutDown) as e:
+            if self._pool is not pool:
+                # terminate() was called, i.e. the scrape was cancelled
+                logger.info("OCR passes were terminated")
+                return None
+            logger.warning(f"OCR process pool failed, running in-process: {e}")
+            self.terminate()
+            return self._recognize_serially(encoded, configs, validate, image_key, cancelled)
+
+    def _remember(self, image_key: Optional[str], result: OcrResult) -> None:
+        if self.cache is not None and image_key is not None:
+            self.cache.put(image_key, self.lang, self.backend_name, result)
+
+    def _recognize_serially(self, encoded, configs, validate, image_key,
+                            cancelled=None) -> Optional[OcrResult]:
+        best = None
+        for config in configs:
+            if cancelled is not None and cancelled.is_set():
+                logger.info("OCR was cancelled")
+                return None
+            try:
+                result = _ocr_task(encoded, self.lang, config, self.backend)
+            except Exception as e:
+                logger.warning(f"OCR with {config!r} failed: {e}")
+                continue
+            self._remember(image_key, result)
+            if validate is not None and validate(result):
+                return result
+            best = self._better(best, result)
+        return best
+
+    def _recognize_in_pool(self, pool, encoded, configs, validate, image_key,
+                           cancelled=None) -> Optional[OcrResult]:
+        try:
+            futures = {pool.submit(_ocr_task, encoded, self.lang, config, self.backend): config
+                       for config in configs}
+        except RuntimeError as e:
+            # The pool was shut down (terminate()) by another thread
+            raise PoolShutDown(str(e)) from e
+        best = None
+        pending = set(futures)
+        deadline = time.monotonic() + self.task_timeout
+        try:
+            while pending:
+                if cancelled is not None and cancelled.is_set():
+                    logger.info("OCR was cancelled")
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise FuturesTimeoutError()
+                # Short waits when the caller may cancel
+                done, pending = wait(pending, return_when=FIRST_COMPLETED,
+                                     timeout=remaining if cancelled is None else min(remaining, 0.25))
+                if not done:
+                    continue
+                deadline = time.monotonic() + self.task_timeout
+                for future in done:
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        logger.warning(f"OCR with {futures[future]!r} failed: {e}")
+                        continue
+                    self._remember(image_key, result)
+                    if validate is not None and validate(result):
+                        logger.info(f"OCR result with {result.config!r} passed "
+                                    f"validation; skipping {len(pending)} other passes")
+                        return result
+                    best = self._better(best, result)
+        except FuturesTimeoutError:
+            logger.warning(f"OCR passes did not finish within {self.task_timeout:.0f}s")
+        finally:
+            for future in pending:
+                future.cancel()
+        return best
+
+    @staticmethod
+    def _better(best: Optional[OcrResult], result: OcrResult) -> OcrResult:
+        if best is None or len(result.text) > len(best.text):
+            return result
+        return best
+
+    def terminate(self) -> None:
+        """Stop the worker processes right away, e.g. when a scrape is cancelled."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        # ProcessPoolExecutor has no public way to kill running tasks
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            try:
+                process.kill()
+            except Exception:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """Shut the pool down once its tasks are done (frees the workers' memory)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_engine: Optional[OcrEngine] = None
+_engine_lock = threading.Lock()
+_store: Optional[DiskCacheStore] = None
+
+
+def get_ocr_cache_store() -> Optional[DiskCacheStore]:
+    """The on-disk store shared by the OCR caches (None if caching is disabled)."""
+    global _store
+    if not get_setting('OCR_CACHE_ENABLED', True):
+        return None
+    with _engine_lock:
+        if _store is None:
+            _store = DiskCacheStore(
+                get_setting('OCR_CACHE_DIR'),
+                get_setting('OCR_CACHE_MAX_MB', 50) * 1024 * 1024,
+            )
+        return _store
+
+
+def get_ocr_engine() -> OcrEngine:
+    """Return the process-wide OCR engine, creating it on first use."""
+    global _engine
+    store = get_ocr_cache_store()
+    with _engine_lock:
+        if _engine is None:
+            processes = get_setting('OCR_PROCESSES')
+            if processes is None:
+                processes = min(4, os.cpu_count() or 1)
+            _engine = OcrEngine(
+                processes=processes,
+                lang=get_setting('OCR_LANG', DEFAULT_LANG),
+                task_timeout=get_setting('OCR_TASK_TIMEOUT', 120),
+                start_method=get_setting('OCR_START_METHOD', 'forkserver'),
+                cache=OcrCache(store) if store is not None else None,
+                backend=get_setting('OCR_BACKEND', 'auto'),
+            )
+        return _engine
+
+
+def close_ocr_engine() -> None:
+    """Release the OCR worker processes, e.g. at the end of a scraping run."""
+    with _engine_lock:
+        engine = _engine
+    if engine is not None:
+        engine.close()
@@ -0,0 +1,101 @@
+"""
+Layout detection for OCR of weekly menu pages.
+
+A weekly menu page is a stack of sections, one per weekday, each starting
+with the day's name. The word boxes of one OCR pass over the whole page are
+enough to find where each section starts; a section runs to the start of
+the next one. The boxes are cached per image (in the OCR cache directory),
+so every later run over the same page only has to OCR the small crop for
+the current day.
+"""
+
+import json
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .disk_cache import DiskCacheStore
+from .ocr_engine import get_ocr_cache_store
+
+# Bump when the detection changes (invalidates cached layouts)
+LAYOUT_VERSION = 1
+
+# Minimum similarity of an OCR token to a header spelling (OCR confuses G/C etc.)
+HEADER_SIMILARITY = 0.8
+
+Box = Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+def _letters(text: str) -> str:
+    return re.sub(r'[^A-ZÄÖÜ]', '', text.upper())
+
+
+def matches_header(text: str, spellings: Sequence[str]) -> bool:
+    """True if the OCR token ``text`` reads like one of ``spellings``."""
+    token = _letters(text)
+    if len(token) < 4:
+        return False
+    return any(
+        token == spelling
+        or SequenceMatcher(None, token, spelling).ratio() >= HEADER_SIMILARITY
+        for spelling in spellings
+    )
+
+
+def find_sections(words: List[Dict], headers: Dict[str, Sequence[str]],
+                  size: Tuple[int, int], padding: int = 8) -> Dict[str, Box]:
+    """
+    Locate sections that start with a header word, e.g. one per weekday.
+
+    ``words`` are OCR words with ``text``/``left``/``top``/``width``/``height``;
+    ``headers`` maps a section name to the spellings of its header. A section
+    spans the full page width (so side-by-side columns stay together) from
+    its topmost header word to the next section's header. Returns an empty
+    dict when fewer than two sections are found, i.e. the layout is not the
+    expected one.
+    """
+    width, height = size
+    tops: Dict[str, int] = {}
+    for word in words:
+        for section, spellings in headers.items():
+            if matches_header(word['text'], spellings):
+                tops[section] = min(tops.get(section, word['top']), word['top'])
+                break
+    if len(tops) < 2:
+        return {}
+
+    ordered = sorted(tops.items(), key=lambda item: item[1])
+    boxes = {}
+    for i, (section, top) in enumerate(ordered):
+        bottom = ordered[i + 1][1] if i + 1 < len(ordered) else height
+        boxes[section] = (0, max(0, top - padding), width, min(height, bottom - 1))
+    return boxes
+
+
+class LayoutCache:
+    """Section boxes stored by image key."""
+
+    def __init__(self, store: DiskCacheStore):
+        self.store = store
+
+    @staticmethod
+    def _key(image_key: str) -> str:
+        return f"layout:v{LAYOUT_VERSION}:{image_key}"
+
+    def get(self, image_key: str) -> Optional[Dict[str, Box]]:
+        entry = self.store.get(self._key(image_key))
+        if entry is None:
+            return None
+        try:
+            return {section: tuple(box) for section, box in json.loads(entry[0]).items()}
+        except (ValueError, TypeError):
+            return None
+
+    def put(self, image_key: str, boxes: Dict[str, Box]) -> None:
+        self.store.put(self._key(image_key), json.dumps(boxes).encode('utf-8'))
+
+
+def get_layout_cache() -> Optional[LayoutCache]:
+    """The layout cache, stored with the OCR results (None if caching is disabled)."""
+    store = get_ocr_cache_store()
+    return LayoutCache(store) if store is not None else None
@@ -0,0 +1,245 @@
+"""
+Image preprocessing for OCR, shared by the Cyclist scrapers.
+
+The previous PIL chain upscaled the full-colour image with LANCZOS and then
+converted, sharpened, contrast-enhanced and binarized it in separate passes.
+Here the image is converted to grayscale first and resampled at most once
+(scaling and deskew rotation are a single affine transform). Contrast and a
+global threshold are folded into one 256-entry lookup table; the adaptive
+threshold compares every pixel with the mean of its neighbourhood, computed
+from an integral image in NumPy.
+
+Set ``OCR_DEBUG_DIR`` to save every preprocessed image there as PNG.
+"""
+
+import io
+import logging
+import math
+import os
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Bump when the output of the pipeline changes (invalidates cached OCR results)
+PIPELINE_VERSION = 4
+
+# Deskew: the skew angle is searched on a copy reduced to about this width
+DESKEW_WIDTH = 600
+
+
+def load_image(source: Union[bytes, Image.Image]) -> Image.Image:
+    """Decode image bytes; PIL images are returned unchanged."""
+    if isinstance(source, Image.Image):
+        return source
+    image = Image.open(io.BytesIO(source))
+    image.load()
+    return image
+
+
+def to_grayscale(image: Image.Image) -> Image.Image:
+    if image.mode == 'L':
+        return image
+    if image.mode in ('RGBA', 'LA', 'P'):
+        # Transparent areas become white paper, not black
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image)
+    return image.convert('L')
+
+
+def contrast_lut(mean: float, factor: float, threshold: Optional[int] = None) -> np.ndarray:
+    """
+    Lookup table for ``ImageEnhance.Contrast(factor)`` around ``mean``,
+    followed by ``p > threshold`` binarization when a threshold is given.
+    """
+    values = np.arange(256, dtype=np.float32)
+    values = np.clip(mean + factor * (values - mean), 0, 255)
+    if threshold is not None:
+        return np.where(values > threshold, 255, 0).astype(np.uint8)
+    return np.rint(values).astype(np.uint8)
+
+
+def adaptive_threshold(pixels: np.ndarray, window: int, offset: int) -> np.ndarray:
+    """
+    Binarize ``pixels`` (2-D uint8): a pixel becomes black when it is darker
+    than the mean of the ``window`` x ``window`` square around it minus
+    ``offset``. Copes with uneven lighting and shaded boxes where a single
+    global threshold loses text.
+    """
+    height, width = pixels.shape
+    half = window // 2
+    cols = np.arange(width)
+    left = np.clip(cols - half, 0, width)
+    right = np.clip(cols + half + 1, 0, width)
+    rows = np.arange(height)
+    top = np.clip(rows - half, 0, height)
+    bottom = np.clip(rows + half + 1, 0, height)
+
+    # Summed-area table built one axis at a time (int32 keeps it small on a Pi)
+    values = pixels.astype(np.int32)
+    integral = np.zeros((height, width + 1), dtype=np.int32)
+    np.cumsum(values, axis=1, out=integral[:, 1:])
+    row_sums = integral[:, right] - integral[:, left]
+    integral = np.zeros((height + 1, width), dtype=np.int32)
+    np.cumsum(row_sums, axis=0, out=integral[1:])
+    sums = integral[bottom] - integral[top]
+
+    counts = (bottom - top)[:, None] * (right - left)[None, :]
+    # pixel < mean - offset, without dividing
+    dark = (values + offset) * counts < sums
+    return np.where(dark, 0, 255).astype(np.uint8)
+
+
+def estimate_skew(image: Image.Image, max_angle: float = 5.0, step: float = 0.25) -> float:
+    """
+    Skew of the text lines in degrees (counter-clockwise), found on a small
+    binarized copy: the ink pixels are projected onto rows at each candidate
+    angle and the angle whose row profile is sharpest wins. The angle is
+    searched in 1 degree steps first and refined to ``step`` only if it is
+    not 0 (Tesseract copes with sub-degree skew; most pages are straight).
+    """
+    small = image
+    if image.width >= 2 * DESKEW_WIDTH:
+        small = image.reduce(image.width // DESKEW_WIDTH)
+    pixels = np.asarray(small)
+    ys, xs = np.nonzero(pixels < pixels.mean() - 10)
+    if not len(ys):
+        return 0.0
+    ys = ys - small.height / 2
+    xs = xs - small.width / 2
+
+    def sharpness(angle: float) -> Tuple[float, float]:
+        # Row of each ink pixel once the image is rotated by ``angle``
+        radians = math.radians(angle)
+        rows = np.round(ys * math.cos(radians) - xs * math.sin(radians)).astype(np.int64)
+        profile = np.bincount(rows - rows.min())
+        # Ties go to the smaller correction
+        return float(np.square(np.diff(profile, prepend=0, append=0)).sum()), -abs(angle)
+
+    coarse = max(np.arange(-max_angle, max_angle + 0.5, 1.0), key=lambda a: sharpness(float(a)))
+    if coarse == 0:
+        return 0.0
+    fine = np.arange(max(-max_angle, coarse - 1 + step), min(max_angle, coarse + 1 - step) + step / 2, step)
+    return float(max(fine, key=lambda a: sharpness(float(a))))
+
+
+class Preprocessing:
+    """
+    One preprocessing recipe.
+
+    :param min_width: images narrower than this are upscaled ...
+    :param target_width: ... to this width (default: ``min_width``)
+    :param sharpen: apply PIL's SHARPEN kernel
+    :param contrast: contrast factor (1.0 leaves the image unchanged)
+    :param threshold: ``None`` (keep grayscale), a 0-255 global threshold
+        applied after the contrast, or ``'adaptive'``
+    :param deskew: straighten text lines tilted by up to ``max_skew`` degrees
+    """
+
+    def __init__(self, name: str, min_width: Optional[int] = None,
+                 target_width: Optional[int] = None, sharpen: bool = False,
+                 contrast: float = 1.0, threshold: Union[None, int, str] = None,
+                 adaptive_window: int = 31, adaptive_offset: int = 10,
+                 deskew: bool = False, max_skew: float = 5.0):
+        self.name = name
+        self.min_width = min_width
+        self.target_width = target_width or min_width
+        self.sharpen = sharpen
+        self.contrast = contrast
+        self.threshold = threshold
+        self.adaptive_window = adaptive_window
+        self.adaptive_offset = adaptive_offset
+        self.deskew = deskew
+        self.max_skew = max_skew
+
+    @property
+    def signature(self) -> str:
+        """Identifies the recipe's output, e.g. in OCR cache keys."""
+        return (f"v{PIPELINE_VERSION}:{self.name}:w{self.min_width}-{self.target_width}"
+                f":s{int(self.sharpen)}:c{self.contrast}:t{self.threshold}"
+                f":a{self.adaptive_window}/{self.adaptive_offset}"
+                f":d{self.max_skew if self.deskew else 0}")
+
+    def __call__(self, source: Union[bytes, Image.Image]) -> Image.Image:
+        image = to_grayscale(load_image(source))
+        image = self._resample(image)
+        if self.sharpen:
+            image = image.filter(ImageFilter.SHARPEN)
+        image = self._tone(image)
+        dump_debug_image(image, self.name)
+        return image
+
+    def _resample(self, image: Image.Image) -> Image.Image:
+        scale = 1.0
+        if self.min_width and image.width < self.min_width:
+            scale = self.target_width / image.width
+        angle = estimate_skew(image, self.max_skew) if self.deskew else 0.0
+        if abs(angle) < 0.1:
+            angle = 0.0
+
+        size = (round(image.width * scale), round(image.height * scale))
+        if not angle:
+            if scale == 1.0:
+                return image
+            return image.resize(size, Image.Resampling.LANCZOS)
+
+        # Scale and rotate about the centre in one pass: the affine matrix maps
+        # output pixels back to input pixels
+        logger.debug(f"{self.name}: deskewing by {angle:.2f} degrees")
+        radians = -math.radians(angle)  # as in Image.rotate: counter-clockwise
+        cos, sin = math.cos(radians) / scale, math.sin(radians) / scale
+        cx, cy = size[0] / 2, size[1] / 2
+        matrix = (
+            cos, sin, image.width / 2 - cos * cx - sin * cy,
+            -sin, cos, image.height / 2 + sin * cx - cos * cy,
+        )
+        return image.transform(size, Image.Transform.AFFINE, matrix,
+                               resample=Image.Resampling.BICUBIC, fillcolor=255)
+
+    def _tone(self, image: Image.Image) -> Image.Image:
+        if self.contrast == 1.0 and self.threshold is None:
+            return image
+        # Same centre as ImageEnhance.Contrast, from the histogram
+        histogram = np.asarray(image.histogram(), dtype=np.float64)
+        mean = int(histogram @ np.arange(256) / histogram.sum() + 0.5)
+        global_threshold = self.threshold if isinstance(self.threshold, int) else None
+        image = image.point(contrast_lut(mean, self.contrast, global_threshold).tolist())
+        if self.threshold == 'adaptive':
+            pixels = adaptive_threshold(np.asarray(image), self.adaptive_window,
+                                        self.adaptive_offset)
+            image = Image.fromarray(pixels)
+        return image
+
+
+def dump_debug_image(image: Image.Image, name: str) -> None:
+    """Save ``image`` as ``<OCR_DEBUG_DIR>/<name>.png`` if a debug directory is set."""
+    directory = get_setting('OCR_DEBUG_DIR')
+    if not directory:
+        return
+    path = os.path.join(directory, f"{name}.png")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        image.save(path)
+        logger.info(f"Saved preprocessed image to {path}")
+    except OSError as e:
+        logger.warning(f"Could not save debug image {path}: {e}")
+
+
+# Weekly menu page (CyclistScraperImproved): small renders are upscaled,
+# then sharpened and binarized
+MENU = Preprocessing('cyclist_menu', min_width=1000, target_width=1500, sharpen=True,
+                     contrast=2.0, threshold=128, deskew=True)
+
+# TAGESTELLER section of the à la carte page: fine print on a shaded box
+TAGESTELLER = Preprocessing('cyclist_tagesteller', min_width=1600, sharpen=True,
+                            contrast=1.8, threshold='adaptive')
+
+# Older Cyclist scraper variants: grayscale with a contrast boost
+ENHANCED = Preprocessing('cyclist_enhanced', contrast=2.0)
+SIMPLE = Preprocessing('cyclist_simple', contrast=1.5)
+PLAIN = Preprocessing('cyclist_plain')
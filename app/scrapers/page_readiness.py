@@ -0,0 +1,119 @@
+"""
+Page readiness detection for the Selenium scrapers.
+
+Instead of sleeping for a fixed time after ``driver.get()``, scrapers wait for
+a site-specific condition (a selector appearing, the number of matching
+elements settling, or the network going quiet) with an upper bound taken from
+``SCRAPING_READY_TIMEOUT``. Conditions follow the Selenium expected-condition
+convention: callables that take the driver and return a truthy value once the
+page is ready.
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+Condition = Callable[[object], bool]
+
+
+def document_ready() -> Condition:
+    """Ready once ``document.readyState`` is ``complete``."""
+    def condition(driver):
+        return driver.execute_script("return document.readyState") == "complete"
+    return condition
+
+
+def selector_present(css_selector: str, min_count: int = 1) -> Condition:
+    """Ready once at least ``min_count`` elements match ``css_selector``."""
+    def condition(driver):
+        return len(driver.find_elements(By.CSS_SELECTOR, css_selector)) >= min_count
+    return condition
+
+
+def element_count_stable(css_selector: str, settle: float = 0.5,
+                         min_count: int = 1) -> Condition:
+    """
+    Ready once at least ``min_count`` elements match ``css_selector`` and their
+    number has not changed for ``settle`` seconds, i.e. rendering has finished.
+    """
+    state = {"count": None, "since": 0.0}
+
+    def condition(driver):
+        count = len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return count >= min_count and now - state["since"] >= settle
+    return condition
+
+
+def network_idle(idle_time: float = 0.5) -> Condition:
+    """
+    Ready once the document has loaded and no new resources (XHR, fetch,
+    scripts, images) have been requested for ``idle_time`` seconds.
+    """
+    state = {"count": None, "since": 0.0}
+
+    def condition(driver):
+        ready_state, resource_count = driver.execute_script(
+            "return [document.readyState, "
+            "performance.getEntriesByType('resource').length]"
+        )
+        now = time.monotonic()
+        if ready_state != "complete" or resource_count != state["count"]:
+            state["count"], state["since"] = resource_count, now
+            return False
+        return now - state["since"] >= idle_time
+    return condition
+
+
+def all_of(*conditions: Condition) -> Condition:
+    """Ready once every condition is satisfied (all are evaluated each poll)."""
+    def condition(driver):
+        results = [c(driver) for c in conditions]
+        return all(results)
+    return condition
+
+
+def any_of(*conditions: Condition) -> Condition:
+    """Ready as soon as one of the conditions is satisfied."""
+    def condition(driver):
+        return any(c(driver) for c in conditions)
+    return condition
+
+
+def wait_until_ready(driver, condition: Condition, timeout: Optional[float] = None,
+                     poll_frequency: float = 0.1, description: str = "page") -> bool:
+    """
+    Poll ``condition`` until it holds or ``timeout`` seconds pass.
+
+    Returns True when the page became ready and False on timeout, so callers
+    can decide whether to continue with whatever has rendered so far.
+    """
+    if timeout is None:
+        timeout = get_setting('SCRAPING_READY_TIMEOUT', 15)
+
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency,
+                      ignored_exceptions=(StaleElementReferenceException,
+                                          JavascriptException)).until(condition)
+    except TimeoutException:
+        logger.warning(f"{description} not ready after {timeout}s, proceeding anyway")
+        return False
+
+    logger.info(f"{description} ready after {time.monotonic() - started:.2f}s")
+    return True
@@ -0,0 +1,236 @@
+"""
+Text extraction for the PDF menus (IKI, Albanco).
+
+Extracted text is cached on disk (``PDF_CACHE_DIR``) by the PDF's content
+hash, so a weekly PDF is parsed once, not on every run. Only the first
+``max_pages`` pages are read. The parsing runs in a short-lived child
+process: PyPDF2 and pdfplumber can take tens of megabytes for a single
+menu, and that memory is returned to the system when the child exits
+instead of staying in the long-running web worker.
+
+The PDF can be given as bytes or as the path of a downloaded file; a path is
+opened by the parser directly, so the document is never copied through
+memory or the pipe to the child process.
+
+Backends: ``'pypdf2'`` (fast), ``'pdfplumber'`` (slower, better layout,
+optionally word boxes) and ``'auto'``, which uses PyPDF2 and falls back to
+pdfplumber for documents where PyPDF2 finds no text.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Union
+
+from .disk_cache import DiskCacheStore
+from .processes import get_context
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction changes (invalidates cached text)
+EXTRACTION_VERSION = 1
+
+# 'auto' falls back to pdfplumber below this many characters per page
+MIN_CHARS_PER_PAGE = 20
+
+# Accepted for PDF downloads (some servers send PDFs as generic binaries;
+# the file must start with PDF_MAGIC either way)
+PDF_CONTENT_TYPES = ('application/pdf', 'application/x-pdf',
+                     'application/octet-stream', 'binary/octet-stream')
+PDF_MAGIC = b'%PDF-'
+
+
+def max_pdf_bytes() -> int:
+    """Size cap for menu PDF downloads (``PDF_MAX_MB``)."""
+    return get_setting('PDF_MAX_MB', 20) * 1024 * 1024
+
+
+class ExtractionCancelled(Exception):
+    """The extraction was cancelled (see ``cancelled`` of :func:`extract_pdf_text`)."""
+
+
+class PdfText:
+    """Text (and optionally word boxes) of the first pages of a PDF."""
+
+    def __init__(self, pages: List[str], page_count: int, backend: str,
+                 words: Optional[List[List[Dict]]] = None):
+        self.pages = pages
+        self.page_count = page_count
+        self.backend = backend
+        self.words = words
+
+    @property
+    def text(self) -> str:
+        """The pages' text, one line break after every page with text."""
+        return ''.join(page + '\n' for page in self.pages if page)
+
+    def to_json(self) -> bytes:
+        return json.dumps({
+            'pages': self.pages, 'page_count': self.page_count,
+            'backend': self.backend, 'words': self.words,
+        }, ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def from_json(cls, body: bytes) -> 'PdfText':
+        data = json.loads(body)
+        return cls(data['pages'], data['page_count'], data['backend'], data.get('words'))
+
+
+Source = Union[bytes, str]
+
+
+def _open(source: Source):
+    """A file name or file object for the parsers."""
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+
+def _extract_pypdf2(source: Source, max_pages: Optional[int]) -> PdfText:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(_open(source))
+    page_count = len(reader.pages)
+    count = page_count if max_pages is None else min(page_count, max_pages)
+    pages = [reader.pages[i].extract_text() or '' for i in range(count)]
+    return PdfText(pages, page_count, 'pypdf2')
+
+
+def _extract_pdfplumber(source: Source, max_pages: Optional[int], words: bool) -> PdfText:
+    import pdfplumber
+
+    with pdfplumber.open(_open(source)) as pdf:
+        page_count = len(pdf.pages)
+        selected = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+        pages = [page.extract_text() or '' for page in selected]
+        boxes = None
+        if words:
+            boxes = [
+                [{'text': w['text'], 'x0': w['x0'], 'top': w['top'],
+                  'x1': w['x1'], 'bottom': w['bottom']} for w in page.extract_words()]
+                for page in selected
+            ]
+    return PdfText(pages, page_count, 'pdfplumber', boxes)
+
+
+def _extract(source: Source, max_pages: Optional[int], backend: str, words: bool) -> PdfText:
+    """Parse the PDF with ``backend`` (executed in the child process)."""
+    if backend == 'pdfplumber' or words:
+        return _extract_pdfplumber(source, max_pages, words)
+    result = _extract_pypdf2(source, max_pages)
+    if backend == 'auto':
+        chars = sum(len(page.strip()) for page in result.pages)
+        if chars < MIN_CHARS_PER_PAGE * max(1, len(result.pages)):
+            return _extract_pdfplumber(source, max_pages, words)
+    return result
+
+
+def _extract_in_child(source: Source, max_pages: Optional[int], backend: str,
+                      words: bool, cancelled: Optional[threading.Event] = None) -> PdfText:
+    context = get_context(get_setting('PDF_START_METHOD', 'forkserver'))
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+    deadline = time.monotonic() + get_setting('PDF_EXTRACT_TIMEOUT', 60)
+    try:
+        future = executor.submit(_extract, source, max_pages, backend, words)
+        while True:
+            try:
+                # Short waits, so a cancelled scrape kills the child right away
+                return future.result(timeout=max(0.0, min(0.25, deadline - time.monotonic())))
+            except FuturesTimeoutError:
+                if cancelled is not None and cancelled.is_set():
+                    _kill(executor)
+                    raise ExtractionCancelled("PDF extraction was cancelled")
+                if time.monotonic() >= deadline:
+                    _kill(executor)
+                    raise TimeoutError("PDF extraction took too long")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _kill(executor: ProcessPoolExecutor) -> None:
+    # ProcessPoolExecutor has no public way to kill a running task
+    for process in list((getattr(executor, '_processes', None) or {}).values()):
+        process.kill()
+
+
+_store: Optional[DiskCacheStore] = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> Optional[DiskCacheStore]:
+    global _store
+    if not get_setting('PDF_CACHE_ENABLED', True):
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = DiskCacheStore(
+                get_setting('PDF_CACHE_DIR'),
+                get_setting('PDF_CACHE_MAX_MB', 20) * 1024 * 1024,
+            )
+        return _store
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pdf_text(source: Source, max_pages: Optional[int] = None, backend: str = 'auto',
+                     words: bool = False, digest: Optional[str] = None,
+                     cancelled: Optional[threading.Event] = None) -> PdfText:
+    """
+    Extract the text of the first ``max_pages`` pages (all pages if None) of
+    the PDF ``source``, its bytes or a file path, from the cache when this PDF
+    was extracted before. ``digest`` is the SHA-256 of the PDF if the caller
+    already has it (e.g. from :class:`~.http_cache.Download`).
+
+    When ``cancelled`` is set (e.g. a scraper's cancel event) the child
+    process is killed and :class:`ExtractionCancelled` is raised.
+    """
+    if digest is None:
+        if isinstance(source, str):
+            digest = _file_digest(source)
+        else:
+            digest = hashlib.sha256(source).hexdigest()
+    key = f"pdf:v{EXTRACTION_VERSION}:{digest}:{backend}:{max_pages}:{int(words)}"
+    store = _get_store()
+    if store is not None:
+        entry = store.get(key)
+        if entry is not None:
+            try:
+                result = PdfText.from_json(entry[0])
+                logger.info(f"Using cached text of PDF {digest[:12]} ({result.backend})")
+                return result
+            except (ValueError, KeyError):
+                store.delete(key)
+
+    if get_setting('PDF_EXTRACT_IN_CHILD', True):
+        try:
+            result = _extract_in_child(source, max_pages, backend, words, cancelled)
+        except (TimeoutError, ExtractionCancelled):
+            raise
+        except (BrokenProcessPool, OSError) as e:
+            # e.g. the child could not be started
+            if cancelled is not None and cancelled.is_set():
+                raise ExtractionCancelled("PDF extraction was cancelled") from e
+            logger.warning(f"PDF extraction process failed, extracting in-process: {e}")
+            result = _extract(source, max_pages, backend, words)
+    else:
+        result = _extract(source, max_pages, backend, words)
+
+    logger.info(f"Extracted {len(result.pages)}/{result.page_count} pages of PDF "
+                f"{digest[:12]} with {result.backend}")
+    if result.page_count > len(result.pages):
+        logger.warning(f"PDF {digest[:12]} has {result.page_count} pages; only the first "
+                       f"{len(result.pages)} were read (max_pages={max_pages})")
+    if store is not None:
+        store.put(key, result.to_json())
+    return result
@@ -0,0 +1,26 @@
+"""
+Child processes for the CPU-bound parts of scraping (PDF parsing, OCR).
+
+The scraping process runs scraper threads, the Chrome pool, retry waits and,
+in the web worker, the eventlet hub. A child forked from it inherits locks
+held by those threads at that moment (logging, the HTTP connection pool, the
+disk cache) and can deadlock on them; it also inherits open descriptors such
+as the scheduler lock. Children are therefore started with ``forkserver`` by
+default: they are forked from a small single-threaded server process, which
+imports the worker modules once so that each child starts quickly.
+"""
+
+import multiprocessing
+from typing import Optional
+
+# Modules imported by the fork server before it forks any child
+PRELOAD = ['app.scrapers.pdf_text', 'app.scrapers.ocr_engine']
+
+
+def get_context(start_method: Optional[str] = 'forkserver'):
+    """Return the multiprocessing context for ``start_method`` (None: platform default)."""
+    context = multiprocessing.get_context(start_method)
+    if context.get_start_method() == 'forkserver':
+        # Only takes effect until the fork server has been started
+        context.set_forkserver_preload(PRELOAD)
+    return context
@@ -0,0 +1,82 @@
+"""
+Registry of the configured scrapers.
+
+Scrapers are declared by restaurant name and import path in ``SCRAPERS``
+(plus one entry per ``MEALPLAN_OUTLETS`` outlet) and their modules are only
+imported when a scraper is first used. Selenium, PyPDF2, pdfplumber, PIL and
+Tesseract are therefore never loaded by a web worker that does not scrape.
+Names listed in ``SCRAPERS_DISABLED`` are left out.
+"""
+
+import importlib
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# Builds the scraper of one mealplan outlet (see mealplan_scraper.scraper_for_outlet)
+MEALPLAN_FACTORY = 'app.scrapers.mealplan_scraper:scraper_for_outlet'
+
+
+class ScraperSpec:
+    """
+    A scraper declared by name and ``"module:attribute"`` import path.
+
+    The attribute is a scraper class or factory, called with ``kwargs`` on
+    first use; the instance is kept for later calls to :meth:`load`.
+    :meth:`create` returns a new instance, e.g. one per scraping run.
+    """
+
+    def __init__(self, name: str, target: str, kwargs: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.target = target
+        self.kwargs = kwargs or {}
+        self._scraper = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._scraper is not None
+
+    def load(self):
+        """Import the scraper's module and create the scraper (once)."""
+        if self._scraper is None:
+            self._scraper = self.create()
+        return self._scraper
+
+    def create(self):
+        """Import the scraper's module (if needed) and create a new scraper."""
+        module_name, _, attribute = self.target.partition(':')
+        factory = getattr(importlib.import_module(module_name), attribute)
+        scraper = factory(**self.kwargs)
+        if scraper.name != self.name:
+            logger.warning(
+                f"Scraper {self.target} is registered as {self.name!r} "
+                f"but calls itself {scraper.name!r}"
+            )
+        return scraper
+
+    def __repr__(self) -> str:
+        return f"ScraperSpec({self.name!r}, {self.target!r})"
+
+
+def scraper_specs(include_disabled: bool = False) -> List[ScraperSpec]:
+    """Return the configured scrapers, in run order, without importing them."""
+    specs = [ScraperSpec(name, target) for name, target in get_setting('SCRAPERS', ())]
+    # The mealplan outlets of a host wait for the first one to probe it, so
+    # they are queued last to not hold several workers early in the run
+    specs.extend(
+        ScraperSpec(name, MEALPLAN_FACTORY, {'name': name})
+        for name, _, _ in get_setting('MEALPLAN_OUTLETS', ())
+    )
+
+    if include_disabled:
+        return specs
+    disabled = disabled_names()
+    return [spec for spec in specs if spec.name.lower() not in disabled]
+
+
+def disabled_names() -> Set[str]:
+    """The lower-cased restaurant names listed in ``SCRAPERS_DISABLED``."""
+    return {name.lower() for name in get_setting('SCRAPERS_DISABLED', ())}
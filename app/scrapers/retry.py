@@ -0,0 +1,168 @@
+"""
+Retry policy shared by the scrapers' HTTP requests.
+
+Requests that fail with a retryable error (connection problems, timeouts,
+HTTP 429/5xx) are retried up to ``SCRAPING_RETRY_COUNT`` times with jittered
+exponential backoff starting at ``SCRAPING_RETRY_DELAY`` seconds. A
+``Retry-After`` header from the server takes precedence over the computed
+delay. The time spent waiting is charged to the request's host; once a host
+has used ``SCRAPING_RETRY_HOST_BUDGET`` seconds in the current scraping run,
+its requests fail immediately instead of pushing the run past its deadline.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """The delay requested by a ``Retry-After`` header (seconds or HTTP date), if any."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Retries a request with jittered exponential backoff under a per-host budget."""
+
+    def __init__(self, retries: int = 3, base_delay: float = 5, max_delay: float = 60,
+                 host_budget: float = 60):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.host_budget = host_budget
+        self._spent: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (0-based): half fixed, half random."""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def reset_budgets(self) -> None:
+        """Give every host its full retry budget again (at the start of a run)."""
+        with self._lock:
+            self._spent.clear()
+
+    def _reserve(self, host: str, delay: float) -> bool:
+        """Charge ``delay`` to ``host``; False if that would exceed its budget."""
+        with self._lock:
+            spent = self._spent.get(host, 0.0)
+            if spent + delay > self.host_budget:
+                return False
+            self._spent[host] = spent + delay
+            return True
+
+    def send(self, url: str, request: Callable[[], requests.Response],
+             cancelled: Optional[threading.Event] = None) -> requests.Response:
+        """
+        Call ``request()`` until it returns a non-retryable response or the
+        retries or the host's budget are used up. The last response is
+        returned (or the last error raised); a response that is retried, or
+        that is returned because waiting was cancelled, has been closed. Waiting stops early when
+        ``cancelled`` is set.
+        """
+        host = urlparse(url).netloc
+        attempt = 0
+        while True:
+            try:
+                response = request()
+                error = None
+            except RETRYABLE_ERRORS as e:
+                response = None
+                error = e
+
+            if response is not None and response.status_code not in RETRYABLE_STATUS:
+                return response
+            if attempt >= self.retries:
+                return self._give_up(response, error)
+
+            delay = self.backoff(attempt)
+            if response is not None:
+                requested = retry_after_seconds(response)
+                if requested is not None:
+                    delay = requested
+            if delay > self.max_delay:
+                logger.warning(f"{host} asks to retry in {delay:.0f}s; not retrying {url}")
+                return self._give_up(response, error)
+            if not self._reserve(host, delay):
+                logger.warning(f"Retry budget for {host} exhausted; not retrying {url}")
+                return self._give_up(response, error)
+
+            reason = error or f"HTTP {response.status_code}"
+            logger.info(f"Retrying {url} in {delay:.1f}s "
+                        f"(attempt {attempt + 2}/{self.retries + 1}): {reason}")
+            if response is not None:
+                # Hand the connection back to the pool before waiting; a
+                # streamed response otherwise holds it until it is collected.
+                response.close()
+            if cancelled is not None:
+                if cancelled.wait(delay):
+                    return self._give_up(response, error)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _give_up(response: Optional[requests.Response],
+                 error: Optional[Exception]) -> requests.Response:
+        if error is not None:
+            raise error
+        return response
+
+
+_policy: Optional[RetryPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy, creating it on first use."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = RetryPolicy(
+                retries=get_setting('SCRAPING_RETRY_COUNT', 3),
+                base_delay=get_setting('SCRAPING_RETRY_DELAY', 5),
+                max_delay=get_setting('SCRAPING_RETRY_MAX_DELAY', 60),
+                host_budget=get_setting('SCRAPING_RETRY_HOST_BUDGET', 60),
+            )
+        return _policy
+
+
+def send_with_retry(url: str, request: Callable[[], requests.Response],
+                    cancelled: Optional[threading.Event] = None) -> requests.Response:
+    """Perform ``request()`` for ``url`` under the shared retry policy."""
+    return get_retry_policy().send(url, request, cancelled)
+
+
+def reset_retry_budgets() -> None:
+    """Reset the per-host retry budgets; called at the start of every scraping run."""
+    get_retry_policy().reset_budgets()
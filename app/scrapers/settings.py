@@ -0,0 +1,18 @@
+"""
+Scraping settings lookup.
+
+Scrapers are also used from standalone scripts without a Flask application,
+so settings are read from the active app config when there is one and from
+the base ``config.Config`` class otherwise.
+"""
+
+from flask import current_app, has_app_context
+
+from config import Config
+
+
+def get_setting(name, default=None):
+    """Return the configured value for ``name`` or ``default`` if it is unset."""
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
@@ -0,0 +1,224 @@
+# app/services/menu_service.py
+"""
+Read side of the menu data.
+
+``/api/menus``, the Socket.IO ``connect`` handler and
+``ScrapingService.notify_clients_of_update`` all send the same payload: every
+restaurant with its menu items for one day. It is built here from a single
+query instead of one query per restaurant.
+
+Built payloads are kept as per-date snapshots holding the serialized JSON, so
+repeated reads cost no database work. ``save_to_db`` invalidates them by
+touching a stamp file under ``instance/``, which also reaches the web process
+when the scrape runs in a separate process (the systemd timer job).
+
+Each snapshot also carries its ETag and lazily built gzip/brotli variants
+of the body, so ``/api/menus`` can answer conditional and compressed
+requests without serializing or compressing again. The ETag covers the
+menus but not the ``last_scraped`` times, so a scrape that only confirms
+the menus keeps it (and the clients' copies) valid; it is therefore weak.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+from flask import current_app
+from sqlalchemy import and_
+
+from app import db
+from app.models import MenuItem, Restaurant
+
+
+def menu_query(menu_date: date):
+    """
+    All restaurants joined with their items for ``menu_date``.
+
+    The outer join keeps restaurants without a menu for that day; their item
+    columns are NULL. Rows come ordered by restaurant and menu position.
+    """
+    return (
+        db.session.query(
+            Restaurant.id,
+            Restaurant.name,
+            Restaurant.url,
+            Restaurant.last_scraped,
+            MenuItem.id,
+            MenuItem.category,
+            MenuItem.description,
+            MenuItem.price,
+        )
+        .outerjoin(
+            MenuItem,
+            and_(MenuItem.restaurant_id == Restaurant.id, MenuItem.menu_date == menu_date),
+        )
+        .order_by(Restaurant.id, MenuItem.position, MenuItem.id)
+    )
+
+
+def get_menu_payload(menu_date: date) -> List[dict]:
+    """
+    Return every restaurant with its menu items for ``menu_date``:
+
+        [{"id": 1, "name": "IKI Restaurant", "url": "...",
+          "last_scraped": "2025-08-18T05:00:12", "items": [
+              {"category": "Bento Box", "description": "...", "price": "€12,90"}]}]
+    """
+    restaurants = []
+    current = None
+    for (restaurant_id, name, url, last_scraped,
+         item_id, category, description, price) in menu_query(menu_date):
+        if current is None or current["id"] != restaurant_id:
+            current = {
+                "id": restaurant_id,
+                "name": name,
+                "url": url,
+                "last_scraped": last_scraped.isoformat() if last_scraped else None,
+                "items": [],
+            }
+            restaurants.append(current)
+        if item_id is not None:
+            current["items"].append({
+                "category": category,
+                "description": description,
+                "price": price or "",
+            })
+    return restaurants
+
+
+def menu_content_hash(menu_date: date, restaurants: List[dict]) -> str:
+    """SHA-256 of a menu payload without the ``last_scraped`` times."""
+    content = [
+        {key: value for key, value in restaurant.items() if key != "last_scraped"}
+        for restaurant in restaurants
+    ]
+    data = json.dumps([menu_date.isoformat(), content], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    # mtime=0 keeps the output, and so its ETag, stable across rebuilds
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+class MenuSnapshot:
+    """The menu payload of one day, serialized once."""
+
+    def __init__(self, menu_date: date, restaurants: List[dict], body: bytes, stamp: int):
+        self.menu_date = menu_date
+        self.restaurants = restaurants
+        self.body = body
+        self.stamp = stamp
+        self.content_hash = menu_content_hash(menu_date, restaurants)
+        self._encoded: Dict[str, bytes] = {}
+        self._encoded_lock = threading.Lock()
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        """(Weak) ETag of the menus, or of their ``encoding`` variant."""
+        if encoding:
+            return f"{self.content_hash[:32]}-{encoding}"
+        return self.content_hash[:32]
+
+    def encoded(self, encoding: str) -> bytes:
+        """The body compressed with ``encoding`` ("gzip" or "br"), compressed only once."""
+        with self._encoded_lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                data = _compress(self.body, encoding)
+                self._encoded[encoding] = data
+            return data
+
+
+def supported_encodings() -> List[str]:
+    """Content encodings /api/menus can serve, most preferred first."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def seconds_until_next_scrape(now: Optional[datetime] = None) -> int:
+    """
+    Seconds until menu data is next expected to change: the daily scheduled
+    scrape, capped at MENU_CACHE_MAX_AGE because the hourly timer and manual
+    refreshes can change it earlier.
+    """
+    now = now or datetime.now()
+    next_run = now.replace(
+        hour=current_app.config.get("SCRAPE_SCHEDULE_HOUR", 5),
+        minute=current_app.config.get("SCRAPE_SCHEDULE_MINUTE", 0),
+        second=0, microsecond=0,
+    )
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    seconds = int((next_run - now).total_seconds())
+    return max(0, min(seconds, current_app.config.get("MENU_CACHE_MAX_AGE", 3600)))
+
+
+_snapshots: Dict[date, MenuSnapshot] = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+# Dates kept in memory (today plus whatever dates clients ask for)
+MAX_SNAPSHOTS = 32
+
+
+def get_menu_snapshot(menu_date: date) -> MenuSnapshot:
+    """
+    Return the snapshot for ``menu_date``, building it only if the menu data
+    changed since it was built. The JSON body is ``{"date": ..., "restaurants": [...]}``.
+    """
+    stamp = _read_stamp()
+    with _snapshots_lock:
+        snapshot = _snapshots.get(menu_date)
+        if snapshot is not None and snapshot.stamp == stamp:
+            return snapshot
+
+        restaurants = get_menu_payload(menu_date)
+        body = current_app.json.dumps({
+            "date": menu_date.isoformat(),
+            "restaurants": restaurants,
+        }).encode("utf-8")
+        snapshot = MenuSnapshot(menu_date, restaurants, body, stamp)
+
+        _snapshots.pop(menu_date, None)
+        _snapshots[menu_date] = snapshot
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+        return snapshot
+
+
+def invalidate_menu_snapshots() -> None:
+    """Drop all snapshots, in this process and (via the stamp file) in the others."""
+    with _snapshots_lock:
+        _snapshots.clear()
+    path = _stamp_path()
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a"):
+            pass
+        os.utime(path)
+    except OSError as e:
+        current_app.logger.warning(f"Could not touch menu snapshot stamp {path}: {e}")
+
+
+def _stamp_path() -> Optional[str]:
+    return current_app.config.get("MENU_SNAPSHOT_STAMP")
+
+
+def _read_stamp() -> int:
+    """Modification time of the stamp file (0 if it does not exist yet)."""
+    path = _stamp_path()
+    try:
+        return os.stat(path).st_mtime_ns if path else 0
+    except OSError:
+        return 0
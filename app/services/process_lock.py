@@ -0,0 +1,87 @@
+# app/services/process_lock.py
+"""
+Advisory file locks shared by every process of a deployment.
+
+Gunicorn workers (including recycled ones), the manual scrape scripts and the
+``lunch-scraper`` systemd job all create the app. Two locks under
+``instance/`` keep them from doing the same work twice:
+
+* the scheduler lock is held for the life of the process that runs the
+  APScheduler job, so exactly one scheduler exists per deployment; the
+  other processes keep retrying it and take over when the holder exits;
+* the scrape lock is held for the duration of ``run_all_scrapers``, so a run
+  that starts while another one is in progress (timer, scheduler, startup
+  scrape or a client refresh) is skipped.
+
+Locks are released by the operating system when their process exits, so a
+crashed process never leaves a stale lock behind.
+"""
+import logging
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; locking is then a no-op
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessLock:
+    """A non-blocking exclusive ``flock`` on ``path``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Take the lock; return False if another process (or thread) holds it."""
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            logger.warning(f"File locking unavailable; not locking {self.path}")
+            self._file = open(os.devnull, "w")
+            return True
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        # Record the holder for whoever inspects the lock file
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        lock_file, self._file = self._file, None
+        if lock_file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        lock_file.close()
+
+
+_scheduler_lock: Optional[ProcessLock] = None
+
+
+def acquire_scheduler_lock(path: str) -> bool:
+    """
+    Try to become the scheduler leader of the deployment. The lock is kept
+    until the process exits; calling this again in the leader returns True.
+    """
+    global _scheduler_lock
+    if _scheduler_lock is None or _scheduler_lock.path != path:
+        _scheduler_lock = ProcessLock(path)
+    return _scheduler_lock.acquire()
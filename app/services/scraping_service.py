@@ -1,20 +1,27 @@
 # app/services/scraping_service.py
 from flask import current_app
-from datetime import date, timedelta
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
 from sqlalchemy import func
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
+import sys
+import threading
+import time
 
 from app import db, socketio
-from app.models import Restaurant, MenuItem
-from app.scrapers.erste_campus_scraper import ErsteCampusScraper
-from app.scrapers.fouroh4_scraper import FourOh4Scraper
-from app.scrapers.henry_scraper import HenryScraper
-from app.scrapers.iki_scraper import IKIScraper
-from app.scrapers.cafegeorge_scraper import CafeGeorgeScraper
-from app.scrapers.campusbraeu_scraper import CampusBrauScraper
-from app.scrapers.albanco_scraper import AlbancoScraper
-from app.scrapers.cyclist_scraper_improved import CyclistScraperImproved
+from app.models import MenuFingerprint, Restaurant, MenuItem
+from app.scrapers.base_scraper import BaseScraper, ScrapeTimeout, SourceUnchanged
+from app.services.menu_service import get_menu_snapshot, invalidate_menu_snapshots
+from app.services.process_lock import ProcessLock
+from app.scrapers.mealplan import reset_mealplan_engine
+from app.scrapers.registry import ScraperSpec, scraper_specs
+from app.scrapers.retry import reset_retry_budgets
+
+# Scrapes abandoned after their time budget that may still be running, by
+# restaurant name; shared by every ScrapingService of the process
+_abandoned: Dict[str, Future] = {}
+_abandoned_lock = threading.Lock()
 
 
 class ScrapingService:
@@ -27,24 +34,40 @@ class ScrapingService:
         """Initialize the scraping service with all configured scrapers."""
         self.logger = self._get_logger()
 
-        # Initialize all scrapers
-        self.scrapers = [
-            ErsteCampusScraper(),
-            FourOh4Scraper(),
-            HenryScraper(),
-            IKIScraper(),
-            CafeGeorgeScraper(),
-            CampusBrauScraper(),
-            AlbancoScraper(),
-            CyclistScraperImproved(),
-            # Add more scrapers here as they are developed:
-            # KekkoSushiScraper(),
-        ]
+        # Scrapers are declared in SCRAPERS / MEALPLAN_OUTLETS and their modules
+        # (selenium, PDF and OCR libraries) are only imported when first run
+        self.specs: List[ScraperSpec] = scraper_specs()
 
         self.logger.info(
-            f"Initialized ScrapingService with {len(self.scrapers)} scrapers"
+            f"Initialized ScrapingService with {len(self.specs)} scrapers"
         )
 
+    @property
+    def scrapers(self) -> List[BaseScraper]:
+        """The scraper instances, importing their modules on first access."""
+        return [
+            scraper
+            for _, scraper, error in self._load_scrapers(self.specs)
+            if error is None
+        ]
+
+    def _load_scrapers(
+        self, specs: List[ScraperSpec], fresh: bool = False
+    ) -> List[Tuple[ScraperSpec, Optional[BaseScraper], Optional[Exception]]]:
+        """
+        Load ``specs``, returning (spec, scraper, error) with one of the two set.
+        With ``fresh``, new scraper instances are created (one per run, so a
+        scrape abandoned after a timeout never shares its instance).
+        """
+        loaded = []
+        for spec in specs:
+            try:
+                loaded.append((spec, spec.create() if fresh else spec.load(), None))
+            except Exception as e:
+                self.logger.error(f"Could not load scraper {spec.name} ({spec.target}): {e}")
+                loaded.append((spec, None, e))
+        return loaded
+
     def _get_logger(self) -> logging.Logger:
         """Get logger instance, handling both app context and standalone usage."""
         if current_app:
@@ -63,51 +86,149 @@ class ScrapingService:
                 logger.addHandler(handler)
             return logger
 
-    def run_all_scrapers(self) -> dict:
+    def run_all_scrapers(
+        self, concurrent: Optional[bool] = None, max_workers: Optional[int] = None
+    ) -> dict:
         """
         Run all configured scrapers and return statistics.
 
+        Scrapers are executed on a thread pool so that network-bound (PDF/HTTP)
+        and browser-bound (Selenium) scrapers overlap. Database writes are still
+        performed one at a time from the calling thread as results come in.
+
+        Args:
+            concurrent: Run scrapers in parallel (defaults to SCRAPING_CONCURRENT)
+            max_workers: Worker thread count (defaults to SCRAPING_MAX_WORKERS)
+
+        Only one run happens at a time per deployment: if another process or
+        thread is already scraping (see SCRAPE_LOCK_FILE), this call returns
+        immediately with ``skipped`` set.
+
         Returns:
-            dict: Statistics about the scraping run including successes, failures, and item counts
+            dict: Statistics about the scraping run including successes, failures,
+                  item counts, per-scraper durations and total wall-clock time
         """
+        lock = ProcessLock(current_app.config["SCRAPE_LOCK_FILE"])
+        if not lock.acquire():
+            self.logger.info("Another scrape is already running; skipping this one")
+            return {"total_scrapers": len(self.specs), "skipped": True}
+        try:
+            return self._run_all_scrapers(concurrent, max_workers)
+        finally:
+            lock.release()
+
+    def _run_all_scrapers(
+        self, concurrent: Optional[bool], max_workers: Optional[int]
+    ) -> dict:
+        if concurrent is None:
+            concurrent = current_app.config.get("SCRAPING_CONCURRENT", True)
+        if max_workers is None:
+            max_workers = current_app.config.get("SCRAPING_MAX_WORKERS", 4)
+        max_workers = max(1, min(max_workers, len(self.specs) or 1))
+        if not concurrent:
+            max_workers = 1
+
         self.logger.info("=" * 60)
-        self.logger.info("Starting scraping process for all restaurants")
+        self.logger.info(
+            f"Starting scraping process for all restaurants "
+            f"({'concurrent, %d workers' % max_workers if max_workers > 1 else 'sequential'})"
+        )
         self.logger.info("=" * 60)
 
+        run_started = time.monotonic()
         stats = {
-            "total_scrapers": len(self.scrapers),
+            "total_scrapers": len(self.specs),
+            "skipped": False,
             "successful": 0,
+            "changed": 0,
+            "unchanged": 0,
             "failed": 0,
+            "timed_out": [],
             "total_items": 0,
+            "rows": {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0},
             "errors": [],
+            "workers": max_workers,
+            "durations": {},
+            "total_duration": 0.0,
         }
 
         with current_app.app_context():
-            for scraper in self.scrapers:
-                try:
-                    self.logger.info(f"\n▶ Running scraper for: {scraper.name}")
-                    self.logger.info(f"  URL: {scraper.url}")
+            # Imported here, in the calling thread, rather than by the workers
+            scrapers = []
+            for spec, scraper, error in self._load_scrapers(self.specs, fresh=True):
+                if error is not None:
+                    stats["failed"] += 1
+                    stats["errors"].append({"scraper": spec.name, "error": str(error)})
+                else:
+                    scrapers.append(scraper)
+
+            self._prime_scrapers(scrapers)
+            reset_retry_budgets()
+            reset_mealplan_engine()
+
+            # Scrapers run on worker threads; this loop is the single DB writer
+            for scraper, menu_items, error, duration in self._iter_scraper_results(
+                scrapers, max_workers
+            ):
+                stats["durations"][scraper.name] = round(duration, 2)
+
+                if isinstance(error, SourceUnchanged):
+                    stats["successful"] += 1
+                    stats["unchanged"] += 1
+                    scraper.mark_scraped()
+                    self.logger.info(
+                        f"  ⏸ Unchanged: {scraper.name} source not modified ({duration:.1f}s)"
+                    )
+                    continue
+
+                if isinstance(error, ScrapeTimeout):
+                    stats["failed"] += 1
+                    stats["timed_out"].append(scraper.name)
+                    stats["errors"].append({"scraper": scraper.name, "error": str(error)})
+                    self.logger.error(f"  ⏱ Timeout: {scraper.name}: {error}")
+                    continue
 
-                    # Run the scraper
-                    menu_items = scraper.scrape()
+                if error is not None:
+                    stats["failed"] += 1
+                    stats["errors"].append({"scraper": scraper.name, "error": str(error)})
+                    self.logger.error(
+                        f"  ❌ Error: Failed to run scraper for {scraper.name}: {error}",
+                        exc_info=error,
+                    )
+                    continue
 
+                try:
                     if menu_items:
                         # Save to database
-                        scraper.save_to_db(menu_items)
+                        counts = scraper.save_to_db(menu_items)
+                        changed = counts["inserted"] or counts["updated"] or counts["deleted"]
 
                         item_count = len(menu_items)
                         stats["successful"] += 1
                         stats["total_items"] += item_count
-
-                        self.logger.info(f"  ✅ Success: Saved {item_count} menu items")
+                        for key, value in counts.items():
+                            stats["rows"][key] += value
+
+                        if changed:
+                            stats["changed"] += 1
+                            self.logger.info(
+                                f"  ✅ Success: Saved {item_count} menu items for "
+                                f"{scraper.name} (+{counts['inserted']} ~{counts['updated']} "
+                                f"-{counts['deleted']} ={counts['unchanged']}, {duration:.1f}s)"
+                            )
+                        else:
+                            stats["unchanged"] += 1
+                            self.logger.info(
+                                f"  ✅ Success: {item_count} menu items for "
+                                f"{scraper.name} unchanged ({duration:.1f}s)"
+                            )
 
                         # Log sample items for verification
-                        if menu_items and len(menu_items) > 0:
-                            sample = menu_items[0]
-                            self.logger.debug(
-                                f"  Sample item: {sample.get('menu_date')} - "
-                                f"{sample.get('category')} - {sample.get('description')[:50]}..."
-                            )
+                        sample = menu_items[0]
+                        self.logger.debug(
+                            f"  Sample item: {sample.get('menu_date')} - "
+                            f"{sample.get('category')} - {sample.get('description')[:50]}..."
+                        )
                     else:
                         stats["failed"] += 1
                         stats["errors"].append(
@@ -118,28 +239,278 @@ class ScrapingService:
                         )
 
                 except Exception as e:
+                    db.session.rollback()
                     stats["failed"] += 1
                     stats["errors"].append({"scraper": scraper.name, "error": str(e)})
                     self.logger.error(
-                        f"  ❌ Error: Failed to run scraper for {scraper.name}: {e}",
+                        f"  ❌ Error: Failed to save results for {scraper.name}: {e}",
                         exc_info=True,
                     )
 
+            stats["total_duration"] = round(time.monotonic() - run_started, 2)
+
+            # The shared browser pool stays warm for the next run (it is closed
+            # at exit); the OCR worker processes only live for a run (and only
+            # exist if an image scraper was loaded)
+            ocr = sys.modules.get("app.scrapers.ocr_engine")
+            if ocr is not None:
+                ocr.close_ocr_engine()
+
             # Log summary
             self.logger.info("\n" + "=" * 60)
             self.logger.info("Scraping Summary:")
             self.logger.info(f"  Total scrapers: {stats['total_scrapers']}")
             self.logger.info(f"  Successful: {stats['successful']}")
+            self.logger.info(f"  Changed: {stats['changed']}")
+            self.logger.info(f"  Unchanged: {stats['unchanged']}")
             self.logger.info(f"  Failed: {stats['failed']}")
+            if stats["timed_out"]:
+                self.logger.info(f"  Timed out: {', '.join(stats['timed_out'])}")
             self.logger.info(f"  Total items scraped: {stats['total_items']}")
+            self.logger.info(
+                f"  Rows: {stats['rows']['inserted']} inserted, "
+                f"{stats['rows']['updated']} updated, {stats['rows']['deleted']} deleted, "
+                f"{stats['rows']['unchanged']} unchanged"
+            )
+            self.logger.info(f"  Wall-clock time: {stats['total_duration']}s")
+            for name, duration in sorted(
+                stats["durations"].items(), key=lambda kv: kv[1], reverse=True
+            ):
+                self.logger.info(f"    {name}: {duration}s")
             self.logger.info("=" * 60)
 
-            # Notify connected clients
-            if stats["successful"] > 0:
+            # Notify connected clients, but only if a menu actually changed
+            if stats["changed"] > 0:
                 self.notify_clients_of_update()
+            else:
+                self.logger.info("No menu changed; skipping client notification")
 
         return stats
 
+    def has_fresh_menus(self) -> bool:
+        """
+        Whether every configured restaurant was scraped today, within the last
+        STARTUP_SCRAPE_MAX_AGE seconds, so a startup scrape would add nothing.
+        """
+        max_age = current_app.config.get("STARTUP_SCRAPE_MAX_AGE", 6 * 3600)
+        now = datetime.utcnow()
+        # last_scraped is stored in UTC; today's local midnight expressed in UTC
+        midnight = now - (datetime.now() - datetime.combine(date.today(), datetime.min.time()))
+        fresh_since = max(midnight, now - timedelta(seconds=max_age))
+
+        scraped = dict(
+            db.session.query(Restaurant.name, Restaurant.last_scraped).filter(
+                Restaurant.name.in_([spec.name for spec in self.specs])
+            )
+        )
+        stale = [
+            spec.name
+            for spec in self.specs
+            if not scraped.get(spec.name) or scraped[spec.name] < fresh_since
+        ]
+        if stale:
+            self.logger.info(f"Menus not fresh for: {', '.join(stale)}")
+        return not stale
+
+    def run_scheduled_scrape(self, app) -> Optional[dict]:
+        """
+        Run all scrapers inside ``app``'s context. Entry point for the
+        scheduler job and other background tasks, which start without one.
+        """
+        with app.app_context():
+            try:
+                return self.run_all_scrapers()
+            except Exception as e:
+                self.logger.error(f"Scheduled scrape failed: {e}", exc_info=True)
+                return None
+            finally:
+                db.session.remove()
+
+    def run_startup_scrape(self, app) -> Optional[dict]:
+        """
+        Scrape once after the application started, unless today's menus are
+        already fresh. Meant to run as a background task so the worker serves the
+        stored menus right away; clients get the result via ``menu_update``.
+        """
+        with app.app_context():
+            try:
+                if self.has_fresh_menus():
+                    self.logger.info("Today's menus are fresh; skipping initial scrape")
+                    return None
+                self.logger.info("Performing initial scrape in the background...")
+                return self.run_all_scrapers()
+            except Exception as e:
+                self.logger.error(f"Initial scrape failed: {e}", exc_info=True)
+                return None
+            finally:
+                db.session.remove()
+
+    def _prime_scrapers(self, scrapers: List[BaseScraper]):
+        """
+        Tell each scraper whether today's menu is already stored and which
+        source it came from, so it may stop early when its source is
+        unchanged. Done here rather than in the worker threads, which do not
+        touch the database.
+        """
+        today = date.today()
+        stored = {
+            name
+            for (name,) in db.session.query(Restaurant.name)
+            .join(MenuItem)
+            .filter(MenuItem.menu_date == today)
+            .distinct()
+        }
+        source_hashes = dict(
+            db.session.query(Restaurant.name, MenuFingerprint.source_hash)
+            .join(MenuFingerprint)
+            .filter(MenuFingerprint.menu_date == today)
+        )
+        for scraper in scrapers:
+            scraper.has_current_menu = scraper.name in stored
+            scraper.known_source_hash = source_hashes.get(scraper.name)
+            scraper.source_hash = None
+            scraper.reset_cancel()
+
+    def _iter_scraper_results(
+        self, scrapers: List[BaseScraper], max_workers: int
+    ) -> Iterator[Tuple[BaseScraper, Optional[List[dict]], Optional[Exception], float]]:
+        """
+        Execute the scrapers and yield their results as soon as each one finishes.
+
+        Every scraper runs on a worker thread (even in sequential mode) so its
+        time budget can be enforced: a scraper still running after
+        ``scraper_timeout`` seconds is cancelled, its browser is killed and a
+        :class:`ScrapeTimeout` is yielded for it. Its thread is abandoned; its
+        result, should it still arrive, is ignored. Until that thread has
+        finished, later runs do not start the same scraper again.
+
+        Yields:
+            Tuples of (scraper, menu_items, error, duration_in_seconds)
+        """
+        app = current_app._get_current_object()
+        # scraper -> (start time, worker thread id), filled in by the workers
+        started: Dict[BaseScraper, Tuple[float, int]] = {}
+        runnable = []
+        for scraper in scrapers:
+            if self._still_running(scraper.name):
+                self.logger.warning(
+                    f"  ⏱ {scraper.name}: the previous, timed out run has not finished yet"
+                )
+                yield (
+                    scraper,
+                    None,
+                    ScrapeTimeout("Previous run timed out and is still running"),
+                    0.0,
+                )
+            else:
+                runnable.append(scraper)
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="scraper"
+        )
+        try:
+            futures = {
+                executor.submit(self._timed_scrape, scraper, app, started): scraper
+                for scraper in runnable
+            }
+            pending = set(futures)
+            while pending:
+                done, _ = wait(
+                    pending,
+                    timeout=self._next_timeout_check(
+                        [futures[future] for future in pending], started
+                    ),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    pending.discard(future)
+                    yield (futures[future], *future.result())
+
+                now = time.monotonic()
+                for future in list(pending):
+                    scraper = futures[future]
+                    if scraper not in started:
+                        continue
+                    started_at, thread_id = started[scraper]
+                    budget = self.scraper_timeout(scraper.name)
+                    if budget and now - started_at > budget and not future.done():
+                        pending.discard(future)
+                        with _abandoned_lock:
+                            _abandoned[scraper.name] = future
+                        self._cancel_scraper(scraper, thread_id)
+                        yield (
+                            scraper,
+                            None,
+                            ScrapeTimeout(f"Timed out after {budget:.0f}s"),
+                            now - started_at,
+                        )
+        finally:
+            # Do not wait for abandoned (timed out) scrapers
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _still_running(name: str) -> bool:
+        """Whether an abandoned scrape of ``name`` is still running."""
+        with _abandoned_lock:
+            future = _abandoned.get(name)
+            if future is not None and future.done():
+                del _abandoned[name]
+                future = None
+        return future is not None
+
+    def scraper_timeout(self, name: str) -> Optional[float]:
+        """Wall-clock budget of the scraper ``name`` in seconds (None or 0: unlimited)."""
+        timeouts = current_app.config.get("SCRAPER_TIMEOUTS", {})
+        if name in timeouts:
+            return timeouts[name]
+        return current_app.config.get("SCRAPER_TIMEOUT", 180)
+
+    def _next_timeout_check(
+        self, running: List[BaseScraper], started: Dict[BaseScraper, Tuple[float, int]]
+    ) -> float:
+        """Seconds until the earliest budget of ``running`` expires (at most 1s)."""
+        now = time.monotonic()
+        wait_for = 1.0
+        for scraper in running:
+            budget = self.scraper_timeout(scraper.name)
+            if budget and scraper in started:
+                wait_for = min(wait_for, started[scraper][0] + budget - now)
+        return max(wait_for, 0.01)
+
+    def _cancel_scraper(self, scraper: BaseScraper, thread_id: int) -> None:
+        """Stop a scraper that ran out of time and kill the browser it is blocked on."""
+        self.logger.warning(f"  ⏱ Timeout: cancelling {scraper.name}")
+        scraper.cancel()
+        chrome = sys.modules.get("app.scrapers.chrome_driver_setup")
+        if chrome is not None:
+            chrome.kill_thread_drivers(thread_id)
+
+    def _timed_scrape(
+        self, scraper: BaseScraper, app=None, started=None
+    ) -> Tuple[Optional[List[dict]], Optional[Exception], float]:
+        """
+        Run a single scraper, capturing its result, error and duration.
+
+        When ``app`` is given the scraper runs inside its application context,
+        so settings lookups work from worker threads. The start time and
+        thread are recorded in ``started`` for the timeout check.
+        """
+        if app is not None:
+            with app.app_context():
+                return self._timed_scrape(scraper, started=started)
+
+        self.logger.info(f"\n▶ Running scraper for: {scraper.name}")
+        self.logger.info(f"  URL: {scraper.url}")
+
+        started_at = time.monotonic()
+        if started is not None:
+            started[scraper] = (started_at, threading.get_ident())
+        try:
+            menu_items = scraper.scrape()
+            return menu_items, None, time.monotonic() - started_at
+        except Exception as e:
+            return None, e, time.monotonic() - started_at
+
     def run_single_scraper(self, restaurant_name: str) -> dict:
         """
         Run a single scraper by restaurant name.
@@ -153,34 +524,53 @@ class ScrapingService:
         self.logger.info(f"Running single scraper for: {restaurant_name}")
 
         # Find the scraper
-        scraper = None
-        for s in self.scrapers:
+        spec = None
+        for s in self.specs:
             if s.name.lower() == restaurant_name.lower():
-                scraper = s
+                spec = s
                 break
 
-        if not scraper:
+        if not spec:
             self.logger.error(f"No scraper found for restaurant: {restaurant_name}")
             return {
                 "success": False,
                 "error": f"No scraper configured for {restaurant_name}",
             }
 
+        lock = ProcessLock(current_app.config["SCRAPE_LOCK_FILE"])
+        if not lock.acquire():
+            self.logger.info("Another scrape is already running; skipping this one")
+            return {
+                "success": False,
+                "skipped": True,
+                "error": "Another scrape is already running",
+                "restaurant": restaurant_name,
+            }
+
         # Run the scraper
         try:
-            menu_items = scraper.scrape()
+            scraper = spec.create()
+            self._prime_scrapers([scraper])
+            # On a worker thread, so the scraper's time budget applies
+            for _, menu_items, error, _ in self._iter_scraper_results([scraper], 1):
+                if error is not None:
+                    raise error
             if menu_items:
-                scraper.save_to_db(menu_items)
+                counts = scraper.save_to_db(menu_items)
+                changed = counts["inserted"] or counts["updated"] or counts["deleted"]
                 self.logger.info(
                     f"Successfully scraped {len(menu_items)} items for {restaurant_name}"
                 )
 
                 # Notify clients
-                self.notify_clients_of_update()
+                if changed:
+                    self.notify_clients_of_update()
 
                 return {
                     "success": True,
                     "items_count": len(menu_items),
+                    "unchanged": not changed,
+                    "rows": counts,
                     "restaurant": restaurant_name,
                 }
             else:
@@ -190,10 +580,23 @@ class ScrapingService:
                     "restaurant": restaurant_name,
                 }
 
+        except SourceUnchanged as e:
+            scraper.mark_scraped()
+            self.logger.info(f"No changes for {restaurant_name}: {e}")
+            return {
+                "success": True,
+                "items_count": 0,
+                "unchanged": True,
+                "restaurant": restaurant_name,
+            }
+
         except Exception as e:
             self.logger.error(f"Error scraping {restaurant_name}: {e}", exc_info=True)
             return {"success": False, "error": str(e), "restaurant": restaurant_name}
 
+        finally:
+            lock.release()
+
     def notify_clients_of_update(self):
         """
         Notify all connected WebSocket clients about menu updates.
@@ -205,38 +608,7 @@ class ScrapingService:
             today = date.today()
 
             # Fetch updated menu data
-            restaurants = Restaurant.query.all()
-            menu_data = []
-
-            for restaurant in restaurants:
-                # Get today's menu items
-                items = (
-                    MenuItem.query.filter_by(
-                        restaurant_id=restaurant.id, menu_date=today
-                    )
-                    .order_by(MenuItem.category)
-                    .all()
-                )
-
-                # Format menu data
-                menu_data.append(
-                    {
-                        "name": restaurant.name,
-                        "last_updated": (
-                            restaurant.last_scraped.isoformat()
-                            if restaurant.last_scraped
-                            else None
-                        ),
-                        "items": [
-                            {
-                                "category": item.category,
-                                "description": item.description,
-                                "price": item.price or "",
-                            }
-                            for item in items
-                        ],
-                    }
-                )
+            menu_data = get_menu_snapshot(today).restaurants
 
             # Emit to all connected clients
             socketio.emit(
@@ -265,13 +637,19 @@ class ScrapingService:
         """
         status_list = []
 
-        for scraper in self.scrapers:
+        for spec in self.specs:
             # Get last scrape info from database
-            restaurant = Restaurant.query.filter_by(name=scraper.name).first()
+            restaurant = Restaurant.query.filter_by(name=spec.name).first()
+
+            # Without importing scrapers that have not run in this process
+            if spec.loaded:
+                url = spec.load().url
+            else:
+                url = restaurant.url if restaurant else None
 
             status = {
-                "name": scraper.name,
-                "url": scraper.url,
+                "name": spec.name,
+                "url": url,
                 "configured": True,
                 "last_scraped": None,
                 "items_count": 0,
@@ -309,8 +687,13 @@ class ScrapingService:
             deleted_count = MenuItem.query.filter(
                 MenuItem.menu_date < cutoff_date
             ).delete()
+            MenuFingerprint.query.filter(
+                MenuFingerprint.menu_date < cutoff_date
+            ).delete()
 
             db.session.commit()
+            if deleted_count:
+                invalidate_menu_snapshots()
 
             self.logger.info(
                 f"Cleaned up {deleted_count} menu items older than {cutoff_date}"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Benchmark the menu read path: the old per-restaurant queries (N+1) against
+the single joined query of app.services.menu_service.get_menu_payload().
+
+Fills a temporary SQLite database with a growing number of restaurants
+(8 items each for today, plus a week of history) and reports, for each size,
+the number of SQL statements and the average latency of building the payload.
+
+Usage:
+    python benchmark_menu_queries.py [repetitions]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models import MenuItem, Restaurant
+from app.services.menu_service import get_menu_payload
+
+RESTAURANT_COUNTS = (5, 20, 80, 320)
+ITEMS_PER_DAY = 8
+HISTORY_DAYS = 7
+
+
+def legacy_menu_payload(menu_date):
+    """The previous read path: one MenuItem query per restaurant."""
+    menu_data = []
+    for restaurant in Restaurant.query.all():
+        items = MenuItem.query.filter_by(
+            restaurant_id=restaurant.id,
+            menu_date=menu_date
+        ).all()
+        menu_data.append({
+            "id": restaurant.id,
+            "name": restaurant.name,
+            "url": restaurant.url,
+            "last_scraped": restaurant.last_scraped.isoformat() if restaurant.last_scraped else None,
+            "items": [
+                {
+                    "category": item.category,
+                    "description": item.description,
+                    "price": item.price if item.price else ""
+                }
+                for item in items
+            ]
+        })
+    return menu_data
+
+
+def fill(restaurant_count):
+    """Add restaurants until there are ``restaurant_count`` of them."""
+    today = date.today()
+    existing = Restaurant.query.count()
+    for n in range(existing, restaurant_count):
+        restaurant = Restaurant(name=f"Restaurant {n}", url=f"https://example.com/{n}")
+        db.session.add(restaurant)
+        db.session.flush()
+        db.session.add_all(
+            MenuItem(
+                restaurant_id=restaurant.id,
+                menu_date=today - timedelta(days=day),
+                position=position,
+                category="Main Dish",
+                description=f"Dish {position} of restaurant {n}",
+                price="€ 9,90",
+            )
+            for day in range(HISTORY_DAYS)
+            for position in range(ITEMS_PER_DAY)
+        )
+    db.session.commit()
+
+
+def measure(build, repetitions):
+    """Return (statements per call, average milliseconds per call)."""
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        db.session.expire_all()
+        build(date.today())
+        per_call = len(statements)
+
+        started = time.perf_counter()
+        for _ in range(repetitions):
+            db.session.expire_all()
+            build(date.today())
+        elapsed = (time.perf_counter() - started) / repetitions
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return per_call, elapsed * 1000
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = create_app()
+    with app.app_context():
+        print(f"{'restaurants':>11} | {'N+1 queries':>11} {'N+1 ms':>8} | "
+              f"{'joined queries':>14} {'joined ms':>9} | speedup")
+        print("-" * 72)
+        for restaurant_count in RESTAURANT_COUNTS:
+            fill(restaurant_count)
+            assert legacy_menu_payload(date.today()) == get_menu_payload(date.today())
+            legacy_queries, legacy_ms = measure(legacy_menu_payload, repetitions)
+            joined_queries, joined_ms = measure(get_menu_payload, repetitions)
+            print(f"{restaurant_count:>11} | {legacy_queries:>11} {legacy_ms:>8.2f} | "
+                  f"{joined_queries:>14} {joined_ms:>9.2f} | {legacy_ms / joined_ms:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Benchmark OCR image preprocessing: the previous PIL chain of the Cyclist
+scraper (LANCZOS upscale of the RGB image, grayscale, SHARPEN, contrast,
+``point(lambda ...)`` threshold) against app.scrapers.ocr_preprocess.
+
+Renders a synthetic two-column menu page at a few sizes (optionally an image
+given on the command line instead) and reports the average milliseconds per
+image and how many pixels the two binarized outputs disagree on.
+
+Usage:
+    python benchmark_ocr_preprocess.py [repetitions] [image]
+"""
+import io
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
+
+from app.scrapers import ocr_preprocess
+
+PAGE_WIDTHS = (600, 900, 1400)
+DAYS = ('MONTAG', 'DIENSTAG', 'MITTWOCH', 'DONNERSTAG', 'FREITAG')
+
+
+def legacy_preprocess(image_data):
+    """The previous CyclistScraperImproved.preprocess_image_for_ocr."""
+    image = Image.open(io.BytesIO(image_data))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    width, height = image.size
+    if width < 1000:
+        scale_factor = 1500 / width
+        image = image.resize((int(width * scale_factor), int(height * scale_factor)),
+                             Image.Resampling.LANCZOS)
+    image = image.convert('L')
+    image = image.filter(ImageFilter.SHARPEN)
+    image = ImageEnhance.Contrast(image).enhance(2.0)
+    threshold = 128
+    return image.point(lambda p: p > threshold and 255)
+
+
+def menu_page(width):
+    """PNG bytes of a menu-like page: day headers and two columns of dishes."""
+    height = int(width * 1.4)
+    image = Image.new('RGB', (width, height), (250, 246, 236))
+    draw = ImageDraw.Draw(image)
+    y = 20
+    for day in DAYS:
+        draw.text((20, y), day, fill=(30, 30, 30))
+        draw.text((width // 2, y), day, fill=(30, 30, 30))
+        for line in range(3):
+            y += 18
+            draw.text((20, y), f"Gericht {line} mit Beilage  12,90", fill=(60, 40, 40))
+            draw.text((width // 2, y), f"Vegetarisch {line}  11,50", fill=(60, 40, 40))
+        y += 40
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def measure(preprocess, image_data, repetitions):
+    """Return (output image, average milliseconds per call)."""
+    result = preprocess(image_data)
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        preprocess(image_data)
+    return result, (time.perf_counter() - started) / repetitions * 1000
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'rb') as f:
+            pages = [(sys.argv[2], f.read())]
+    else:
+        pages = [(f"{width}px page", menu_page(width)) for width in PAGE_WIDTHS]
+
+    # Same steps as the legacy chain, to compare like with like
+    pipeline = ocr_preprocess.Preprocessing('benchmark', min_width=1000, target_width=1500,
+                                            sharpen=True, contrast=2.0, threshold=128)
+    recipes = [('pipeline', pipeline), ('+deskew', ocr_preprocess.MENU)]
+
+    print(f"{'image':>14} | {'PIL chain ms':>12} | " +
+          " | ".join(f"{name + ' ms':>12} {'diff':>6} speedup" for name, _ in recipes))
+    print("-" * (32 + 31 * len(recipes)))
+    for label, image_data in pages:
+        legacy, legacy_ms = measure(legacy_preprocess, image_data, repetitions)
+        columns = []
+        for name, recipe in recipes:
+            output, ms = measure(recipe, image_data, repetitions)
+            if output.size == legacy.size:
+                diff = f"{np.mean(np.asarray(output) != np.asarray(legacy)):.1%}"
+            else:
+                diff = 'size'
+            columns.append(f"{ms:>12.1f} {diff:>6} {legacy_ms / ms:>6.1f}x")
+        print(f"{label:>14} | {legacy_ms:>12.1f} | " + " | ".join(columns))
+
+
+if __name__ == '__main__':
+    main()
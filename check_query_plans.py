@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Check that the hot MenuItem queries are served by an index.
+
+Runs EXPLAIN QUERY PLAN (SQLite) for the queries used by /api/menus, the
+Socket.IO connect handler and notify_clients_of_update (menu_query), get_scraper_status,
+save_to_db and cleanup_old_data, and fails if any of them scans menu_item.
+
+Usage:
+    python check_query_plans.py                 # fresh temporary database
+    DATABASE_URL=sqlite:///instance/app.db python check_query_plans.py
+"""
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
+if 'DATABASE_URL' not in os.environ:
+    _tmp_dir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp_dir, 'plans.db')}"
+
+from sqlalchemy import func
+
+from app import create_app, db
+from app.models import MenuFingerprint, MenuItem, Restaurant
+from app.services.menu_service import menu_query
+
+
+def hot_queries():
+    """The (name, query) pairs to check, mirroring the application code."""
+    today = date.today()
+    dates = [today, today + timedelta(days=1)]
+    return [
+        ("menus of all restaurants for a day (api/connect/notify)",
+         menu_query(today)),
+        ("today's item count (get_scraper_status)",
+         MenuItem.query.filter_by(restaurant_id=1, menu_date=today).with_entities(func.count())),
+        ("stored rows per day (save_to_db)",
+         db.session.query(MenuItem.menu_date, func.count(MenuItem.id))
+         .filter(MenuItem.restaurant_id == 1, MenuItem.menu_date.in_(dates))
+         .group_by(MenuItem.menu_date)),
+        ("rows of changed days (save_to_db)",
+         MenuItem.query.filter(MenuItem.restaurant_id == 1, MenuItem.menu_date.in_(dates))),
+        ("fingerprints (save_to_db)",
+         MenuFingerprint.query.filter(MenuFingerprint.restaurant_id == 1,
+                                      MenuFingerprint.menu_date.in_(dates))),
+        ("restaurants with today's menu (scraping service)",
+         db.session.query(Restaurant.name).join(MenuItem)
+         .filter(MenuItem.menu_date == today).distinct()),
+        ("old rows (cleanup_old_data)",
+         MenuItem.query.filter(MenuItem.menu_date < today - timedelta(days=7))),
+    ]
+
+
+def explain(query):
+    """Return the EXPLAIN QUERY PLAN detail lines of an ORM query."""
+    compiled = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    # SQLite uses positional parameters
+    params = tuple(
+        value.isoformat() if isinstance(value, date) else value
+        for value in (compiled.params[key] for key in compiled.positiontup)
+    )
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return [row[-1] for row in rows]
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print(f"❌ Query plan check only supports SQLite, not {db.engine.dialect.name}")
+            return 1
+
+        failures = 0
+        for name, query in hot_queries():
+            plan = explain(query)
+            table_scan = any(line.startswith('SCAN menu_item') for line in plan)
+            uses_index = any('INDEX' in line for line in plan)
+            ok = uses_index and not table_scan
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} {name}")
+            for line in plan:
+                print(f"     {line}")
+
+        print()
+        if failures:
+            print(f"❌ {failures} hot queries do not use an index")
+            return 1
+        print("✅ All hot queries use an index")
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
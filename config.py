@@ -36,11 +36,138 @@ class Config:
     # CORS Configuration
     CORS_ORIGINS = []
     
+    # Scrapers in run order: (restaurant name, "module:class"). Modules are only
+    # imported when a scraper first runs; MEALPLAN_OUTLETS are appended after these
+    SCRAPERS = [
+        ('Henry BDO', 'app.scrapers.henry_scraper:HenryScraper'),
+        ('IKI Restaurant', 'app.scrapers.iki_scraper:IKIScraper'),
+        ('Campus Bräu', 'app.scrapers.campusbraeu_scraper:CampusBrauScraper'),
+        ('Albanco', 'app.scrapers.albanco_scraper:AlbancoScraper'),
+        ('Cyclist', 'app.scrapers.cyclist_scraper_improved:CyclistScraperImproved'),
+        # Add more scrapers here as they are developed
+    ]
+    # Comma-separated restaurant names to skip, e.g. SCRAPERS_DISABLED="Cyclist,4oh4"
+    SCRAPERS_DISABLED = [
+        name.strip() for name in os.environ.get('SCRAPERS_DISABLED', '').split(',') if name.strip()
+    ]
+
     # Scraping Configuration
     SCRAPING_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    SCRAPING_TIMEOUT = 30
+    SCRAPING_TIMEOUT = 30  # read timeout (seconds)
+    SCRAPING_CONNECT_TIMEOUT = 5
+    # Hosts kept in the shared HTTP session's keep-alive connection pool
+    HTTP_POOL_HOSTS = 16
     SCRAPING_RETRY_COUNT = 3
     SCRAPING_RETRY_DELAY = 5
+    # Retries back off exponentially (with jitter) from SCRAPING_RETRY_DELAY up to
+    # this many seconds; Retry-After answers asking for longer are not retried
+    SCRAPING_RETRY_MAX_DELAY = 60
+    # Seconds of retry waiting each host may use per scraping run
+    SCRAPING_RETRY_HOST_BUDGET = 60
+
+    # Run scrapers in parallel; DB writes stay serialized in the calling thread
+    SCRAPING_CONCURRENT = True
+    SCRAPING_MAX_WORKERS = int(os.environ.get('SCRAPING_MAX_WORKERS', 4))
+
+    # Shared headless Chrome pool used by the Selenium scrapers
+    CHROME_POOL_SIZE = int(os.environ.get('CHROME_POOL_SIZE', 1))
+    CHROME_POOL_MAX_USES = 20
+    CHROME_POOL_MAX_MEMORY_MB = int(os.environ.get('CHROME_POOL_MAX_MEMORY_MB', 600))
+    # Seconds a scraper waits for a free browser; keep well below SCRAPER_TIMEOUT
+    CHROME_POOL_ACQUIRE_TIMEOUT = int(os.environ.get('CHROME_POOL_ACQUIRE_TIMEOUT', 60))
+
+    # Wall-clock budget per scraper (seconds); a scraper still running after it
+    # is cancelled and its browser killed, the other results are still saved.
+    # Keep well below the systemd job's TimeoutStartSec=600.
+    SCRAPER_TIMEOUT = int(os.environ.get('SCRAPER_TIMEOUT', 180))
+    # Per-restaurant overrides, e.g. {'Cyclist': 300}
+    SCRAPER_TIMEOUTS = {}
+
+    # Upper bound for waiting on a page's readiness condition (seconds)
+    SCRAPING_READY_TIMEOUT = 15
+
+    # Worker processes for the Tesseract passes of the image scrapers
+    # (None: one per core, at most 4; 0 or 1: run in the scraper's thread)
+    OCR_PROCESSES = int(os.environ['OCR_PROCESSES']) if os.environ.get('OCR_PROCESSES') else None
+    OCR_LANG = 'deu+eng'
+    OCR_TASK_TIMEOUT = 120
+    # multiprocessing start method ('forkserver', 'spawn'; None is the platform
+    # default, fork on Linux, which is unsafe in the threaded scraping process)
+    OCR_START_METHOD = 'forkserver'
+    # 'tesserocr' (in-process, models loaded once), 'pytesseract' (tesseract CLI)
+    # or 'auto' (tesserocr if installed)
+    OCR_BACKEND = os.environ.get('OCR_BACKEND', 'auto')
+    # Directory with the .traineddata files for tesserocr (unset: its default)
+    OCR_TESSDATA_PATH = os.environ.get('OCR_TESSDATA_PATH')
+    # OCR results by image content hash and Tesseract configuration (the menu
+    # images change weekly)
+    OCR_CACHE_ENABLED = True
+    OCR_CACHE_DIR = os.path.join(basedir, 'instance', 'ocr_cache')
+    OCR_CACHE_MAX_MB = int(os.environ.get('OCR_CACHE_MAX_MB', 50))
+    # Directory for PNG dumps of the preprocessed OCR images (unset: no dumps)
+    OCR_DEBUG_DIR = os.environ.get('OCR_DEBUG_DIR')
+
+    # On-disk cache for scraper downloads, revalidated with ETag/Last-Modified
+    HTTP_CACHE_ENABLED = True
+    HTTP_CACHE_DIR = os.path.join(basedir, 'instance', 'http_cache')
+    HTTP_CACHE_MAX_MB = int(os.environ.get('HTTP_CACHE_MAX_MB', 200))
+
+    # Text extracted from menu PDFs, by PDF content hash. Extraction runs in a
+    # short-lived child process so its memory is released afterwards
+    PDF_CACHE_ENABLED = True
+    PDF_CACHE_DIR = os.path.join(basedir, 'instance', 'pdf_cache')
+    PDF_CACHE_MAX_MB = 20
+    PDF_EXTRACT_IN_CHILD = True
+    PDF_EXTRACT_TIMEOUT = 60
+    # multiprocessing start method ('forkserver', 'spawn'; None is the platform
+    # default, fork on Linux, which is unsafe in the threaded scraping process)
+    PDF_START_METHOD = 'forkserver'
+    # Pages read from IKI's menu PDF; None reads them all (dishes on pages past
+    # a limit would be lost, and a warning is logged when pages are skipped)
+    PDF_MAX_PAGES = None
+    # Menu PDFs are streamed to a temporary file in DOWNLOAD_TMP_DIR (on disk,
+    # not a RAM-backed /tmp); larger ones are rejected
+    PDF_MAX_MB = int(os.environ.get('PDF_MAX_MB', 20))
+    DOWNLOAD_TMP_DIR = os.path.join(basedir, 'instance', 'downloads')
+
+    # Touched whenever menu data changes; invalidates the /api/menus snapshots
+    MENU_SNAPSHOT_STAMP = os.path.join(basedir, 'instance', 'menu_snapshot.stamp')
+
+    # File locks shared by all processes of a deployment (gunicorn workers,
+    # manual scripts, the lunch-scraper systemd job): the holder of the first one
+    # runs the scheduler, the second one is held while a scrape is running
+    # One-off scripts (manual_scrape*.py, the systemd job) set SCHEDULER_ENABLED=0
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', '1') != '0'
+    SCHEDULER_LOCK_FILE = os.path.join(basedir, 'instance', 'scheduler.lock')
+    # Seconds between attempts of the other processes to take over the
+    # scheduler lock when its holder has exited (e.g. a recycled worker)
+    SCHEDULER_LEADER_RETRY = int(os.environ.get('SCHEDULER_LEADER_RETRY', 60))
+    SCRAPE_LOCK_FILE = os.path.join(basedir, 'instance', 'scrape.lock')
+
+    # The startup scrape is skipped when every restaurant was scraped today
+    # within this many seconds
+    STARTUP_SCRAPE_MAX_AGE = int(os.environ.get('STARTUP_SCRAPE_MAX_AGE', 6 * 3600))
+
+    # Daily scheduled scrape (local time)
+    SCRAPE_SCHEDULE_HOUR = 5
+    SCRAPE_SCHEDULE_MINUTE = 0
+
+    # /api/menus: Cache-Control max-age runs until the next scheduled scrape, capped
+    # here because the hourly timer and manual refreshes can change menus earlier
+    MENU_CACHE_MAX_AGE = int(os.environ.get('MENU_CACHE_MAX_AGE', 3600))
+    # Smaller responses are sent uncompressed
+    MENU_COMPRESS_MIN_BYTES = 1024
+
+    # Outlets of the erstecampus.at mealplan platform, fetched together in one pass:
+    # (restaurant name, page slug under MEALPLAN_BASE_URL or full page URL, website)
+    MEALPLAN_BASE_URL = 'https://erstecampus.at/mealplan/2025/external/single/'
+    MEALPLAN_OUTLETS = [
+        ('Erste Campus', 'kantine-en', 'https://erstecampus.at/mealplan/2025/external/single/kantine-en.html'),
+        ('4oh4', 'https://4oh4.at/mealplan/2025/external/single/4oh4.html', 'https://4oh4.at/lunch-menu/'),
+        ('Café George', 'george-en', 'https://cafegeorge.at/en/weekly-menu-en/'),
+    ]
+    # Outlets without daily changing menus on weekends
+    MEALPLAN_WEEKDAYS_ONLY = ['Café George']
 
 
 class DevelopmentConfig(Config):
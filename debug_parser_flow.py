@@ -5,8 +5,8 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from app.scrapers.erste_campus_scraper import ErsteCampusScraper
 from app.scrapers.chrome_driver_setup import get_chrome_driver
+from app.scrapers.mealplan import TEXT_CATEGORY_LABELS, _is_allergen_line
 from selenium.webdriver.common.by import By
 import time
 import re
@@ -23,9 +23,6 @@ def debug_parser_flow():
         body_text = driver.find_element(By.TAG_NAME, "body").text
         lines = [line.strip() for line in body_text.split('\n') if line.strip()]
         
-        # Create scraper instance to use its methods
-        scraper = ErsteCampusScraper()
-        
         print("=== SIMULATING PARSER FLOW ===\n")
         
         i = 0
@@ -35,7 +32,7 @@ def debug_parser_flow():
             line = lines[i]
             
             if line in ['SOUP', 'MAIN DISH', 'DESSERTS', 'SALAD']:
-                category = scraper._normalize_category(line)
+                category = TEXT_CATEGORY_LABELS[line]
                 print(f"\n>>> Found category '{category}' at line {i}")
                 i += 1
                 
@@ -53,11 +50,11 @@ def debug_parser_flow():
                             print(f"         -> Hit next category, breaking")
                             description_complete = True
                             break
-                        elif scraper._is_allergen_line(current_line):
+                        elif _is_allergen_line(current_line):
                             print(f"         -> Allergen line detected")
                             description_complete = True
                             # Skip all consecutive allergen lines
-                            while i < len(lines) and scraper._is_allergen_line(lines[i]):
+                            while i < len(lines) and _is_allergen_line(lines[i]):
                                 print(f"         -> Skipping allergen: {lines[i]}")
                                 i += 1
                             # After allergen lines, check if next line is a price
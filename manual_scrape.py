@@ -5,6 +5,9 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
 from app.services.scraping_service import ScrapingService
 from app import create_app
 
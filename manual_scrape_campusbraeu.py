@@ -3,6 +3,11 @@
 Manual scrape script for Campus Bräu only
 """
 
+import os
+
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
 from app.services.scraping_service import ScrapingService
 from app import create_app
 
@@ -1,4 +1,9 @@
 #!/usr/bin/env python
+import os
+
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
 from app import create_app
 from app.services.scraping_service import ScrapingService
 
@@ -7,5 +12,7 @@ with app.app_context():
     print("Starting manual scrape for today's menus...")
     scraping_service = ScrapingService()
     results = scraping_service.run_all_scrapers()
+    if results.get("skipped"):
+        print("Another scrape is already running; nothing to do.")
     print("\nScraping completed!")
     print(f"Results: {results}")
\ No newline at end of file
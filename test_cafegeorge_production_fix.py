@@ -4,7 +4,7 @@ Test to verify CafeGeorge scraper correctly handles weekends vs weekdays.
 This addresses the production issue where menu was shown on weekends.
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from unittest.mock import patch
 import sys
 
@@ -12,6 +12,7 @@ import sys
 sys.path.insert(0, '/home/nuc8/tmp/lunch_app')
 
 from app.scrapers.cafegeorge_scraper import CafeGeorgeScraper
+from app.scrapers.mealplan import MealplanEngine
 
 def test_all_days():
     """Test scraper behavior for each day of the week."""
@@ -27,16 +28,20 @@ def test_all_days():
         test_date = base_date + timedelta(days=days_offset)
         day_name = test_date.strftime("%A")
         
-        with patch('app.scrapers.cafegeorge_scraper.datetime') as mock_datetime:
+        # The weekday check uses date.today() in the mealplan module; the
+        # engine is mocked so that weekdays fail instead of fetching the page
+        with patch('app.scrapers.mealplan.date') as mock_date, \
+                patch.object(MealplanEngine, 'collect',
+                             side_effect=Exception("fetch mocked - scraping attempted")):
             # Configure the mock to return our test date
-            mock_datetime.now.return_value = test_date
-            mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
+            mock_date.today.return_value = test_date.date()
+            mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
             
             try:
                 items = scraper.extract_menu_items()
                 
                 # Expected behavior:
-                # Mon-Fri (0-4): Should attempt to scrape (would fail without browser)
+                # Mon-Fri (0-4): Should attempt to scrape (fails with the mocked fetch)
                 # Sat-Sun (5-6): Should return empty list immediately
                 
                 weekday_num = test_date.weekday()
@@ -48,19 +53,19 @@ def test_all_days():
                     else:
                         status = f"✗ FAIL - Returned {len(items)} items (should be 0)"
                 else:
-                    # On weekdays, it should try to scrape (will fail without browser)
+                    # On weekdays, it should try to scrape (fails with the mocked fetch)
                     status = "✗ FAIL - Did not attempt scraping"
                     
             except Exception as e:
-                # On weekdays, we expect failure due to no browser in test
+                # On weekdays, we expect the mocked fetch to fail
                 weekday_num = test_date.weekday()
                 is_weekend = weekday_num >= 5
                 
                 if is_weekend:
                     status = f"✗ FAIL - Error on weekend: {str(e)[:50]}"
                 else:
-                    if "get_chrome_driver" in str(e) or "driver" in str(e).lower():
-                        status = "✓ PASS - Attempts to scrape (browser init)"
+                    if "fetch mocked" in str(e):
+                        status = "✓ PASS - Attempts to scrape"
                     else:
                         status = f"? UNKNOWN - {str(e)[:50]}"
             
@@ -68,7 +73,7 @@ def test_all_days():
     
     print("=" * 60)
     print("\nSummary:")
-    print("- Monday-Friday: Scraper attempts to fetch menu (needs browser)")
+    print("- Monday-Friday: Scraper attempts to fetch menu")
     print("- Saturday-Sunday: Returns empty list (no menu available)")
     print("\nThis matches the Cafe George website which shows menu only Mon-Fri")
 
@@ -19,7 +19,7 @@ def test_cafegeorge_scraper():
         print(f"Scraper URL: {scraper.url}")
         
         print("\n=== Extracting menu items ===")
-        menu_items = scraper.extract_menu_items()
+        menu_items = scraper.scrape()
         
         print(f"✓ Extracted {len(menu_items)} menu items")
         
@@ -43,10 +43,6 @@ def test_cafegeorge_scraper():
                         desc = desc[:57] + "..."
                     print(f"  - {desc:<60} {item['price']}")
         
-        print("\n=== Testing full scraper ===")
-        all_items = scraper.scrape()
-        print(f"✓ Full scraper returned {len(all_items)} items")
-        
     except Exception as e:
         print(f"✗ Error: {e}")
         import traceback
@@ -3,48 +3,58 @@
 Test script to verify CafeGeorge scraper handles weekends correctly.
 """
 
-from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from datetime import date
+from unittest.mock import patch
 from app.scrapers.cafegeorge_scraper import CafeGeorgeScraper
+from app.scrapers.mealplan import MealplanEngine
+
+
+def on_day(day):
+    """Patch date.today() of the mealplan module (used for the weekday check)."""
+    patcher = patch('app.scrapers.mealplan.date')
+    mock_date = patcher.start()
+    mock_date.today.return_value = day
+    mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
+    return patcher
 
 def test_weekend_detection():
     scraper = CafeGeorgeScraper()
     
     # Test for Saturday
-    saturday = datetime(2025, 8, 23)  # Saturday
-    with patch('app.scrapers.cafegeorge_scraper.datetime') as mock_datetime:
-        mock_datetime.now.return_value = saturday
-        mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
-        
+    saturday = date(2025, 8, 23)  # Saturday
+    patcher = on_day(saturday)
+    try:
         items = scraper.extract_menu_items()
         print(f"Saturday ({saturday.strftime('%Y-%m-%d')}): {len(items)} items - {'✓ PASS' if len(items) == 0 else '✗ FAIL'}")
+    finally:
+        patcher.stop()
     
     # Test for Sunday  
-    sunday = datetime(2025, 8, 24)  # Sunday
-    with patch('app.scrapers.cafegeorge_scraper.datetime') as mock_datetime:
-        mock_datetime.now.return_value = sunday
-        mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
-        
+    sunday = date(2025, 8, 24)  # Sunday
+    patcher = on_day(sunday)
+    try:
         items = scraper.extract_menu_items()
         print(f"Sunday ({sunday.strftime('%Y-%m-%d')}): {len(items)} items - {'✓ PASS' if len(items) == 0 else '✗ FAIL'}")
+    finally:
+        patcher.stop()
     
     # Test for Monday (should attempt to scrape)
-    monday = datetime(2025, 8, 25)  # Monday
-    with patch('app.scrapers.cafegeorge_scraper.datetime') as mock_datetime:
-        mock_datetime.now.return_value = monday
-        mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
-        
-        # Mock the driver to avoid actual scraping
-        with patch('app.scrapers.cafegeorge_scraper.get_chrome_driver') as mock_driver:
-            mock_driver.side_effect = Exception("Driver mocked - weekday scraping would be attempted")
+    monday = date(2025, 8, 25)  # Monday
+    patcher = on_day(monday)
+    try:
+        # Mock the mealplan fetch to avoid actual scraping
+        with patch.object(MealplanEngine, 'collect') as mock_collect:
+            mock_collect.side_effect = Exception("Fetch mocked - weekday scraping would be attempted")
             try:
                 items = scraper.extract_menu_items()
                 print(f"Monday ({monday.strftime('%Y-%m-%d')}): Scraping attempted - ✗ FAIL (should try to scrape)")
             except Exception as e:
-                if "Driver mocked" in str(e):
+                if "Fetch mocked" in str(e):
                     print(f"Monday ({monday.strftime('%Y-%m-%d')}): Scraping attempted - ✓ PASS")
                 else:
                     print(f"Monday ({monday.strftime('%Y-%m-%d')}): Unexpected error - ✗ FAIL")
+    finally:
+        patcher.stop()
     
     print("\nWeekend detection test completed!")
     print("The scraper correctly returns empty list for Saturday and Sunday,")
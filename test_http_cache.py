@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk cache (app/scrapers/disk_cache.py) and the conditional-GET
+HTTP cache (app/scrapers/http_cache.py) against a throwaway HTTP server on
+127.0.0.1, with the cache in a temporary directory.
+
+Usage:
+    python test_http_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config import Config
+
+# Keep spooled downloads out of instance/
+Config.DOWNLOAD_TMP_DIR = tempfile.mkdtemp()
+
+from app.scrapers.disk_cache import DiskCacheStore
+from app.scrapers.http_cache import DownloadRejected, HttpCache
+
+PDF_BODY = b'%PDF-1.4\n' + b'0' * 5000
+LAST_MODIFIED = 'Mon, 06 Oct 2025 08:00:00 GMT'
+
+
+class MenuServer(BaseHTTPRequestHandler):
+    """Serves a few fixed documents; ``/menu`` and ``/menu.pdf`` honour validators."""
+
+    version = {'/menu': 'v1'}
+    hits = []
+
+    def do_GET(self):
+        MenuServer.hits.append((self.path, self.headers.get('If-None-Match'),
+                                self.headers.get('If-Modified-Since')))
+        if self.path == '/menu':
+            etag = f'"{MenuServer.version["/menu"]}"'
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'', {'ETag': etag})
+            body = f"Tagesmenü {MenuServer.version['/menu']}".encode('utf-8')
+            return self._send(200, body, {'ETag': etag,
+                                          'Content-Type': 'text/html; charset=utf-8'})
+        if self.path == '/dated':
+            if self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+                return self._send(304, b'', {})
+            return self._send(200, b'Wochenkarte', {'Last-Modified': LAST_MODIFIED})
+        if self.path == '/plain':
+            return self._send(200, b'no validators', {})
+        if self.path == '/menu.pdf':
+            if self.headers.get('If-None-Match') == '"pdf1"':
+                return self._send(304, b'', {'ETag': '"pdf1"'})
+            return self._send(200, PDF_BODY, {'ETag': '"pdf1"',
+                                              'Content-Type': 'application/pdf'})
+        if self.path == '/page.html':
+            return self._send(200, b'<html></html>', {'Content-Type': 'text/html'})
+        self._send(404, b'', {})
+
+    def _send(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+_server = None
+
+
+def server_url():
+    """Base URL of the test server, started on first use (it dies with the process)."""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer(('127.0.0.1', 0), MenuServer)
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{_server.server_address[1]}"
+
+
+def test_disk_cache_eviction():
+    print("DiskCacheStore:")
+    directory = tempfile.mkdtemp()
+    probe = DiskCacheStore(tempfile.mkdtemp(), 10 ** 6)
+    probe.put('a', b'x' * 100, {'n': 1})
+    entry_size = os.path.getsize(probe._path('a'))
+
+    store = DiskCacheStore(directory, 3 * entry_size)
+    now = time.time()
+    for age, key in enumerate(['c', 'b', 'a'], start=1):
+        store.put(key, key.encode() * 100, {'n': age})
+        # Entries older by the minute: a is the oldest, then b
+        os.utime(store._path(key), (now - 60 * age, now - 60 * age))
+
+    body, meta = store.get('a')
+    check(body == b'a' * 100 and meta['n'] == 3 and meta['key'] == 'a',
+          "get() returns the body and metadata (and marks the entry as used)")
+    store.put('d', b'd' * 100)
+    check(store.get('b') is None, "the least recently used entry is evicted")
+    check(all(store.get(key) for key in 'acd'), "recently used entries are kept")
+
+    store.put('huge', b'h' * (4 * entry_size))
+    check(store.get('huge') is None and all(store.get(key) for key in 'acd'),
+          "a body larger than the cache is not stored and evicts nothing")
+
+    f, meta = store.open('c')
+    with f:
+        check(f.read() == b'c' * 100, "open() is positioned at the body")
+    store.delete('c')
+    check(store.get('c') is None and store.open('c') is None, "delete() removes the entry")
+
+
+def test_conditional_get():
+    print("Conditional GET:")
+    base_url = server_url()
+    cache = HttpCache(DiskCacheStore(tempfile.mkdtemp(), 10 ** 6))
+    MenuServer.hits.clear()
+
+    first = cache.get(f"{base_url}/menu")
+    check(first.status_code == 200 and not first.from_cache and first.text == "Tagesmenü v1",
+          "the first request fetches the body")
+    second = cache.get(f"{base_url}/menu")
+    check(MenuServer.hits[-1][1] == '"v1"', "the next request sends If-None-Match")
+    check(second.not_modified and second.from_cache and second.content == first.content,
+          "a 304 returns the cached body with not_modified set")
+    check(second.headers.get('Content-Type', '').startswith('text/html'),
+          "the cached response keeps its Content-Type")
+
+    MenuServer.version['/menu'] = 'v2'
+    third = cache.get(f"{base_url}/menu")
+    check(not third.not_modified and third.text == "Tagesmenü v2", "a changed page is fetched again")
+    check(cache.get(f"{base_url}/menu").text == "Tagesmenü v2", "and replaces the cached copy")
+
+    cache.get(f"{base_url}/dated")
+    dated = cache.get(f"{base_url}/dated")
+    check(MenuServer.hits[-1][2] == LAST_MODIFIED and dated.not_modified,
+          "Last-Modified is revalidated with If-Modified-Since")
+
+    cache.get(f"{base_url}/plain")
+    plain = cache.get(f"{base_url}/plain")
+    check(MenuServer.hits[-1][1:] == (None, None) and not plain.from_cache,
+          "responses without validators are not cached")
+
+    missing = cache.get(f"{base_url}/missing")
+    check(missing.status_code == 404 and not missing.from_cache, "errors are passed through")
+
+
+def test_download():
+    print("Streamed downloads:")
+    base_url = server_url()
+    cache = HttpCache(DiskCacheStore(tempfile.mkdtemp(), 10 ** 6))
+    options = dict(max_bytes=10 ** 5, content_types=['application/pdf'], magic=b'%PDF-')
+
+    with cache.download(f"{base_url}/menu.pdf", **options) as download:
+        check(download.status_code == 200 and download.size == len(PDF_BODY),
+              f"the PDF is spooled to a file ({download.size} bytes)")
+        check(download.file.read() == PDF_BODY, "the file holds the body")
+    with cache.download(f"{base_url}/menu.pdf", **options) as download:
+        check(download.not_modified and download.file.read() == PDF_BODY,
+              "a 304 spools the cached copy")
+
+    # A fresh cache, so that nothing is answered from a cached copy
+    cache = HttpCache(DiskCacheStore(tempfile.mkdtemp(), 10 ** 6))
+    for path, limits, reason in [
+        ('/menu.pdf', dict(options, max_bytes=1000), "a body over max_bytes"),
+        ('/page.html', options, "an unexpected Content-Type"),
+        ('/page.html', dict(options, content_types=None), "a body without the magic bytes"),
+    ]:
+        try:
+            cache.download(f"{base_url}{path}", **limits).close()
+            rejected = False
+        except DownloadRejected:
+            rejected = True
+        check(rejected, f"{reason} is rejected")
+
+
+if __name__ == "__main__":
+    print("Testing the disk and HTTP caches...")
+    print("=" * 60)
+    test_disk_cache_eviction()
+    test_conditional_get()
+    test_download()
+    print("\n✅ All cache tests passed!")
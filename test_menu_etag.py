@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the ETag / 304 handling of /api/menus against a temporary SQLite
+database: the ETag covers the menu content only, so a scrape that finds
+the same menu keeps it (and clients get 304s), while a changed menu or a
+different content encoding gets a new one.
+
+Usage:
+    python test_menu_etag.py
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+
+from app import create_app
+from app.scrapers.base_scraper import BaseScraper
+from app.services.menu_service import invalidate_menu_snapshots
+
+MENU_DATE = date(2025, 10, 6)
+URL = f"/api/menus?date={MENU_DATE.isoformat()}"
+
+
+class FixtureScraper(BaseScraper):
+    """A scraper whose save_to_db is fed directly."""
+
+    def __init__(self):
+        super().__init__("Fixture Kantine", "https://kantine.test/")
+
+    def scrape(self):
+        return []
+
+
+def menu(*descriptions):
+    return [
+        {'menu_date': MENU_DATE, 'category': f"Menü {i}", 'description': description,
+         'price': '€ 9,90'}
+        for i, description in enumerate(descriptions, start=1)
+    ]
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+def test_menu_etag():
+    app = create_app()
+    app.config['MENU_SNAPSHOT_STAMP'] = os.path.join(tempfile.mkdtemp(), 'menu.stamp')
+    client = app.test_client()
+    scraper = FixtureScraper()
+    with app.app_context():
+        scraper.save_to_db(menu('Kürbisrisotto', 'Backhendl'))
+
+    print("Conditional requests:")
+    response = client.get(URL)
+    etag = response.headers.get('ETag', '')
+    data = json.loads(response.data)
+    check(response.status_code == 200 and etag.startswith('W/"'), f"200 with a weak ETag {etag}")
+    check([item['description'] for item in data['restaurants'][0]['items']] ==
+          ['Kürbisrisotto', 'Backhendl'], "the body holds the stored menu")
+    check('Accept-Encoding' in response.headers.get('Vary', ''), "the response varies by encoding")
+
+    response = client.get(URL, headers={'If-None-Match': etag})
+    check(response.status_code == 304 and not response.data, "a matching If-None-Match gets 304")
+    response = client.get(URL, headers={'If-None-Match': etag[2:]})
+    check(response.status_code == 304, "the strong form of the tag matches too")
+    response = client.get(URL, headers={'If-None-Match': 'W/"something-else"'})
+    check(response.status_code == 200, "another tag gets the body")
+
+    print("Scrapes:")
+    with app.app_context():
+        scraper.save_to_db(menu('Kürbisrisotto', 'Backhendl'))
+    response = client.get(URL, headers={'If-None-Match': etag})
+    check(response.status_code == 304, "a scrape that finds the same menu keeps the ETag")
+    with app.app_context():
+        invalidate_menu_snapshots()
+    response = client.get(URL, headers={'If-None-Match': etag})
+    check(response.status_code == 304, "a rebuilt snapshot (newer last_scraped) keeps it too")
+
+    with app.app_context():
+        scraper.save_to_db(menu('Kürbisrisotto', 'Zwiebelrostbraten'))
+    response = client.get(URL, headers={'If-None-Match': etag})
+    check(response.status_code == 200 and response.headers['ETag'] != etag,
+          "a changed menu gets a new ETag")
+    check(b'Zwiebelrostbraten' in response.data, "and the new body")
+    etag = response.headers['ETag']
+
+    print("Compression:")
+    app.config['MENU_COMPRESS_MIN_BYTES'] = 0
+    response = client.get(URL, headers={'Accept-Encoding': 'gzip'})
+    gzip_etag = response.headers['ETag']
+    check(response.headers.get('Content-Encoding') == 'gzip', "gzip is served when accepted")
+    check(json.loads(gzip.decompress(response.data))['date'] == MENU_DATE.isoformat(),
+          "the gzip body decompresses to the menu")
+    check(gzip_etag != etag, "the gzip variant has its own ETag")
+    response = client.get(URL, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    check(response.status_code == 304, "and is revalidated with it")
+    response = client.get(URL, headers={'If-None-Match': gzip_etag})
+    check(response.status_code == 200, "the gzip ETag does not match the plain body")
+
+    response = client.get("/api/menus?date=06.10.2025")
+    check(response.status_code == 400, "an invalid date is rejected")
+
+
+if __name__ == "__main__":
+    print("Testing the /api/menus ETags...")
+    print("=" * 60)
+    test_menu_etag()
+    print("\n✅ All ETag tests passed!")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the helpers that let the tesserocr backend stand in for pytesseract
+(app/scrapers/ocr_backend.py): parsing Tesseract command line configs and
+turning tesserocr's TSV output into pytesseract's DICT layout. Runs without
+Tesseract installed.
+
+Usage:
+    python test_ocr_backend.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.scrapers.ocr_backend import TSV_INT_FIELDS, data_from_tsv, parse_config
+from app.scrapers.ocr_engine import text_from_words, words_from_data
+
+# Page, block, paragraph and line rows carry no text and conf -1, as in Tesseract's output
+PAGE_DATA = {
+    'level':     [1, 2, 3, 4, 5, 5, 4, 5, 5, 5],
+    'page_num':  [1] * 10,
+    'block_num': [0, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+    'par_num':   [0, 0, 1, 1, 1, 1, 1, 1, 1, 1],
+    'line_num':  [0, 0, 0, 1, 1, 1, 2, 2, 2, 2],
+    'word_num':  [0, 0, 0, 0, 1, 2, 0, 1, 2, 3],
+    'left':      [0, 40, 40, 40, 40, 200, 40, 40, 180, 420],
+    'top':       [0, 100, 100, 100, 100, 102, 140, 140, 141, 140],
+    'width':     [1500, 600, 600, 300, 150, 140, 500, 130, 230, 60],
+    'height':    [2000, 80, 80, 30, 28, 26, 30, 28, 28, 28],
+    'conf':      [-1.0, -1.0, -1.0, -1.0, 96.5, 91.25, -1.0, 88.0, 90.0, 77.5],
+    'text':      ['', '', '', '', 'MONTAG', '13.10.', '', 'Kürbis', 'Cremesuppe', '4,50'],
+}
+
+
+def to_tsv(data):
+    """Tesseract's TSV layout (tesserocr's GetTSVText has no header row)."""
+    fields = TSV_INT_FIELDS + ('conf', 'text')
+    rows = zip(*(data[field] for field in fields))
+    return '\n'.join('\t'.join(str(value) for value in row) for row in rows) + '\n'
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+def test_parse_config():
+    print("Tesseract configs:")
+    check(parse_config('') == (3, 3, {}), "defaults: --oem 3 --psm 3")
+    check(parse_config('--oem 1 --psm 6') == (1, 6, {}), "--oem and --psm")
+    check(parse_config(r'--oem 3 --psm 4 -c preserve_interword_spaces=1') ==
+          (3, 4, {'preserve_interword_spaces': '1'}), "-c variables")
+    check(parse_config("--psm 6 -c tessedit_char_whitelist='0123456789,€ '") ==
+          (3, 6, {'tessedit_char_whitelist': '0123456789,€ '}), "quoted values keep their spaces")
+    check(parse_config('-l deu --psm 11 --dpi 300') == (3, 11, {}), "unknown options are skipped")
+
+    # The configs the Cyclist scrapers use, plus a variable, survive a round trip
+    for config in ['--oem 3 --psm 6', '--oem 3 --psm 11', '--oem 3 --psm 3',
+                   '--oem 1 --psm 6 -c preserve_interword_spaces=1']:
+        oem, psm, variables = parse_config(config)
+        rebuilt = f"--oem {oem} --psm {psm}" + ''.join(
+            f" -c {name}={value}" for name, value in variables.items())
+        check(parse_config(rebuilt) == (oem, psm, variables) and rebuilt == config,
+              f"{config!r} round-trips")
+
+
+def test_data_from_tsv():
+    print("TSV output:")
+    data = data_from_tsv(to_tsv(PAGE_DATA))
+    check(data == PAGE_DATA, "TSV parses back into the DICT layout")
+    check(all(isinstance(value, int) for field in TSV_INT_FIELDS for value in data[field]),
+          "box and level fields are ints")
+    check(data['conf'][5] == 91.25, "confidences are floats")
+
+    noisy = to_tsv(PAGE_DATA) + '\n\ntruncated\trow\n'
+    check(data_from_tsv(noisy) == PAGE_DATA, "blank and short rows are skipped")
+    check(data_from_tsv('') == {field: [] for field in TSV_INT_FIELDS + ('conf', 'text')},
+          "empty output gives empty columns")
+
+    words = words_from_data(data)
+    check([word['text'] for word in words] == ['MONTAG', '13.10.', 'Kürbis', 'Cremesuppe', '4,50'],
+          "only the words are kept")
+    check(words[2]['left'] == 40 and words[2]['line_num'] == 2, "with their boxes and lines")
+    check(text_from_words(words) == "MONTAG 13.10.\nKürbis Cremesuppe 4,50",
+          "and rebuild the page text line by line")
+
+
+if __name__ == "__main__":
+    print("Testing the OCR backend helpers...")
+    print("=" * 60)
+    test_parse_config()
+    test_data_from_tsv()
+    print("\n✅ All OCR backend tests passed!")
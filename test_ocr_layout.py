@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the weekday section detection of app/scrapers/ocr_layout.py on
+hand-made OCR word boxes (no image or Tesseract needed).
+
+Usage:
+    python test_ocr_layout.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.scrapers.disk_cache import DiskCacheStore
+from app.scrapers.ocr_layout import LayoutCache, find_sections, matches_header
+
+HEADERS = {
+    'MONDAY': ('MONTAG',),
+    'TUESDAY': ('DIENSTAG',),
+    'WEDNESDAY': ('MITTWOCH',),
+    'THURSDAY': ('DONNERSTAG',),
+    'FRIDAY': ('FREITAG',),
+}
+PAGE = (1200, 1600)
+
+
+def word(text, left, top, width=120, height=24):
+    return {'text': text, 'left': left, 'top': top, 'width': width, 'height': height}
+
+
+def two_column_page():
+    """OCR words of a two-column weekly menu; the right column sits a few pixels lower."""
+    words = []
+    for top, header in [(100, 'MONTAG'), (400, 'DIENSTAG'), (700, 'MlTTWOCH:'),
+                        (1000, 'DONNERSTAG'), (1300, 'FREITAG')]:
+        words.append(word(header, 40, top))
+        words.append(word(header, 640, top + 4))
+        words.append(word('Gulasch', 40, top + 40))
+        words.append(word('12,90', 500, top + 40, width=60))
+    return words
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+def test_matches_header():
+    print("Header matching:")
+    check(matches_header('MONTAG', HEADERS['MONDAY']), "exact spelling")
+    check(matches_header('Montag,', HEADERS['MONDAY']), "case and punctuation are ignored")
+    check(matches_header('MlTTWOCH', HEADERS['WEDNESDAY']), "one misread letter is tolerated")
+    check(not matches_header('MONTAGSMENÜ-SPEZIAL', HEADERS['MONDAY']), "longer words do not match")
+    check(not matches_header('MO', HEADERS['MONDAY']), "short tokens do not match")
+    check(not matches_header('Gulasch', HEADERS['MONDAY']), "dishes do not match")
+
+
+def test_find_sections():
+    print("Sections:")
+    boxes = find_sections(two_column_page(), HEADERS, PAGE)
+    check(list(boxes) == ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY'],
+          "every weekday is found, top to bottom")
+    check(boxes['MONDAY'] == (0, 92, 1200, 399),
+          f"a section spans the page width from its topmost header to the next one {boxes['MONDAY']}")
+    check(boxes['FRIDAY'][1] == 1292 and boxes['FRIDAY'][3] >= PAGE[1] - 1,
+          "the last section runs to the bottom")
+    check(boxes['WEDNESDAY'][1] == 692, "a misread header still starts its section")
+
+    words = [w for w in two_column_page() if w['text'] not in ('DIENSTAG', 'DONNERSTAG')]
+    boxes = find_sections(words, HEADERS, PAGE)
+    check(list(boxes) == ['MONDAY', 'WEDNESDAY', 'FRIDAY'] and boxes['MONDAY'][3] == 699,
+          "a missing header merges its section into the previous one")
+
+    boxes = find_sections([word('MONTAG', 40, 5)] + [word('Gulasch', 40, 60)], HEADERS, PAGE)
+    check(boxes == {}, "a single header is not a weekly layout")
+    boxes = find_sections([word('MONTAG', 40, 3), word('DIENSTAG', 40, 300)], HEADERS, PAGE)
+    check(boxes['MONDAY'][1] == 0, "padding is clipped at the top of the page")
+
+
+def test_layout_cache():
+    print("Layout cache:")
+    cache = LayoutCache(DiskCacheStore(tempfile.mkdtemp(), 10 ** 6))
+    boxes = find_sections(two_column_page(), HEADERS, PAGE)
+    check(cache.get('page-1') is None, "unknown images are not cached")
+    cache.put('page-1', boxes)
+    check(cache.get('page-1') == boxes, "boxes round-trip as tuples")
+
+
+if __name__ == "__main__":
+    print("Testing OCR layout detection...")
+    print("=" * 60)
+    test_matches_header()
+    test_find_sections()
+    test_layout_cache()
+    print("\n✅ All layout tests passed!")
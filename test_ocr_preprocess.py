@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test the NumPy parts of the OCR preprocessing (app/scrapers/ocr_preprocess.py)
+against straightforward reference implementations, on generated images.
+
+Usage:
+    python test_ocr_preprocess.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance
+
+from app.scrapers import ocr_preprocess
+from app.scrapers.ocr_preprocess import adaptive_threshold, contrast_lut, estimate_skew
+
+
+def reference_threshold(pixels, window, offset):
+    """adaptive_threshold pixel by pixel: black if darker than the window mean minus offset."""
+    height, width = pixels.shape
+    half = window // 2
+    out = np.full(pixels.shape, 255, dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            block = pixels[max(0, y - half):y + half + 1, max(0, x - half):x + half + 1]
+            if (int(pixels[y, x]) + offset) * block.size < int(block.sum()):
+                out[y, x] = 0
+    return out
+
+
+def text_page(width=600, height=300, angle=0.0):
+    """Lines of 'text' (black bars) on a white page, optionally rotated by ``angle`` degrees."""
+    image = Image.new('L', (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    for y in range(30, height - 30, 30):
+        for x in range(30, width - 60, 70):
+            draw.rectangle((x, y, x + 50, y + 8), fill=0)
+    if angle:
+        image = image.rotate(angle, resample=Image.Resampling.BICUBIC, fillcolor=255)
+    return image
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+def test_adaptive_threshold():
+    print("Adaptive threshold:")
+    rng = np.random.default_rng(7)
+    for shape, window, offset in [((17, 23), 3, 0), ((20, 20), 7, 10), ((9, 40), 31, 5)]:
+        pixels = rng.integers(0, 256, size=shape, dtype=np.uint8)
+        same = np.array_equal(adaptive_threshold(pixels, window, offset),
+                              reference_threshold(pixels, window, offset))
+        check(same, f"{shape[0]}x{shape[1]}, window {window}, offset {offset}: "
+                    f"matches the pixel-by-pixel reference")
+
+    flat = np.full((30, 30), 128, dtype=np.uint8)
+    check((adaptive_threshold(flat, 15, 10) == 255).all(), "a flat image stays white")
+
+    # Text on a background that fades from white to dark grey
+    page = np.asarray(text_page()).astype(np.int32)
+    shade = np.linspace(0, 150, page.shape[1]).astype(np.int32)
+    lit = np.clip(page - shade[None, :], 0, 255).astype(np.uint8)
+    ink = page == 0
+    binary = adaptive_threshold(lit, 31, 10)
+    global_binary = np.where(lit > 128, 255, 0)
+    adaptive_errors = np.mean((binary == 0) != ink)
+    global_errors = np.mean((global_binary == 0) != ink)
+    check(adaptive_errors < 0.02 and global_errors > 0.1,
+          f"uneven lighting: {adaptive_errors:.1%} wrong pixels "
+          f"(a global threshold gets {global_errors:.1%})")
+
+
+def test_contrast_lut():
+    print("Contrast lookup table:")
+    gradient = Image.fromarray(np.tile(np.arange(256, dtype=np.uint8), (4, 1)))
+    mean = float(np.asarray(gradient).mean())
+    expected = np.asarray(ImageEnhance.Contrast(gradient).enhance(2.0))
+    lut = contrast_lut(mean, 2.0)
+    check(np.abs(lut[np.arange(256)].astype(int) - expected[0].astype(int)).max() <= 1,
+          "matches ImageEnhance.Contrast (within rounding)")
+    binary = contrast_lut(mean, 2.0, threshold=128)
+    check(set(np.unique(binary)) <= {0, 255} and binary[0] == 0 and binary[255] == 255,
+          "with a threshold the table is binary")
+    check(np.array_equal(contrast_lut(mean, 1.0), np.arange(256)), "factor 1.0 is the identity")
+
+
+def test_estimate_skew():
+    print("Skew estimation:")
+    for angle in (-3, -1, 2, 4):
+        found = estimate_skew(text_page(angle=angle))
+        check(abs(found + angle) <= 0.5, f"a page rotated by {angle}° is corrected by {found}°")
+    check(estimate_skew(text_page()) == 0.0, "a straight page needs no correction")
+    check(estimate_skew(Image.new('L', (200, 100), 255)) == 0.0, "a blank page needs no correction")
+
+
+def test_recipes():
+    print("Recipes:")
+    page = text_page(angle=2)
+    straightened = ocr_preprocess.MENU(page)
+    check(straightened.width == 1500 and set(np.unique(np.asarray(straightened))) <= {0, 255},
+          "MENU upscales narrow pages and binarizes them")
+    check(abs(estimate_skew(straightened)) <= 0.5, "MENU straightens the skewed page")
+    check(ocr_preprocess.PLAIN(page).size == page.size, "PLAIN leaves the size alone")
+    check(ocr_preprocess.MENU.signature != ocr_preprocess.ENHANCED.signature,
+          "recipes have distinct cache signatures")
+
+
+if __name__ == "__main__":
+    print("Testing OCR preprocessing...")
+    print("=" * 60)
+    test_adaptive_threshold()
+    test_contrast_lut()
+    test_estimate_skew()
+    test_recipes()
+    print("\n✅ All preprocessing tests passed!")
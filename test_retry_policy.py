@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test the scrapers' retry policy (app/scrapers/retry.py) with canned
+responses instead of a server, and delays of a few milliseconds.
+
+Usage:
+    python test_retry_policy.py
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import requests
+
+from app.scrapers.retry import RetryPolicy, retry_after_seconds
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the retry policy."""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def replay(*outcomes):
+    """A request function returning (or raising) ``outcomes`` in turn; counts its calls."""
+    pending = list(outcomes)
+
+    def request():
+        request.calls += 1
+        outcome = pending.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    request.calls = 0
+    return request
+
+
+def fast_policy(**kwargs):
+    options = dict(retries=3, base_delay=0.01, max_delay=1, host_budget=10)
+    options.update(kwargs)
+    return RetryPolicy(**options)
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+def test_backoff():
+    print("Backoff delays:")
+    policy = RetryPolicy(base_delay=5, max_delay=60)
+    for attempt, full in enumerate([5, 10, 20, 40, 60, 60]):
+        delays = [policy.backoff(attempt) for _ in range(50)]
+        check(all(full / 2 <= d <= full for d in delays),
+              f"attempt {attempt}: {min(delays):.1f}-{max(delays):.1f}s within {full / 2:.1f}-{full}s")
+
+
+def test_retry_after_header():
+    print("Retry-After parsing:")
+    check(retry_after_seconds(FakeResponse(503, {'Retry-After': '7'})) == 7, "seconds")
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    delay = retry_after_seconds(FakeResponse(503, {'Retry-After': later}))
+    check(delay is not None and 25 <= delay <= 30, f"HTTP date ({delay:.0f}s)")
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+    check(retry_after_seconds(FakeResponse(503, {'Retry-After': earlier})) == 0, "date in the past")
+    check(retry_after_seconds(FakeResponse(503, {'Retry-After': 'soon'})) is None, "garbage")
+    check(retry_after_seconds(FakeResponse(503)) is None, "missing header")
+
+
+def test_retries_until_success():
+    print("Retryable answers:")
+    first, second, ok = FakeResponse(503), FakeResponse(429), FakeResponse(200)
+    request = replay(first, second, ok)
+    response = fast_policy().send('http://menu.test/a', request)
+    check(response is ok and request.calls == 3, "503 and 429 are retried until the 200")
+    check(first.closed and second.closed and not ok.closed,
+          "retried responses are closed, the returned one is not")
+
+    request = replay(requests.ConnectionError("refused"), requests.Timeout("slow"), ok)
+    check(fast_policy().send('http://menu.test/b', request) is ok and request.calls == 3,
+          "connection errors and timeouts are retried")
+
+    not_found = FakeResponse(404)
+    request = replay(not_found)
+    check(fast_policy().send('http://menu.test/c', request) is not_found and request.calls == 1,
+          "404 is returned without retrying")
+
+
+def test_gives_up():
+    print("Giving up:")
+    answers = [FakeResponse(502) for _ in range(3)]
+    request = replay(*answers)
+    response = fast_policy(retries=2).send('http://menu.test/a', request)
+    check(response is answers[-1] and request.calls == 3,
+          "the last 502 is returned after 2 retries")
+    check(not response.closed, "the returned 502 is still open")
+
+    request = replay(*[requests.ConnectionError("refused") for _ in range(3)])
+    try:
+        fast_policy(retries=2).send('http://menu.test/b', request)
+        raised = False
+    except requests.ConnectionError:
+        raised = True
+    check(raised and request.calls == 3, "the last connection error is raised")
+
+    request = replay(FakeResponse(503, {'Retry-After': '3600'}), FakeResponse(200))
+    response = fast_policy().send('http://menu.test/c', request)
+    check(response.status_code == 503 and request.calls == 1,
+          "Retry-After longer than max_delay is not waited for")
+
+
+def test_host_budget():
+    print("Per-host budget:")
+    policy = fast_policy(retries=5, host_budget=0.05)
+    policy.backoff = lambda attempt: 0.02  # no jitter
+    request = replay(*[FakeResponse(503) for _ in range(6)])
+    policy.send('http://slow.test/a', request)
+    check(request.calls == 3, f"a 0.05s budget allows 2 retries of 0.02s ({request.calls - 1})")
+
+    request = replay(FakeResponse(503), FakeResponse(200))
+    policy.send('http://slow.test/b', request)
+    check(request.calls == 1, "the exhausted host is not retried again")
+
+    request = replay(FakeResponse(503), FakeResponse(200))
+    check(policy.send('http://other.test/a', request).status_code == 200,
+          "other hosts keep their budget")
+
+    policy.reset_budgets()
+    request = replay(FakeResponse(503), FakeResponse(200))
+    check(policy.send('http://slow.test/c', request).status_code == 200,
+          "reset_budgets() restores the budget")
+
+
+def test_cancelled():
+    print("Cancellation:")
+    cancelled = threading.Event()
+    cancelled.set()
+    first = FakeResponse(503)
+    request = replay(first, FakeResponse(200))
+    started = time.monotonic()
+    response = RetryPolicy(base_delay=5, max_delay=60).send('http://menu.test/a', request,
+                                                            cancelled)
+    elapsed = time.monotonic() - started
+    check(response is first and request.calls == 1 and elapsed < 1,
+          f"a cancelled wait returns at once ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    print("Testing the scraper retry policy...")
+    print("=" * 60)
+    test_backoff()
+    test_retry_after_header()
+    test_retries_until_success()
+    test_gives_up()
+    test_host_budget()
+    test_cancelled()
+    print("\n✅ All retry policy tests passed!")
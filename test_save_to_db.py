@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test BaseScraper.save_to_db against a temporary SQLite database: day
+fingerprints that skip unchanged menus, and the natural-key upsert that
+keeps identical rows, updates changed ones and deletes rows past the end
+of a shorter menu.
+
+Usage:
+    python test_save_to_db.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+# One-off run: leave scheduling to the app's scheduler leader
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+
+from app import create_app, db
+from app.models import MenuFingerprint, MenuItem, Restaurant
+from app.scrapers.base_scraper import BaseScraper, items_hash
+
+MONDAY = date(2025, 10, 6)
+TUESDAY = date(2025, 10, 7)
+
+
+class FixtureScraper(BaseScraper):
+    """A scraper whose save_to_db is fed directly."""
+
+    def __init__(self):
+        super().__init__("Fixture Kantine", "https://kantine.test/")
+
+    def scrape(self):
+        return []
+
+
+def menu(menu_date, *dishes):
+    return [
+        {'menu_date': menu_date, 'category': category, 'description': description, 'price': price}
+        for category, description, price in dishes
+    ]
+
+
+def stored(menu_date):
+    """(id, position, category, description, price) of the stored rows, in order."""
+    rows = (MenuItem.query.join(Restaurant)
+            .filter(Restaurant.name == "Fixture Kantine", MenuItem.menu_date == menu_date)
+            .order_by(MenuItem.position))
+    return [(row.id, row.position, row.category, row.description, row.price) for row in rows]
+
+
+def check(condition, message):
+    print(f"  {'✅' if condition else '❌'} {message}")
+    assert condition, message
+
+
+def counts(inserted=0, updated=0, deleted=0, unchanged=0):
+    return {'inserted': inserted, 'updated': updated, 'deleted': deleted, 'unchanged': unchanged}
+
+
+def test_save_to_db():
+    app = create_app()
+    app.config['MENU_SNAPSHOT_STAMP'] = os.path.join(tempfile.mkdtemp(), 'menu.stamp')
+    with app.app_context():
+        scraper = FixtureScraper()
+        monday = menu(MONDAY,
+                      ('Suppe', 'Kürbiscremesuppe', '€ 4,50'),
+                      ('Hauptspeise', 'Wiener Schnitzel mit Erdäpfelsalat', '€ 12,90'),
+                      ('Vegetarisch', 'Spinatknödel', '€ 10,50'))
+
+        print("First save:")
+        result = scraper.save_to_db(monday)
+        check(result == counts(inserted=3), f"3 rows inserted ({result})")
+        rows = stored(MONDAY)
+        check([row[1:] for row in rows] == [(i, *dish) for i, dish in enumerate(
+            (d['category'], d['description'], d['price']) for d in monday)],
+            "rows are stored in menu order with their positions")
+        fingerprint = MenuFingerprint.query.filter_by(menu_date=MONDAY).one()
+        check(fingerprint.items_hash == items_hash(monday), "the day's fingerprint is recorded")
+
+        print("Unchanged menu:")
+        scraper.source_hash = 'abc123'
+        result = scraper.save_to_db(monday)
+        check(result == counts(unchanged=3), f"the day is skipped by its fingerprint ({result})")
+        check(stored(MONDAY) == rows, "no row is rewritten")
+        check(MenuFingerprint.query.filter_by(menu_date=MONDAY).one().source_hash == 'abc123',
+              "the source hash is still updated")
+        scraper.source_hash = None
+
+        print("Whitespace-only changes:")
+        spaced = [dict(item, description=f"  {item['description']} ") for item in monday]
+        result = scraper.save_to_db(spaced)
+        check(result == counts(unchanged=3), "the fingerprint ignores whitespace")
+
+        print("Changed menu:")
+        changed = menu(MONDAY,
+                       ('Suppe', 'Kürbiscremesuppe', '€ 4,50'),
+                       ('Hauptspeise', 'Zwiebelrostbraten', '€ 14,90'))
+        result = scraper.save_to_db(changed)
+        check(result == counts(updated=1, deleted=1, unchanged=1), f"upsert by position ({result})")
+        new_rows = stored(MONDAY)
+        check(new_rows[0] == rows[0], "the identical row keeps its id")
+        check(new_rows[1][0] == rows[1][0] and new_rows[1][3] == 'Zwiebelrostbraten',
+              "the changed row is updated in place")
+        check(len(new_rows) == 2, "the row past the end of the menu is deleted")
+
+        print("Several days in one save:")
+        tuesday = menu(TUESDAY, ('Hauptspeise', 'Gebackener Karpfen', '€ 13,50'))
+        result = scraper.save_to_db(changed + tuesday)
+        check(result == counts(inserted=1, unchanged=2),
+              f"only the new day is written ({result})")
+        check(len(stored(TUESDAY)) == 1 and len(stored(MONDAY)) == 2, "both days are stored")
+
+        print("Fingerprint without rows:")
+        MenuItem.query.filter_by(menu_date=TUESDAY).delete()
+        db.session.commit()
+        result = scraper.save_to_db(tuesday)
+        check(result == counts(inserted=1),
+              f"a matching fingerprint does not hide missing rows ({result})")
+
+        check(scraper.save_to_db([]) == counts(), "an empty scrape saves nothing")
+
+
+if __name__ == "__main__":
+    print("Testing BaseScraper.save_to_db...")
+    print("=" * 60)
+    test_save_to_db()
+    print("\n✅ All save_to_db tests passed!")
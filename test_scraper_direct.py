@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
-"""Test the actual scraper's _extract_current_view method directly."""
+"""Test the mealplan parser on the rendered Erste Campus page directly."""
 
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from app.scrapers.erste_campus_scraper import ErsteCampusScraper
 from app.scrapers.chrome_driver_setup import get_chrome_driver
-import json
+from app.scrapers.fetch_strategies import FetchResult
+from app.scrapers.mealplan import MealplanEngine, get_outlet
+from selenium.webdriver.common.by import By
 
 def test_extract_method():
-    """Test the _extract_current_view method directly."""
+    """Parse the rendered page the way the mealplan engine does."""
     driver = None
     try:
         driver = get_chrome_driver()
@@ -20,8 +21,10 @@ def test_extract_method():
         import time
         time.sleep(5)
         
-        scraper = ErsteCampusScraper()
-        results = scraper._extract_current_view(driver)
+        outlet = get_outlet("Erste Campus")
+        page = FetchResult(url, 'browser', html=driver.page_source,
+                           text=driver.find_element(By.TAG_NAME, "body").text)
+        results = MealplanEngine().parse(outlet, page)
         
         print(f"Total items extracted: {len(results)}")
         print("\nAll items:")